@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark reading synthetic files of various shapes backwards, against `tac`.
+
+Files get generated from a seed, so that runs can be compared with each other. For every file size, line length
+distribution, new line style, encoding, engine and chunk size, it reports the throughput of reading every line,
+of reading every line with `readline()`, and of reading the first lines only, along with the peak memory
+allocated while reading every line::
+
+    $ python benchmarks/bench_file_shapes.py --sizes 1 64 --new-lines lf mixed --output results.json
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards.file_read_backwards import supported_encodings
+from file_read_backwards.file_read_backwards import supported_engines
+from file_read_backwards.file_read_backwards import wide_encodings
+from file_read_backwards.wide import byte_order_marks
+
+block_size = 1024 * 1024  # files are made of a block generated once, written over and over
+new_line_styles = {
+    "lf": ["\n"],
+    "crlf": ["\r\n"],
+    "cr": ["\r"],
+    "mixed": ["\n", "\r\n", "\r"],
+}
+words = ["log", "line", "request", "id=42", "status=200", "Café", "naïve", "über", "latency_ms=17"]
+
+
+def line_length(distribution, rng):
+    """Return the length of a line drawn from one of the distributions."""
+    if distribution == "short":
+        return rng.randint(20, 100)
+    if distribution == "mixed":  # mostly short lines, some of them way longer
+        return min(int(rng.lognormvariate(4.5, 1.5)), 256 * 1024)
+    if distribution == "long":
+        return rng.randint(32 * 1024, 128 * 1024)
+    raise ValueError("unknown line length distribution: {0}".format(distribution))
+
+
+def block_codec(encoding):
+    """Return the codec to encode blocks with, which writes no byte order mark, and the mark of the file."""
+    if encoding in ("utf-16", "utf-32"):  # little endian, as when there is no byte order mark
+        return encoding + "-le", byte_order_marks[encoding + "-le"]
+    return encoding, b""
+
+
+def generate_block(distribution, new_line, encoding, seed):
+    """Return about block_size bytes of complete lines, new lines included, encoded with `block_codec`."""
+    rng = random.Random(seed)
+    codec = block_codec(encoding)[0]
+    new_lines = new_line_styles[new_line]
+    parts = []
+    size = 0
+    while size < block_size:
+        length = line_length(distribution, rng)
+        text = " ".join(rng.choice(words) for _ in range(length // 6 + 1))[:length]
+        part = (text + rng.choice(new_lines)).encode(codec, errors="replace")
+        parts.append(part)
+        size += len(part)
+    return b"".join(parts)
+
+
+def create_file(size, distribution, new_line, encoding, seed):
+    """Write a file of about size bytes into the temporary directory, return its path."""
+    block = generate_block(distribution, new_line, encoding, seed)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".log") as t:
+        t.write(block_codec(encoding)[1])
+        for _ in range(max(size // len(block), 1)):
+            t.write(block)
+    return t.name
+
+
+def read_all(path, encoding, engine, chunk_size, first_lines):
+    with FileReadBackwards(path, encoding=encoding, engine=engine, chunk_size=chunk_size) as f:
+        for _ in f:
+            pass
+
+
+def read_lines(path, encoding, engine, chunk_size, first_lines):
+    with FileReadBackwards(path, encoding=encoding, engine=engine, chunk_size=chunk_size) as f:
+        while f.readline():
+            pass
+
+
+def read_first_lines(path, encoding, engine, chunk_size, first_lines):
+    with FileReadBackwards(path, encoding=encoding, engine=engine, chunk_size=chunk_size) as f:
+        for _ in itertools.islice(f, first_lines):
+            pass
+
+
+def tac_all(path, first_lines):
+    subprocess.run(["tac", path], stdout=subprocess.DEVNULL, check=True)
+
+
+def tac_first_lines(path, first_lines):
+    with subprocess.Popen(["tac", path], stdout=subprocess.PIPE) as p:
+        for _ in itertools.islice(p.stdout, first_lines):
+            pass
+        p.kill()
+
+
+scenarios = {"all": read_all, "readline": read_lines, "first": read_first_lines}
+tac_scenarios = {"all": tac_all, "first": tac_first_lines}
+
+
+def best_time(function, args, repeat):
+    """Return the shortest time function(*args) took over repeat runs."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(function, args):
+    """Return the peak memory allocated by Python while running function(*args), in bytes."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 16], help="file sizes in MB")
+    parser.add_argument("--line-lengths", nargs="+", default=["short", "mixed", "long"],
+                        choices=["short", "mixed", "long"], help="line length distributions")
+    parser.add_argument("--new-lines", nargs="+", default=list(new_line_styles), choices=list(new_line_styles))
+    parser.add_argument("--encodings", nargs="+", default=["utf-8"], choices=supported_encodings + wide_encodings)
+    parser.add_argument("--engines", nargs="+", default=supported_engines, choices=supported_engines)
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[io.DEFAULT_BUFFER_SIZE, 64 * 1024])
+    parser.add_argument("--first-lines", type=int, default=100, help="how many lines the first scenario reads")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measure, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="do not measure the peak memory")
+    parser.add_argument("--output", help="write the results to this JSON file as well")
+    args = parser.parse_args()
+
+    tac = shutil.which("tac")
+    results = []
+    print("{0:>9} {1:>6} {2:>5} {3:>8} {4:>8} {5:>7} {6:>8} {7:>10} {8:>10} {9:>10}".format(
+        "size", "lines", "nl", "encoding", "engine", "chunk", "scenario", "speed", "tac speed", "peak KB"))
+    for size, distribution, new_line, encoding in itertools.product(
+            args.sizes, args.line_lengths, args.new_lines, args.encodings):
+        path = create_file(int(size * 1024 * 1024), distribution, new_line, encoding, args.seed)
+        try:
+            megabytes = os.path.getsize(path) / (1024 * 1024)
+            tac_times = {}
+            # tac only splits on a one byte "\n"
+            if tac is not None and new_line == "lf" and encoding not in wide_encodings:
+                tac_times = {name: best_time(f, (path, args.first_lines), args.repeat)
+                             for name, f in tac_scenarios.items()}
+            for engine, chunk_size in itertools.product(args.engines, args.chunk_sizes):
+                if encoding in wide_encodings and engine != "buffered":  # the only engine reading them
+                    continue
+                for name, scenario in scenarios.items():
+                    reading = (path, encoding, engine, chunk_size, args.first_lines)
+                    elapsed = best_time(scenario, reading, args.repeat)
+                    peak = None
+                    if not args.no_memory and name == "all":
+                        peak = peak_memory(scenario, reading)
+                    result = {
+                        "size_mb": megabytes, "line_lengths": distribution, "new_line": new_line,
+                        "encoding": encoding, "engine": engine, "chunk_size": chunk_size, "scenario": name,
+                        "seconds": elapsed, "tac_seconds": tac_times.get(name), "peak_memory": peak,
+                    }
+                    results.append(result)
+                    print("{0:>7.1f}MB {1:>6} {2:>5} {3:>8} {4:>8} {5:>7} {6:>8} {7:>10} {8:>10} {9:>10}".format(
+                        megabytes, distribution, new_line, encoding, engine, chunk_size, name,
+                        _throughput(megabytes, elapsed, name),
+                        _throughput(megabytes, tac_times.get(name), name),
+                        "-" if peak is None else peak // 1024))
+        finally:
+            os.unlink(path)
+
+    if args.output:
+        with io.open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+
+
+def _throughput(megabytes, elapsed, scenario):
+    """Return MB/s as a string, or the time in ms for the first lines, which do not depend on the size."""
+    if elapsed is None:
+        return "-"
+    if scenario == "first":
+        return "{0:.2f}ms".format(elapsed * 1000)
+    return "{0:.1f}".format(megabytes / elapsed)
+
+
+if __name__ == "__main__":
+    main()
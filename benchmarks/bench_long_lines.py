@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Benchmark reading files made of a single long line.
+
+The time spent per megabyte should stay flat as the line grows, that is the cost is linear in line length::
+
+    $ python benchmarks/bench_long_lines.py
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards.file_read_backwards import supported_engines
+
+
+def create_file(line_length):
+    temp_file = tempfile.NamedTemporaryFile(delete=False)
+    temp_file.write(b"x" * line_length + b"\n")
+    temp_file.close()
+    return temp_file.name
+
+
+def time_reading(path, engine, chunk_size):
+    start = time.perf_counter()
+    with FileReadBackwards(path, engine=engine, chunk_size=chunk_size) as f:
+        for _ in f:
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="line lengths in MB")
+    parser.add_argument("--chunk-size", type=int, default=io.DEFAULT_BUFFER_SIZE)
+    args = parser.parse_args()
+
+    for engine in supported_engines:
+        per_mb = []
+        for size in args.sizes:
+            path = create_file(size * 1024 * 1024)
+            try:
+                elapsed = time_reading(path, engine, args.chunk_size)
+            finally:
+                os.unlink(path)
+            per_mb.append(elapsed / size)
+            print("{0:>8} {1:>4} MB line: {2:.4f}s ({3:.5f}s/MB)".format(engine, size, elapsed, elapsed / size))
+        print("{0:>8} largest/smallest cost per MB: {1:.2f}".format(engine, per_mb[-1] / per_mb[0]))
+
+
+if __name__ == "__main__":
+    main()
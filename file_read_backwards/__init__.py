@@ -1,6 +1,19 @@
 # -*- coding: utf-8 -*-
 
+from .async_file_read_backwards import AsyncFileReadBackwards  # noqa: F401
+from .block_cache import BlockCache  # noqa: F401
+from .chunk_size import AdaptiveChunkSize  # noqa: F401
+from .cursor import LineCursor  # noqa: F401
 from .file_read_backwards import FileReadBackwards  # noqa: F401
+from .follow import tail_follow  # noqa: F401
+from .gzip_reader import GzipIndex  # noqa: F401
+from .gzip_reader import GzipReader  # noqa: F401
+from .line_index import LineIndex  # noqa: F401
+from .parallel import parallel_read_backwards  # noqa: F401
+from .rotated import RotatedLogReadBackwards  # noqa: F401
+from .since import lines_since  # noqa: F401
+from .stats import ReadStats  # noqa: F401
+from .tail import tail  # noqa: F401
 
 __author__ = """Robin Robin"""
 __email__ = 'robinsquare42@gmail.com'
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""AsyncFileReadBackwards module."""
+
+import asyncio
+import io
+import os
+
+from .file_read_backwards import FileReadBackwards
+from .file_read_backwards import _check_encoding
+
+
+class AsyncFileReadBackwards:
+
+    """Class definition for `AsyncFileReadBackwards`, the asyncio counterpart of `FileReadBackwards`.
+
+    Blocking file operations run in an executor, a chunk at a time: each await reads (and splits) a chunk,
+    and the lines it holds are then returned without awaiting anything.
+
+    It can be used as an asynchronous Context Manager. If done so, when exited, it will close its file handler.
+
+    In any mode, `await close()` can be called to close the file handler.
+    """
+
+    def __init__(self, path, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE, engine="buffered", executor=None):
+        """Constructor for AsyncFileReadBackwards.
+
+        The file only gets opened on first use, in the executor.
+
+        Args:
+            path: Path to the file to be read
+            encoding (str): Encoding, None to get lines as bytes without decoding them
+            chunk_size (int): How many bytes to read at a time, that is how much gets read per await
+            engine (str): How the file is read, see `FileReadBackwards`
+            executor (concurrent.futures.Executor): Where to run blocking operations, the loop's default if None
+        """
+        _check_encoding(encoding, wide=True)
+
+        self.path = path
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.engine = engine
+        self.executor = executor
+        self.__frb = None
+        self.__batches = None
+        self.__lines = []
+        self.__lines_index = 0
+        self.__lock = None  # created on first use, so that it belongs to the running loop
+
+    async def __aenter__(self):
+        await self.__open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Closes its file handler and propagates all exceptions on exit."""
+        await self.close()
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Returns unicode string (bytes without an encoding) from the last line until the beginning of file."""
+        async with self.__get_lock():
+            if not await self.__fill_lines():
+                raise StopAsyncIteration
+            r = self.__lines[self.__lines_index]
+            self.__lines_index += 1
+            return r
+
+    async def iter_batches(self, max_lines=None):
+        """Yield lists of lines, see `FileReadBackwardsIterator.iter_batches`.
+
+        Args:
+            max_lines (int): If given, lists hold at most this many lines
+        """
+        while True:
+            async with self.__get_lock():
+                if not await self.__fill_lines():
+                    return
+                start = self.__lines_index
+                end = len(self.__lines) if max_lines is None else min(start + max_lines, len(self.__lines))
+                self.__lines_index = end
+            yield self.__lines[start:end]
+
+    async def readline(self):
+        """Return a line content (with a trailing newline) if there are content. Return '' otherwise."""
+        linesep = os.linesep if self.encoding is not None else os.linesep.encode("ascii")
+        try:
+            return await self.__anext__() + linesep
+        except StopAsyncIteration:
+            return linesep[:0]
+
+    async def close(self):
+        """Closes its file handler."""
+        if self.__frb is not None:
+            await self.__run(self.__frb.close)
+
+    @property
+    def closed(self):
+        """True if the file handler has been opened and closed since."""
+        return self.__frb is not None and self.__frb.iterator.closed
+
+    def __get_lock(self):
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        return self.__lock
+
+    async def __open(self):
+        if self.__frb is None:
+            self.__frb = await self.__run(FileReadBackwards, self.path, self.encoding, self.chunk_size, self.engine)
+            self.__batches = self.__frb.iter_batches()
+
+    async def __fill_lines(self):
+        """Make sure there are lines to be returned, return False when exhausted."""
+        if self.closed:
+            return False
+        if self.__lines_index < len(self.__lines):
+            return True
+        await self.__open()
+        lines = await self.__run(next, self.__batches, None)
+        if lines is None:
+            return False
+        self.__lines = lines
+        self.__lines_index = 0
+        return True
+
+    async def __run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""BgzfBufferWorkSpace module, reading BGZF files (as written by bgzip) backwards a block at a time."""
+
+import struct
+import zlib
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _pread
+from .gzip_reader import gzip_magic
+
+max_block_size = 64 * 1024
+
+
+class BgzfBufferWorkSpace(BufferWorkSpace):
+
+    """A BufferWorkSpace for BGZF files, which are gzip members of at most 64KiB each.
+
+    Every member records its own size (BSIZE, in its extra field), so the member ending at a position is
+    found by looking for the gzip header whose size leads exactly to that position, among the 64KiB before
+    it. Only the members holding the lines read get decompressed, there is no index to build.
+    """
+
+    def __init__(self, fp, chunk_size, start=0, end=None):
+        """Convention for the data.
+
+        Positions are positions in the (compressed) file rather than in its content: read_position is
+        where the first member read into read_buffer begins, and start and end restrict the work space
+        to the members between them. Each chunk is made of whole members, at least chunk_size bytes of
+        content unless start is reached.
+        """
+        super().__init__(fp, chunk_size, start, end)
+        # the members at the end that have no content (such as the end of file marker) hold no line
+        while self.read_position > self.start:
+            isize = struct.unpack("<I", _pread(self.fp, self.read_position - 4, 4))[0]
+            if isize:
+                break
+            self.read_position = _find_previous_block(self.fp, self.read_position, self.start)[0]
+
+    def get_next_chunk(self, previously_read_position):
+        """Return the content of the members right before previously_read_position, and where the first begins.
+
+        Returns:
+            (bytestring, int)
+        """
+        position = previously_read_position
+        contents = []
+        size = 0
+        while position > self.start and size < self.chunk_size:
+            position, block = _find_previous_block(self.fp, position, self.start)
+            content = zlib.decompress(block, zlib.MAX_WBITS | 16)
+            contents.append(content)
+            size += len(content)
+        return b"".join(reversed(contents)), position
+
+
+def is_bgzf(header):
+    """Return True if header, the beginning of a file, is the one of a BGZF member."""
+    return header[:2] == gzip_magic and _block_size(header, 0) is not None
+
+
+def _find_previous_block(fp, position, start=0):
+    """Return where the member ending at position begins, along with the member.
+
+    Args:
+        fp: file-like object
+        position (int): where the member ends
+        start (int): position not to look before
+
+    Returns:
+        (int, bytestring)
+    """
+    window_start = max(position - max_block_size, start)
+    window = _pread(fp, window_start, position - window_start)
+    i = len(window)
+    while True:
+        i = window.rfind(gzip_magic, 0, i)
+        if i < 0:
+            raise ValueError("no BGZF block ends at {0} of {1}".format(position, getattr(fp, "name", fp)))
+        if _block_size(window, i) == len(window) - i:
+            return window_start + i, window[i:]
+
+
+def _block_size(data, i):
+    """Return the size of the BGZF member whose gzip header begins at i in data, None if it is not one.
+
+    The size is found in the "BC" subfield of the extra field, which holds it minus one.
+    """
+    if len(data) < i + 12 or data[i + 2] != 8 or not data[i + 3] & 4:  # deflate, with an extra field
+        return None
+    xlen = struct.unpack_from("<H", data, i + 10)[0]
+    j, extra_end = i + 12, min(i + 12 + xlen, len(data))
+    while j + 4 <= extra_end:
+        si1, si2, slen = struct.unpack_from("<BBH", data, j)
+        if si1 == 66 and si2 == 67 and slen == 2 and j + 6 <= extra_end:
+            return struct.unpack_from("<H", data, j + 4)[0] + 1
+        j += 4 + slen
+    return None
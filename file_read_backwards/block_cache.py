@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""BlockCache module, sharing the blocks of hot files between readers."""
+
+import collections
+import io
+import os
+import threading
+
+from .buffer_work_space import _pread_fd
+
+
+class BlockCache:
+
+    """Thread-safe LRU cache of file blocks, shared by the readers of a process.
+
+    Blocks are keyed by device, inode, modification time and offset, so that a file that got written to since
+    gets read again, while readers of a file that did not change share its blocks. The least recently used
+    blocks get dropped once they take more than `max_bytes`.
+
+    Files are opened with `open()`, readers of the same file sharing a single descriptor that blocks get read
+    from with os.pread.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, block_size=64 * 1024):
+        """Constructor for BlockCache.
+
+        Args:
+            max_bytes (int): How many bytes of blocks to keep at most
+            block_size (int): How many bytes each block holds, but the last block of a file
+        """
+        if not 0 < block_size <= max_bytes:
+            raise ValueError("block_size has to be positive, and no more than max_bytes")
+        self.max_bytes = max_bytes
+        self.block_size = block_size
+        self.size = 0  # bytes held by the cached blocks
+        self.hits = 0
+        self.misses = 0
+        self._blocks = collections.OrderedDict()  # (device, inode, modification time, offset) -> block
+        self._descriptors = {}  # (device, inode) -> [file descriptor, how many `CachedFile` share it]
+        self._lock = threading.Lock()
+
+    def open(self, path):
+        """Return a `CachedFile` of path, reading through the cache.
+
+        Raises:
+            NotImplementedError: where os.pread is not available, as a shared descriptor cannot be seeked
+        """
+        if not hasattr(os, "pread"):
+            raise NotImplementedError("A BlockCache needs os.pread.")
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        st = os.fstat(fd)
+        file_id = (st.st_dev, st.st_ino)
+        with self._lock:
+            if file_id in self._descriptors:
+                os.close(fd)
+                fd = self._descriptors[file_id][0]
+                self._descriptors[file_id][1] += 1
+            else:
+                self._descriptors[file_id] = [fd, 1]
+        return CachedFile(self, path, fd, file_id + (st.st_mtime_ns,), st.st_size)
+
+    def read(self, key, fd, position, size, file_size):
+        """Return up to size bytes from position of a file, out of cached blocks where possible.
+
+        Args:
+            key: (device, inode, modification time) of the file
+            fd (int): File descriptor to read missing blocks from
+            position (int): Where to read from
+            size (int): How many bytes to read
+            file_size (int): Size of the file as the reader saw it, blocks cached while it was shorter get read again
+        """
+        end = min(position + size, file_size)
+        parts = []
+        offset = position - position % self.block_size
+        while offset < end:
+            block = self._get_block(key, fd, offset, min(offset + self.block_size, file_size))
+            parts.append(block[max(position - offset, 0):end - offset])
+            if len(block) < self.block_size:
+                break
+            offset += self.block_size
+        return b"".join(parts) if len(parts) != 1 else parts[0]
+
+    def clear(self):
+        """Drop every cached block."""
+        with self._lock:
+            self._blocks.clear()
+            self.size = 0
+
+    def _get_block(self, key, fd, offset, needed_end):
+        block_key = key + (offset,)
+        with self._lock:
+            block = self._blocks.get(block_key)
+            if block is not None and offset + len(block) >= needed_end:
+                self._blocks.move_to_end(block_key)
+                self.hits += 1
+                return block
+            self.misses += 1
+        # read outside of the lock, so that readers of other blocks do not wait for it
+        block = _pread_fd(fd, offset, self.block_size)
+        with self._lock:
+            previous = self._blocks.pop(block_key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._blocks[block_key] = block
+            self.size += len(block)
+            while self.size > self.max_bytes:
+                self.size -= len(self._blocks.popitem(last=False)[1])
+        return block
+
+    def _release(self, file_id):
+        with self._lock:
+            shared = self._descriptors[file_id]
+            shared[1] -= 1
+            if shared[1]:
+                return
+            del self._descriptors[file_id]
+        os.close(shared[0])
+
+
+class CachedFile:
+
+    """Read only binary file-like object reading a file through a `BlockCache`, see `BlockCache.open()`."""
+
+    def __init__(self, cache, path, fd, key, file_size):
+        self.cache = cache
+        self.name = path
+        self.key = key
+        self.file_size = file_size
+        self.position = 0
+        self.closed = False
+        self._fd = fd
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def fileno(self):
+        return self._fd
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.file_size
+        if offset < 0:
+            raise ValueError("negative seek position {0}".format(offset))
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        content = self.pread(self.position, size if size is not None and size >= 0 else self.file_size)
+        self.position += len(content)
+        return content
+
+    def pread(self, position, size):
+        """Return up to size bytes from position, of the file as it was when opened."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        return self.cache.read(self.key, self._fd, position, size, self.file_size)
+
+    def close(self):
+        """Release the shared file descriptor."""
+        if not self.closed:
+            self.closed = True
+            self.cache._release(self.key[:2])
+
+
+shared_block_cache = BlockCache()  # the cache `FileReadBackwards(block_cache=True)` reads through
@@ -3,28 +3,64 @@
 
 """BufferWorkSpace module."""
 
+import inspect
+import io
 import os
+import queue
+import stat
+import tempfile
+import threading
+import weakref
 
 new_lines = ["\r\n", "\n", "\r"]
 new_lines_bytes = [n.encode("ascii") for n in new_lines]  # we only support encodings that's backward compat with ascii
+# match longest line first, we want to match "\r\n" rather than "\n" if we can
+_new_lines_bytes_longest_first = sorted(new_lines_bytes, key=lambda x: len(x), reverse=True)
+_single_byte_new_lines_bytes = [n for n in new_lines_bytes if len(n) == 1]
+# file objects whose file descriptor holds their content, so that it can be read with os.pread
+_os_file_types = (io.FileIO, io.BufferedReader, io.BufferedRandom)
+# how often, in seconds, a read-ahead worker waiting for room in its queue checks whether it is still needed
+read_ahead_put_timeout = 0.1
 
 
 class BufferWorkSpace:
 
     """It is a helper module for FileReadBackwards."""
 
-    def __init__(self, fp, chunk_size):
+    def __init__(self, fp, chunk_size, start=0, end=None):
         """Convention for the data.
 
         When read_buffer is not None, it represents contents of the file from `read_position` onwards
             that has not been processed/returned.
         read_position represents the file pointer position that has been read into read_buffer
-            initialized to be just past the end of file.
+            initialized to be just past the end of file (or `end`).
+        start and end restrict the work space to a part of the file, which gets treated as the whole file.
+            They are expected to be at the beginning of lines.
+
+        Chunks are kept as separate segments (the most recently read one last) for as long as
+        they do not hold a new line, and only get joined into read_buffer once one shows up.
+        This way a line spanning many chunks gets copied once, instead of once per chunk.
         """
         self.fp = fp
-        self.read_position = _get_file_size(self.fp)  # set the previously read position to the
+        self.start = start
+        self.read_position = _get_file_size(self.fp) if end is None else end  # set the previously read position
         self.read_buffer = None
         self.chunk_size = chunk_size
+        self.read_ahead = None
+        self.stats = None  # a `ReadStats` counting chunks and concatenations, if any
+
+    @property
+    def read_buffer(self):
+        """Contents of the file from `read_position` onwards that has not been processed/returned, or None."""
+        if self._segments is None:
+            return None
+        if len(self._segments) > 1:
+            self._join_segments()
+        return self._segments[0]
+
+    @read_buffer.setter
+    def read_buffer(self, content):
+        self._segments = None if content is None else [content]
 
     def add_to_buffer(self, content, read_position):
         """Add additional bytes content as read from the read_position.
@@ -34,23 +70,38 @@ class BufferWorkSpace:
             read_position (int): where in the file pointer the data was read from.
         """
         self.read_position = read_position
-        if self.read_buffer is None:
-            self.read_buffer = content
-        else:
-            self.read_buffer = content + self.read_buffer
+        if self._segments is None:
+            self._segments = [content]
+            return
+        # when there are several segments, only the trailing new line of the buffer may be in them
+        if len(self._segments) == 1 and _find_furthest_new_line(_remove_trailing_new_line(self._segments[0])) >= 0:
+            self._segments[0] = content + self._segments[0]
+            if self.stats is not None:
+                self.stats.concatenations += 1
+            return
+        self._segments.append(content)
+        if _find_furthest_new_line(content) >= 0:
+            self._join_segments()
+
+    def _join_segments(self):
+        self._segments = [b"".join(reversed(self._segments))]
+        if self.stats is not None:
+            self.stats.concatenations += 1
 
     def yieldable(self):
         """Return True if there is a line that the buffer can return, False otherwise."""
-        if self.read_buffer is None:
+        if self._segments is None:
             return False
 
-        t = _remove_trailing_new_line(self.read_buffer)
-        n = _find_furthest_new_line(t)
-        if n >= 0:
-            return True
+        # several segments means that no new line has been read in yet, apart from the trailing one
+        if len(self._segments) == 1:
+            t = _remove_trailing_new_line(self._segments[0])
+            n = _find_furthest_new_line(t)
+            if n >= 0:
+                return True
 
         # we have read in entire file and have some unprocessed lines
-        if self.read_position == 0 and self.read_buffer is not None:
+        if self.read_position == self.start:
             return True
         return False
 
@@ -75,53 +126,264 @@ class BufferWorkSpace:
             self.read_buffer = None
         return r
 
+    def return_block(self):
+        """Return the content of every complete line in the buffer, without the trailing new line.
+
+        It lets the buffer be split (or searched) in a single pass, rather than looking for new lines
+        once per returned line.
+
+        Precondition: self.yieldable() must be True
+
+        Returns:
+            bytestring
+        """
+        assert(self.yieldable())  # noqa: E275
+
+        t = _remove_trailing_new_line(self.read_buffer)
+        if self.read_position == self.start:  # we have read in entire file, so even the first line is complete
+            block = t
+            self.read_buffer = None
+        else:
+            delimiter = _find_new_line(t, 0, len(t)) + 1
+            block = t[delimiter:]
+            self.read_buffer = t[:delimiter]
+        return block
+
+    def return_lines(self):
+        """Return every complete line in the buffer at once, starting from the last one.
+
+        Precondition: self.yieldable() must be True
+
+        Returns:
+            list(bytestring)
+        """
+        return _split_lines(self.return_block())[::-1]
+
+    def get_next_chunk(self, previously_read_position):
+        """Return the chunk right before previously_read_position, and the position it was read from.
+
+        Work spaces reading something else than plain files override it.
+
+        Returns:
+            (bytestring, int)
+        """
+        return _get_next_chunk(self.fp, previously_read_position, self.chunk_size, self.start)
+
+    def start_read_ahead(self, depth):
+        """Have a worker thread read up to depth chunks ahead, while the ones read already get processed.
+
+        From then on, the file pointer belongs to the worker thread until the work space gets closed.
+        """
+        self.read_ahead = ReadAhead(self.get_next_chunk, self.read_position, self.start, depth)
+
     def read_until_yieldable(self):
         """Read in additional chunks until it is yieldable."""
         while not self.yieldable():
-            read_content, read_position = _get_next_chunk(self.fp, self.read_position, self.chunk_size)
+            if self.read_ahead is not None:
+                read_content, read_position = self.read_ahead.get()
+            else:
+                read_content, read_position = self.get_next_chunk(self.read_position)
+            if self.stats is not None:
+                self.stats.add_chunk(read_position, len(read_content))
             self.add_to_buffer(read_content, read_position)
 
+    def pending_end(self):
+        """Return where the contents that have not been returned end in the file, `start` once they all were.
+
+        Work spaces whose buffer does not hold the bytes of the file as they are (such as transcoded ones)
+        cannot tell it.
+        """
+        if self._segments is None:
+            return self.read_position
+        return self.read_position + sum(len(s) for s in self._segments)
+
     def has_returned_every_line(self):
         """Return True if every single line in the file has been returned, False otherwise."""
-        if self.read_position == 0 and self.read_buffer is None:
+        if self.read_position == self.start and self._segments is None:
             return True
         return False
 
+    def close(self):
+        """Release resources held by the work space, the file pointer itself is left to its owner."""
+        self.read_buffer = None
+        if self.read_ahead is not None:
+            self.read_ahead.close()
+
+
+class ReadAhead:
+
+    """Reads chunks in a worker thread, from a position down to start, ahead of them being needed.
+
+    At most `depth` chunks wait in a queue to be taken, so that memory use stays bounded.
+    The worker thread only holds a weak reference to the work space it reads for, so that a work space
+    dropped without being closed still gets collected, along with its file, and the thread then stops.
+    """
+
+    def __init__(self, get_next_chunk, read_position, start, depth):
+        """Constructor for ReadAhead, which starts the worker thread.
+
+        Args:
+            get_next_chunk: function(previously_read_position) returning a chunk and where it was read from,
+                held through a weak reference to its object when a method
+            read_position (int): the position to read chunks before
+            start (int): the position to stop reading at
+            depth (int): how many chunks can be read ahead
+        """
+        self.queue = queue.Queue(maxsize=max(depth, 1))
+        self._stopped = threading.Event()
+        if inspect.ismethod(get_next_chunk):
+            reference = weakref.WeakMethod(get_next_chunk)
+        else:
+            def reference():
+                return get_next_chunk
+        self._thread = threading.Thread(target=self._run, args=(reference, read_position, start), daemon=True)
+        self._thread.start()
+
+    def get(self):
+        """Return the next chunk and where it was read from, waiting for it if it has not been read yet."""
+        r = self.queue.get()
+        if isinstance(r, BaseException):
+            raise r
+        return r
+
+    def close(self):
+        """Stop the worker thread, and wait for it to be done with the file pointer."""
+        self._stopped.set()
+        if threading.current_thread() is self._thread:  # closed by the garbage collector, in the worker thread
+            return
+        while self._thread.is_alive():
+            try:  # make room for the chunk it may be waiting to put
+                self.queue.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def _run(self, get_next_chunk, read_position, start):
+        try:
+            while read_position > start and not self._stopped.is_set():
+                method = get_next_chunk()
+                if method is None:  # the work space got collected
+                    return
+                chunk = method(read_position)
+                del method  # not to keep the work space alive while waiting for room in the queue
+                read_position = chunk[1]
+                self._put(chunk, get_next_chunk)
+        except Exception as e:  # raised by get() instead
+            self._put(e, get_next_chunk)
+
+    def _put(self, r, get_next_chunk):
+        """Put r in the queue once there is room for it, unless stopped or the work space got collected first."""
+        while not self._stopped.is_set() and get_next_chunk() is not None:
+            try:
+                self.queue.put(r, timeout=read_ahead_put_timeout)
+                return
+            except queue.Full:
+                pass
+
 
 def _get_file_size(fp):
-    return os.fstat(fp.fileno()).st_size
+    """Return the size of fp, without moving its position for files of the file system."""
+    fp = getattr(fp, "__wrapped__", fp)  # the file object wrapped by a `CountingFile`
+    if isinstance(fp, _os_file_types):
+        return os.fstat(fp.fileno()).st_size
+    return fp.seek(0, os.SEEK_END)
+
+
+def _write_replacing(path, write, like):
+    """Write the file at path through write(fp), replacing it at once, with the permissions of the file at like.
+
+    It is written to a temporary file of its own next to path, as other threads or processes may be writing
+    the same file, which then gets moved over path. Such a temporary file can only be read by its owner,
+    so it gets the read and write permissions of like (such as the file indexed by what is being written).
+
+    Raises:
+        OSError: if it could not be written, in which case the temporary file is removed
+    """
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp",
+                                     dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with io.open(fd, mode="wb") as fp:
+            write(fp)
+        os.chmod(temp_path, stat.S_IMODE(os.stat(like).st_mode) & 0o666)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
 
 
-def _get_next_chunk(fp, previously_read_position, chunk_size):
+def _supports_pread(fp):
+    """Return True if fp can be read from at a position without seeking it."""
+    return hasattr(fp, "pread") or (hasattr(os, "pread") and isinstance(fp, _os_file_types))
+
+
+def _pread(fp, position, size):
+    """Return up to size bytes read from fp at position, with a single positioned read where possible.
+
+    That is with its `pread` method if it has one, or with os.pread for files of the file system.
+    Other file objects, such as a `GzipReader`, get seeked then read.
+
+    Args:
+        fp: file-like object
+        position (int): where to read from
+        size (int): how many bytes to read
+
+    Returns:
+        bytestring
+    """
+    pread = getattr(fp, "pread", None)
+    if pread is not None:
+        return pread(position, size)
+    if hasattr(os, "pread") and isinstance(fp, _os_file_types):
+        return _pread_fd(fp.fileno(), position, size)
+    fp.seek(position)
+    return fp.read(size)
+
+
+def _pread_fd(fd, position, size):
+    """Return up to size bytes read from file descriptor fd at position, with os.pread."""
+    chunks = []
+    while size > 0:  # a positioned read may return less than asked for, without being at the end of file
+        chunk = os.pread(fd, size, position)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        position += len(chunk)
+        size -= len(chunk)
+    return b"".join(chunks) if len(chunks) != 1 else chunks[0]
+
+
+def _get_next_chunk(fp, previously_read_position, chunk_size, start=0):
     """Return next chunk of data that we would from the file pointer.
 
     Args:
         fp: file-like object
         previously_read_position: file pointer position that we have read from
         chunk_size: desired read chunk_size
+        start: file pointer position not to read before
 
     Returns:
         (bytestring, int): data that has been read in, the file pointer position where the data has been read from
     """
-    seek_position, read_size = _get_what_to_read_next(fp, previously_read_position, chunk_size)
-    fp.seek(seek_position)
-    read_content = fp.read(read_size)
+    seek_position, read_size = _get_what_to_read_next(fp, previously_read_position, chunk_size, start)
+    read_content = _pread(fp, seek_position, read_size)
     read_position = seek_position
     return read_content, read_position
 
 
-def _get_what_to_read_next(fp, previously_read_position, chunk_size):
+def _get_what_to_read_next(fp, previously_read_position, chunk_size, start=0):
     """Return information on which file pointer position to read from and how many bytes.
 
     Args:
         fp
         past_read_positon (int): The file pointer position that has been read previously
         chunk_size(int): ideal io chunk_size
+        start (int): The file pointer position not to read before
 
     Returns:
         (int, int): The next seek position, how many bytes to read next
     """
-    seek_position = max(previously_read_position - chunk_size, 0)
+    seek_position = max(previously_read_position - chunk_size, start)
     read_size = chunk_size
 
     # examples: say, our new_lines are potentially "\r\n", "\n", "\r"
@@ -130,9 +392,8 @@ def _get_what_to_read_next(fp, previously_read_position, chunk_size):
     # the next iteration would treat "\r" as a different new line.
     # Q: why don't I just check if it is b"\n", but use a function ?
     # A: so that we can potentially expand this into generic sets of separators, later on.
-    while seek_position > 0:
-        fp.seek(seek_position)
-        if _is_partially_read_new_line(fp.read(1)):
+    while seek_position > start:
+        if _is_partially_read_new_line(_pread(fp, seek_position, 1)):
             seek_position -= 1
             read_size += 1  # as we rewind further, let's make sure we read more to compensate
         else:
@@ -150,8 +411,7 @@ def _remove_trailing_new_line(line):
         bytestring
     """
     # replace only 1 instance of newline
-    # match longest line first (hence the reverse=True), we want to match "\r\n" rather than "\n" if we can
-    for n in sorted(new_lines_bytes, key=lambda x: len(x), reverse=True):
+    for n in _new_lines_bytes_longest_first:
         if line.endswith(n):
             remove_new_line = slice(None, -len(n))
             return line[remove_new_line]
@@ -167,8 +427,98 @@ def _find_furthest_new_line(read_buffer):
     Returns:
         int: The right most position of new line character in read_buffer if found, else -1
     """
-    new_line_positions = [read_buffer.rfind(n) for n in new_lines_bytes]
-    return max(new_line_positions)
+    # "\r\n" ends with "\n", so looking for single byte new lines is enough
+    return _rfind_new_line(read_buffer, 0, len(read_buffer))
+
+
+def _rfind_new_line(data, start, end):
+    """Return the right most position of a new line character in data[start:end], -1 if there is none.
+
+    Once a new line character has been found, the remaining characters are only searched for after it,
+    so each byte gets looked at about once no matter how many kinds of new lines there are.
+
+    Args:
+        data: bytes-like object supporting `rfind` with start and end, such as bytes or mmap
+        start (int): lowest position to search from
+        end (int): position to search up to (exclusive)
+
+    Returns:
+        int
+    """
+    furthest = -1
+    for n in _single_byte_new_lines_bytes:
+        furthest = max(furthest, data.rfind(n, max(furthest, start), end))
+    return furthest
+
+
+def _find_new_line(data, start, end):
+    """Return the position where the left most new line in data[start:end] ends, -1 if there is none.
+
+    A "\r\n" counts as a single new line, so its position is the one of "\n".
+
+    Args:
+        data: bytes-like object supporting `find` with start and end, such as bytes or mmap
+        start (int): position to search from
+        end (int): position to search up to (exclusive)
+
+    Returns:
+        int
+    """
+    nearest = -1
+    for n in _single_byte_new_lines_bytes:
+        i = data.find(n, start, end if nearest < 0 else nearest)
+        if i >= 0:
+            nearest = i
+    if nearest < 0:
+        return nearest
+    for n in _new_lines_bytes_longest_first:
+        if data[nearest:nearest + len(n)] == n:
+            return nearest + len(n) - 1
+    return nearest
+
+
+def _find_line_start(fp, position, chunk_size):
+    """Return the position of the first beginning of a line at or after position.
+
+    Args:
+        fp: file-like object
+        position (int): where to start looking from
+        chunk_size (int): how many bytes to read at a time
+
+    Returns:
+        int: the position of the beginning of a line, or the file size if no line begins after position
+    """
+    if position == 0:
+        return 0
+    # a line begins at position if what comes before it is the end of a new line
+    search_position = position - 1
+    while True:
+        fp.seek(search_position)
+        # one byte more than searched, so that a "\r\n" gets seen in full
+        content = fp.read(chunk_size + 1)
+        i = _find_new_line(content, 0, min(len(content), chunk_size))
+        if i >= 0:
+            return search_position + i + 1
+        if len(content) <= chunk_size:  # we have reached the end of file
+            return search_position + len(content)
+        search_position += chunk_size
+
+
+def _split_lines(block):
+    """Split block into lines, block being the content of complete lines without the trailing new line.
+
+    Args:
+        block (bytestring)
+
+    Returns:
+        list(bytestring): lines in the order they appear in block
+    """
+    # bytes.splitlines() splits on exactly the new lines we support, but it does not return a line
+    # for what follows the very last new line
+    lines = block.splitlines()
+    if not block or _remove_trailing_new_line(block) != block:
+        lines.append(b"")
+    return lines
 
 
 def _is_partially_read_new_line(b):
@@ -184,3 +534,8 @@ def _is_partially_read_new_line(b):
         if n.find(b) >= 1:
             return True
     return False
+
+
+def _count_new_lines(data):
+    """Return how many new lines data holds, a "\\r\\n" counting as a single one."""
+    return data.count(b"\n") + data.count(b"\r") - data.count(b"\r\n")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""AdaptiveChunkSize module."""
+
+import os
+
+from .buffer_work_space import _get_file_size
+
+
+class AdaptiveChunkSize:
+
+    """Class definition for `AdaptiveChunkSize`, which can be given as `chunk_size` to `FileReadBackwards`.
+
+    The first chunk is a whole number of file system blocks (`st_blksize`), plus what is left over at the
+    end of file (or before where reading starts), so that the following reads begin at block boundaries.
+    Then, each time a chunk has been consumed, the next one:
+
+        * doubles, as lines keep being consumed, like a read-ahead would
+        * holds at least `min_lines` lines, going by the lengths of the lines of the last chunk,
+          so that wide lines do not need a read after another to be complete
+        * holds at most `max_lines` lines, so that short lines are not read ahead far more than needed
+
+    and is kept within `min_size` and `max_size`, rounded up to a whole number of blocks.
+    Chunks made larger for wide lines do not count towards the doubling: once lines get short again,
+    chunks shrink back to the size the doubling got to.
+
+    It keeps track of the file system block size of the file being read, so each reader needs its own.
+    """
+
+    def __init__(self, min_size=4096, max_size=1024 * 1024, min_lines=16, max_lines=4096, report=None):
+        """Constructor for AdaptiveChunkSize.
+
+        Args:
+            min_size (int): Smallest chunk size, in bytes
+            max_size (int): Largest chunk size, in bytes
+            min_lines (int): How many lines a chunk should at least hold
+            max_lines (int): How many lines a chunk should at most hold
+            report: Callable called with every chunk size chosen, e.g. `print` or a logger's `debug`
+        """
+        if not 0 < min_size <= max_size:
+            raise ValueError("chunk sizes have to be such that 0 < min_size <= max_size")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.min_lines = min_lines
+        self.max_lines = max_lines
+        self.report = report
+        self.alignment = 4096  # the file system block size, once the first chunk size has been chosen
+        self._read_ahead = None  # the size the doubling got to, when the last chunk was made larger for wide lines
+
+    def initial_size(self, fp, end=None):
+        """Return the size of the first chunk to read from the end of fp.
+
+        Args:
+            fp: file-like object
+            end (int): Position reading starts from, the end of file if None
+
+        Returns:
+            int
+        """
+        try:
+            self.alignment = getattr(os.fstat(fp.fileno()), "st_blksize", 0) or self.alignment
+        except (AttributeError, OSError):  # not a file of the file system, such as a `GzipReader`
+            pass
+        end = _get_file_size(fp) if end is None else end
+        chunk_size = self._align(self.min_size) + end % self.alignment
+        self._read_ahead = None
+        return self._chosen(min(chunk_size, self.max_size))
+
+    def next_size(self, chunk_size, read_size, line_count):
+        """Return the size of the next chunk, once a chunk has been consumed.
+
+        Args:
+            chunk_size (int): Size of the chunk that has been consumed
+            read_size (int): How many bytes the lines of the chunk took, which is more than chunk_size
+                when a line did not fit into it
+            line_count (int): How many lines the chunk held
+
+        Returns:
+            int
+        """
+        average_line_length = read_size / max(line_count, 1)
+        doubled = self._align(2 * (chunk_size if self._read_ahead is None else self._read_ahead))
+        r = max(doubled, int(average_line_length * self.min_lines))
+        r = min(r, int(average_line_length * self.max_lines))
+        r = self._align(r)
+        self._read_ahead = doubled if r > doubled else None
+        if r == chunk_size:
+            return r
+        return self._chosen(r)
+
+    def _align(self, size):
+        """Return size within the bounds, rounded up to a whole number of blocks unless it goes over max_size."""
+        size = max(size, self.min_size)
+        size = -(-size // self.alignment) * self.alignment
+        return min(size, self.max_size)
+
+    def _chosen(self, chunk_size):
+        if self.report is not None:
+            self.report(chunk_size)
+        return chunk_size
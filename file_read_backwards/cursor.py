@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""LineCursor module, moving through the lines of a file in both directions."""
+
+import collections
+import io
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _get_file_size
+from .buffer_work_space import _pread
+from .buffer_work_space import _remove_trailing_new_line
+from .buffer_work_space import _rfind_new_line
+from .file_read_backwards import _check_encoding
+from .file_read_backwards import _open
+
+
+class LineCursor:
+
+    """Class definition for `LineCursor`, a position between two lines of a file, that moves both ways.
+
+    `prev()` returns the line before the cursor and moves it back, `next()` returns the line after it and
+    moves it forward, so that `prev()` then `next()` return the same line. Lines are read backwards through
+    a `BufferWorkSpace`, and forwards a chunk at a time.
+
+    The lines read are kept in a window around the cursor, so that changing direction reads nothing again.
+    Once the window holds more than `max_bytes`, the lines furthest from the cursor on the other side
+    of it get dropped.
+
+    Like `FileReadBackwards`, it reads the file as it was when opened: lines appended since are not seen.
+    """
+
+    def __init__(self, path, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE, position=None,
+                 max_bytes=1024 * 1024):
+        """Constructor for LineCursor.
+
+        Args:
+            path: Path to the file to be read, or any other source `FileReadBackwards` reads from
+            encoding (str): Encoding, None to get lines as bytes without decoding them
+            chunk_size (int): How many bytes to read at a time
+            position (int): Where the cursor begins, which has to be the beginning of a line (such as
+                the position of a `FileReadBackwardsIterator.checkpoint()`), the end of file if None
+            max_bytes (int): How many bytes of lines the window keeps, at least
+        """
+        _check_encoding(encoding)
+        fp, engine, owned = _open(path, "buffered")
+        if engine != "buffered":
+            if owned:
+                fp.close()
+            raise NotImplementedError("A LineCursor cannot read BGZF files.")
+        self.path = getattr(fp, "name", None)
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.file_size = _get_file_size(fp)
+        self.position = self.file_size if position is None else position
+        if not 0 <= self.position <= self.file_size:
+            if owned:
+                fp.close()
+            raise ValueError("position {0} is outside of the file".format(self.position))
+        self.__fp = fp
+        self.__close_fp = owned
+        self.__closed = False
+        self.__lines = collections.deque()  # (line without its new line, size with it) in the order of the file
+        self.__index = 0  # how many lines of the window are before the cursor
+        self.__window_start = self.__window_end = self.position
+        self.__window_size = 0
+        self.__back = None  # work space reading the lines before the window, created when needed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def prev(self):
+        """Return the line before the cursor and move the cursor back to its beginning, None at the beginning of file.
+
+        Returns:
+            unicode string, or bytes without an encoding
+        """
+        if self.__index == 0 and (self.closed or not self.__read_backwards()):
+            return None
+        self.__index -= 1
+        r, size = self.__lines[self.__index]
+        self.position -= size
+        return self.__decode(r)
+
+    def next(self):
+        """Return the line after the cursor and move the cursor forward to its end, None at the end of file.
+
+        Returns:
+            unicode string, or bytes without an encoding
+        """
+        if self.__index == len(self.__lines) and (self.closed or not self.__read_forwards()):
+            return None
+        r, size = self.__lines[self.__index]
+        self.__index += 1
+        self.position += size
+        return self.__decode(r)
+
+    @property
+    def closed(self):
+        """True if the file handler has been closed."""
+        return self.__closed or self.__fp.closed
+
+    def close(self):
+        """Closes the file handler, unless it belongs to someone else."""
+        self.__closed = True
+        self.__lines.clear()
+        self.__index = 0
+        if self.__back is not None:
+            self.__back.close()
+        if self.__close_fp:
+            self.__fp.close()
+
+    def __decode(self, r):
+        return r if self.encoding is None else r.decode(self.encoding)
+
+    def __read_backwards(self):
+        """Add the lines of the chunk before the window to it, return False at the beginning of file."""
+        if self.__back is None:
+            self.__back = BufferWorkSpace(self.__fp, self.chunk_size, end=self.__window_start)
+        back = self.__back
+        if back.has_returned_every_line():
+            return False
+        back.read_until_yieldable()
+        end = back.pending_end()
+        block = back.return_block()
+        start = back.pending_end()
+        parts = block.splitlines(True)
+        if not block or _remove_trailing_new_line(block) != block:
+            parts.append(b"")  # the empty line ended by the trailing new line of block
+        lines = [(_remove_trailing_new_line(p), len(p)) for p in parts]
+        # the last line of block is followed by the new line it was returned without
+        lines[-1] = (lines[-1][0], lines[-1][1] + end - start - len(block))
+        self.__lines.extendleft(reversed(lines))
+        self.__index += len(lines)
+        self.__window_start = start
+        self.__window_size += end - start
+        while self.__window_size > self.max_bytes and self.__index < len(self.__lines):
+            size = self.__lines.pop()[1]
+            self.__window_end -= size
+            self.__window_size -= size
+        return True
+
+    def __read_forwards(self):
+        """Add the lines of the chunk after the window to it, return False at the end of file."""
+        position = self.__window_end
+        if position >= self.file_size:
+            return False
+        content = bytearray()
+        while True:
+            scanned = len(content)
+            # one byte more than needed, so that a "\r\n" does not get split
+            size = min(self.chunk_size + 1, self.file_size - position)
+            content += _pread(self.__fp, position, size)
+            position += size
+            if position >= self.file_size:  # the last line is complete, with or without a new line
+                complete = len(content)
+                break
+            i = _rfind_new_line(content, scanned, len(content) - 1)
+            if i >= 0:
+                complete = i + 2 if content[i:i + 2] == b"\r\n" else i + 1
+                break
+            position -= 1
+            del content[-1]
+        lines = [(_remove_trailing_new_line(p), len(p)) for p in bytes(content[:complete]).splitlines(True)]
+        self.__lines.extend(lines)
+        self.__window_end += complete
+        self.__window_size += complete
+        while self.__window_size > self.max_bytes and self.__index > 0:
+            size = self.__lines.popleft()[1]
+            self.__index -= 1
+            self.__window_start += size
+            self.__window_size -= size
+            if self.__back is not None:  # the lines dropped will have to be read again
+                self.__back.close()
+                self.__back = None
+        return True
@@ -3,12 +3,49 @@
 
 """FileReadBackwards module."""
 
+import hashlib
 import io
 import os
+import time
+import weakref
 
+from .bgzf import BgzfBufferWorkSpace
+from .block_cache import shared_block_cache
+from .bgzf import is_bgzf
 from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _count_new_lines
+from .buffer_work_space import _get_file_size
+from .buffer_work_space import _pread
+from .buffer_work_space import _remove_trailing_new_line
+from .buffer_work_space import _rfind_new_line
+from .buffer_work_space import _single_byte_new_lines_bytes
+from .buffer_work_space import _split_lines
+from .buffer_work_space import _supports_pread
+from .chunk_size import AdaptiveChunkSize
+from .gzip_reader import GzipReader
+from .gzip_reader import gzip_magic
+from .memory_file import MemoryFile
+from .mmap_buffer_work_space import MmapBufferWorkSpace
+from .separator import SeparatorBufferWorkSpace
+from .separator import _overlaps_itself
+from .separator import _split_records
+from .stats import CountingFile
+from .stats import ReadStats
+from .wide import WideBufferWorkSpace
+from .wide import code_unit_sizes
 
 supported_encodings = ["utf-8", "ascii", "latin-1"]  # any encodings that are backward compatible with ascii should work
+wide_encodings = list(code_unit_sizes)  # read through a `WideBufferWorkSpace`, by `FileReadBackwards` only
+work_spaces = {
+    "buffered": BufferWorkSpace,
+    "mmap": MmapBufferWorkSpace,
+    "bgzf": BgzfBufferWorkSpace,  # picked for BGZF files rather than chosen
+}
+supported_engines = ["buffered", "mmap"]
+max_gzip_header_size = 512  # enough to hold the extra field of a BGZF member
+newlines = [None, "", "\n", "\r\n", "\r", "auto"]  # None and "" split on any new line, "auto" picks one
+auto_newline_size = io.DEFAULT_BUFFER_SIZE  # how many bytes from the end of file "auto" looks at
+fingerprint_size = 256  # how many bytes before its position a checkpoint fingerprints
 
 
 class FileReadBackwards:
@@ -22,23 +59,107 @@ class FileReadBackwards:
     In any mode, `close()` can be called to close the file handler..
     """
 
-    def __init__(self, path, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE):
+    def __init__(self, path, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE, engine="buffered", read_ahead=0,
+                 stats=False, on_chunk=None, separator=None, newline=None, block_cache=None, checkpoint=None):
         """Constructor for FileReadBackwards.
 
         Args:
-            path: Path to the file to be read
-            encoding (str): Encoding
-            chunk_size (int): How many bytes to read at a time
+            path: Path to the file to be read (str, bytes or path-like), or else an open file descriptor,
+                a binary file object, or the content itself as a bytearray or a memoryview (see `from_buffer()`
+                for bytes). File descriptors and file objects are left open by `close()`
+            encoding (str): Encoding, None to get lines as bytes without decoding them
+            chunk_size (int): How many bytes to read at a time, or an `AdaptiveChunkSize` to have it adapt to
+                the lines being read
+            engine (str): How the file is read, "buffered" reads chunks with seek/read,
+                "mmap" memory maps the file and scans it in place
+            read_ahead (int): How many chunks a worker thread may read ahead while lines get split and decoded,
+                0 not to read ahead, "buffered" engine only
+            stats (bool): Whether to count the work done into `stats`, a `ReadStats`,
+                or else the `ReadStats` to count it into (e.g. one shared by several readers)
+            on_chunk: function(position, size) called after each chunk got read, which turns `stats` on
+            separator: What to split records on instead of new lines (bytes, or str to be encoded),
+                such as b"\x00", "buffered" engine only
+            newline (str): Which new lines split lines, like for `open()`: None or "" for any of them,
+                "\n", "\r\n" or "\r" for that one only, or "auto" for the only one found in the last chunk,
+                if there is a single kind there. A single kind needs the "buffered" engine, and gets split on
+                like a separator, which is faster
+            block_cache: A `BlockCache` to read the file through, shared with other readers, True for
+                `shared_block_cache` (the one of the process), "buffered" engine and paths only
+            checkpoint (dict): What `FileReadBackwardsIterator.checkpoint()` returned, to resume reading
+                from the line it was taken at
+
+        With the "buffered" engine, a BGZF file is read a member at a time by a `BgzfBufferWorkSpace`,
+        and any other gzip file through a `GzipReader`, which needs its path.
+
+        Chunks of files of the file system are read with os.pread where it is available, a single system call
+        that leaves the file position alone, so a file descriptor may be shared with the rest of a program.
+
+        A file in one of `wide_encodings` (UTF-16 or UTF-32) is read by a `WideBufferWorkSpace`,
+        with the "buffered" engine only, and not from a BGZF file.
+
+        Raises:
+            ValueError: if the file a checkpoint was taken of got replaced or truncated since
         """
-        if encoding.lower() not in supported_encodings:
-            error_message = "{0} encoding was not supported/tested.".format(encoding)
-            error_message += "Supported encodings are '{0}'".format(",".join(supported_encodings))
+        _check_encoding(encoding, wide=True)
+        if engine not in supported_engines:
+            error_message = "{0} engine was not supported.".format(engine)
+            error_message += "Supported engines are '{0}'".format(",".join(supported_engines))
             raise NotImplementedError(error_message)
+        if read_ahead and engine != "buffered":
+            raise NotImplementedError("Only the buffered engine reads ahead.")
+        if encoding is not None and encoding.lower() in wide_encodings and engine != "buffered":
+            raise NotImplementedError("Only the buffered engine reads {0} files.".format(encoding))
+        if block_cache is not None and engine != "buffered":
+            raise NotImplementedError("Only the buffered engine reads through a block cache.")
+        if newline not in newlines:
+            raise ValueError("illegal newline value: {0!r}".format(newline))
+        if separator is not None and newline:
+            raise ValueError("separator and newline cannot both be given")
+        if (separator is not None or newline in ("\n", "\r\n", "\r")) and engine != "buffered":
+            raise NotImplementedError("Only the buffered engine splits records on a separator or a single new line.")
 
         self.path = path
-        self.encoding = encoding.lower()
+        self.encoding = encoding.lower() if encoding is not None else None
         self.chunk_size = chunk_size
-        self.iterator = FileReadBackwardsIterator(io.open(self.path, mode="rb"), self.encoding, self.chunk_size)
+        self.engine = engine
+        self.read_ahead = read_ahead
+        self.separator = separator
+        self.newline = newline
+        self.block_cache = shared_block_cache if block_cache is True else block_cache
+        if isinstance(separator, str):
+            separator = separator.encode(self.encoding or "ascii")
+        if not isinstance(stats, ReadStats):
+            stats = ReadStats() if stats or on_chunk is not None else None
+        if on_chunk is not None:
+            stats.on_chunk = on_chunk
+        self.stats = stats
+        fp, engine, owned = _open(self.path, self.engine, self.block_cache)
+        end = None
+        if checkpoint is not None:
+            try:
+                end = _check_checkpoint(fp, checkpoint)
+            except Exception:
+                if owned:
+                    fp.close()
+                raise
+        if newline in ("\n", "\r\n", "\r"):
+            separator = newline.encode("ascii")
+        elif newline == "auto" and engine == "buffered" and self.encoding not in wide_encodings:
+            separator = _detect_newline(fp, end)
+        self.iterator = FileReadBackwardsIterator(fp, self.encoding, self.chunk_size, engine, self.read_ahead,
+                                                  self.stats, separator, owned, end)
+
+    @classmethod
+    def from_buffer(cls, content, *args, **kwargs):
+        """Return a `FileReadBackwards` reading content in memory, any object supporting the buffer protocol.
+
+        Unlike passing bytes to the constructor, which are taken to be a path, the content is not copied.
+
+        Args:
+            content: bytes, a bytearray, a memoryview, or any other bytes-like object
+            *args, **kwargs: The other arguments of the constructor
+        """
+        return cls(memoryview(content), *args, **kwargs)
 
     def __iter__(self):
         """Return its iterator."""
@@ -57,13 +178,212 @@ class FileReadBackwards:
         self.iterator.close()
 
     def readline(self):
-        """Return a line content (with a trailing newline) if there are content. Return '' otherwise."""
+        """Return a line content (with a trailing newline) if there are content. Return '' otherwise.
 
+        Without an encoding, the line and the empty string are bytes.
+        With a separator, records end with the separator rather than with a new line.
+        """
+        linesep = os.linesep if self.separator is None else self.separator
+        if self.encoding is None and isinstance(linesep, str):
+            linesep = linesep.encode("ascii")
+        elif self.encoding is not None and not isinstance(linesep, str):
+            linesep = linesep.decode(self.encoding)
         try:
-            r = next(self.iterator) + os.linesep
+            r = next(self.iterator) + linesep
             return r
         except StopIteration:
-            return ""
+            return linesep[:0]
+
+    def iter_batches(self, max_lines=None):
+        """Yield lists of lines, see `FileReadBackwardsIterator.iter_batches`."""
+        return self.iterator.iter_batches(max_lines)
+
+    def search(self, pattern, max_matches=None):
+        """Yield the lines holding pattern, see `FileReadBackwardsIterator.search`."""
+        return self.iterator.search(pattern, max_matches)
+
+    def checkpoint(self):
+        """Return where reading got to, see `FileReadBackwardsIterator.checkpoint`."""
+        return self.iterator.checkpoint()
+
+
+def _check_encoding(encoding, wide=False):
+    """Raise NotImplementedError unless encoding is one of `supported_encodings` or None.
+
+    With wide=True, `wide_encodings` are supported as well.
+    """
+    encodings = supported_encodings + wide_encodings if wide else supported_encodings
+    if encoding is not None and encoding.lower() not in encodings:
+        error_message = "{0} encoding was not supported/tested.".format(encoding)
+        error_message += "Supported encodings are '{0}'".format(",".join(encodings))
+        raise NotImplementedError(error_message)
+
+
+def _open(path, engine, block_cache=None):
+    """Return a binary file handler of path, the engine to read it with, and whether closing it is up to us.
+
+    Args:
+        path: Path to the file, an open file descriptor, a binary file object, or a bytearray or memoryview
+            of the content
+        block_cache (BlockCache): The cache to open a path through, if any
+
+    A gzip file is read with the "bgzf" engine if it is a BGZF file, or else through a `GzipReader`.
+    """
+    if isinstance(path, (bytearray, memoryview)):  # bytes are a path
+        fp, owned = MemoryFile(path), True
+    elif isinstance(path, int):
+        fp, owned = io.open(path, mode="rb", closefd=False), True  # closing it leaves the descriptor open
+    elif hasattr(path, "read"):
+        fp, owned = path, False
+    elif block_cache is not None:
+        fp, owned = block_cache.open(path), True
+    else:
+        fp, owned = io.open(path, mode="rb"), True
+    if engine == "mmap" and isinstance(fp, MemoryFile):
+        raise NotImplementedError("Content in memory can only be read with the buffered engine.")
+    header = _pread(fp, 0, max_gzip_header_size)
+    if header[:len(gzip_magic)] != gzip_magic:
+        return fp, engine, owned
+    if engine == "buffered" and is_bgzf(header):
+        return fp, "bgzf", owned
+    if owned:
+        fp.close()
+    if engine != "buffered":
+        raise NotImplementedError("gzip files can only be read with the buffered engine.")
+    if isinstance(fp, MemoryFile) or isinstance(path, int) or not owned:
+        raise NotImplementedError("gzip files other than BGZF ones can only be read from a path.")
+    return GzipReader(path), engine, True
+
+
+def _detect_newline(fp, end=None):
+    """Return the new line the last `auto_newline_size` bytes of fp hold, None unless they hold a single kind.
+
+    With end, the bytes before it are looked at instead.
+    """
+    end = _get_file_size(fp) if end is None else end
+    content = _pread(fp, max(end - auto_newline_size, 0), auto_newline_size)
+    crlf, cr, lf = content.count(b"\r\n"), content.count(b"\r"), content.count(b"\n")
+    if crlf and cr == lf == crlf:
+        return b"\r\n"
+    if lf and not cr:
+        return b"\n"
+    if cr and not lf:
+        return b"\r"
+    return None
+
+
+def _file_key(fp):
+    """Return the device, inode, size and modification time of the file fp reads, None for content in memory."""
+    fp = getattr(fp, "__wrapped__", fp)  # the file object wrapped by a `CountingFile`
+    if isinstance(fp, GzipReader):  # positions are the ones of its content, the gzip file is what gets replaced
+        return list(fp.index.file_key)
+    try:
+        st = os.fstat(fp.fileno())
+    except (AttributeError, OSError, ValueError):  # no file descriptor, as for a `MemoryFile`
+        return None
+    return [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _check_checkpoint(fp, checkpoint):
+    """Return the position to resume reading fp before, as recorded by checkpoint.
+
+    The file is taken to be the same one if it has the same device and inode, did not get any shorter
+    (a log only gets appended to), and still holds the bytes right before the position it held then,
+    which catches a file truncated then written to past its former size (as by copytruncate rotation).
+    Content in memory only needs to be long enough, and to hold the same bytes.
+
+    Raises:
+        ValueError: if the file got replaced or truncated since the checkpoint was taken
+    """
+    position, recorded = checkpoint["position"], checkpoint["file"]
+    name = getattr(fp, "name", None) or "the content"
+    if recorded is None:
+        if _get_file_size(fp) < position:
+            raise ValueError("{0} is shorter than the checkpoint position {1}".format(name, position))
+    else:
+        current = _file_key(fp)
+        if current is None or current[:2] != recorded[:2]:
+            raise ValueError("{0} is not the file the checkpoint was taken of, it got replaced".format(name))
+        if current[2] < recorded[2]:
+            raise ValueError("{0} got truncated since the checkpoint was taken".format(name))
+    fingerprint = checkpoint.get("fingerprint")
+    if fingerprint is not None and _fingerprint(fp, position) != fingerprint:
+        raise ValueError("{0} got truncated since the checkpoint was taken, its content changed".format(name))
+    return position
+
+
+def _fingerprint(fp, position):
+    """Return a hash of the `fingerprint_size` bytes of fp before position, as a hexadecimal string."""
+    start = max(position - fingerprint_size, 0)
+    return hashlib.sha1(_pread(fp, start, position - start)).hexdigest()
+
+
+def _matching_lines(block, find, separator=None):
+    """Return the lines of block holding a match, along with where they begin in block, from the last one.
+
+    Args:
+        block (bytestring): content of complete lines, without the trailing new line
+        find: function(data, position) returning where a match is first found from position, -1 if nowhere
+        separator (bytes): what lines are split on, None for new lines
+
+    Returns:
+        list((int, bytestring))
+    """
+    if separator is not None and _overlaps_itself(separator):
+        # a separator found right before a match is not always one of those matched from the end
+        lines = []
+        line_start = 0
+        for r in block.rsplit(separator):
+            if find(r, 0) >= 0:
+                lines.append((line_start, r))
+            line_start += len(r) + len(separator)
+        return lines[::-1]
+    lines = []
+    position = 0
+    while position <= len(block):
+        i = find(block, position)
+        if i < 0:
+            break
+        if separator is None:
+            if block[i - 1:i + 1] == b"\r\n":  # the match begins between the two characters of a new line
+                position = i + 1
+                continue
+            line_start = _rfind_new_line(block, 0, i) + 1
+            line_end = _find_new_line_start(block, i, len(block))
+            next_line_start = line_end + 2 if block[line_end:line_end + 2] == b"\r\n" else line_end + 1
+        else:
+            # the separator before the line, or the one the match begins inside of
+            line_start = block.rfind(separator, 0, i + len(separator) - 1)
+            line_start = line_start + len(separator) if line_start >= 0 else 0
+            if line_start > i:  # the match begins inside a separator
+                position = line_start
+                continue
+            line_end = block.find(separator, i)
+            line_end = line_end if line_end >= 0 else len(block)
+            next_line_start = line_end + len(separator)
+        r = block[line_start:line_end]
+        # the match may run past the end of the line it begins in, so the line has to hold one on its own
+        if find(r, 0) >= 0:
+            lines.append((line_start, r))
+        position = next_line_start  # one match is enough for a line, and none of it holds one otherwise
+    return lines[::-1]
+
+
+def _release(buf, fp):
+    """Close work space buf, and fp unless it is None, for an iterator being closed or collected."""
+    buf.close()
+    if fp is not None:
+        fp.close()
+
+
+def _find_new_line_start(data, start, end):
+    """Return the position of the first new line character in data[start:end], end if there is none."""
+    nearest = end
+    for n in _single_byte_new_lines_bytes:
+        i = data.find(n, start, nearest)
+        if i >= 0:
+            nearest = i
+    return nearest
 
 
 class FileReadBackwardsIterator:
@@ -71,25 +391,75 @@ class FileReadBackwardsIterator:
 
     This will read backwards line by line a file. It holds an opened file handler.
     """
-    def __init__(self, fp, encoding, chunk_size):
+    def __init__(self, fp, encoding, chunk_size, engine="buffered", read_ahead=0, stats=None, separator=None,
+                 close_fp=True, end=None):
         """Constructor for FileReadBackwardsIterator
 
         Args:
             fp (File): A file that we wish to start reading backwards from
-            encoding (str): Encoding of the file
-            chunk_size (int): How many bytes to read at a time
+            encoding (str): Encoding of the file, None to return lines as bytes
+            chunk_size (int): How many bytes to read at a time, or an `AdaptiveChunkSize`, in which case
+                `chunk_size` is then the size of the chunk being read
+            engine (str): One of `supported_engines`
+            read_ahead (int): How many chunks a worker thread may read ahead, 0 not to read ahead
+            stats (ReadStats): What to count the work done into, None not to count it
+            separator (bytes): What to split records on instead of new lines, None to split lines
+            close_fp (bool): Whether closing the iterator closes fp, False to leave that to its owner
+            end (int): Position to start reading backwards from, the end of file if None
         """
-        self.path = fp.name
+        self.path = getattr(fp, "name", None)
         self.encoding = encoding
+        # lines of wide encodings get transcoded to UTF-8 as chunks are read
+        wide = encoding is not None and encoding in wide_encodings
+        self.__decoding = "utf-8" if wide else encoding
+        self.__chunk_sizer = None
+        if isinstance(chunk_size, AdaptiveChunkSize):
+            self.__chunk_sizer = chunk_size
+            chunk_size = chunk_size.initial_size(fp, end)
         self.chunk_size = chunk_size
+        self.stats = stats
+        self.separator = separator
+        self.__overlapping = separator is not None and _overlaps_itself(separator)
         self.__fp = fp
-        self.__buf = BufferWorkSpace(self.__fp, self.chunk_size)
+        self.__closed = False
+        # the work space reads through a wrapper counting its calls, while closing is left to the iterator
+        work_space_fp = fp if stats is None else CountingFile(fp, stats)
+        if end is not None and (wide or engine == "bgzf"):
+            if close_fp:
+                fp.close()
+            raise NotImplementedError("Reading {0} files cannot be resumed.".format(encoding if wide else "BGZF"))
+        if wide:
+            if engine != "buffered" or separator is not None:
+                if close_fp:
+                    fp.close()
+                raise NotImplementedError("{0} files can only be read with the buffered engine, "
+                                          "split on new lines.".format(encoding))
+            self.__buf = WideBufferWorkSpace(work_space_fp, self.chunk_size, encoding)
+        elif separator is not None:
+            if engine != "buffered":
+                if close_fp:
+                    fp.close()
+                raise NotImplementedError("Records can only be split on a separator with the buffered engine.")
+            self.__buf = SeparatorBufferWorkSpace(work_space_fp, self.chunk_size, separator, end=end)
+        else:
+            self.__buf = work_spaces[engine](work_space_fp, self.chunk_size, end=end)
+        self.__buf.stats = stats
+        if read_ahead:
+            self.__buf.start_read_ahead(read_ahead)
+        # an iterator dropped without being closed still stops its read-ahead thread and closes its file
+        self.__release = weakref.finalize(self, _release, self.__buf, fp if close_fp else None)
+        self.__lines = []  # lines split from the buffer that have not been returned, last line first
+        self.__lines_index = 0
+        self.__block = b""  # what the lines got split from, for checkpoints to find where they end
+        self.__block_start = self.__block_end = 0  # where the block begins, and ends with its trailing new line
+        self.__exhausted = False
+        self.__unsearched = None  # (block, where its last line yielded begins, where it begins), see `search()`
 
     def __iter__(self):
         return self
 
     def next(self):
-        """Returns unicode string from the last line until the beginning of file.
+        """Returns unicode string (bytes without an encoding) from the last line until the beginning of file.
 
         Gets exhausted if::
 
@@ -102,16 +472,209 @@ class FileReadBackwardsIterator:
         # bytes to encode different Unicode points.
         # Without using binary mode, we would probably need to understand each encoding more
         # and do the seek operations to find the proper boundary before issuing read
-        if self.closed:
+        if not self.__fill_lines():
             raise StopIteration
+        r = self.__lines[self.__lines_index]
+        self.__lines_index += 1
+        return self.__decode(r)
+
+    __next__ = next
+
+    def iter_batches(self, max_lines=None):
+        """Yield lists of unicode strings (bytes without an encoding) from the last line until the beginning of file.
+
+        Each list holds the lines of one chunk, which got split in a single pass, in reverse order.
+        It shares its position with `next()`, so both can be used on the same iterator.
+
+        Args:
+            max_lines (int): If given, lists hold at most this many lines
+        """
+        while self.__fill_lines():
+            start = self.__lines_index
+            end = len(self.__lines) if max_lines is None else min(start + max_lines, len(self.__lines))
+            self.__lines_index = end
+            if self.stats is not None:
+                self.stats.lines += end - start
+            if self.encoding is None:
+                yield self.__lines[start:end]
+            elif self.stats is None:
+                yield [r.decode(self.__decoding) for r in self.__lines[start:end]]
+            else:
+                began = time.perf_counter()
+                lines = [r.decode(self.__decoding) for r in self.__lines[start:end]]
+                self.stats.decode_time += time.perf_counter() - began
+                yield lines
+
+    def search(self, pattern, max_matches=None):
+        """Yield unicode strings (bytes without an encoding) of the lines holding pattern, from the last one.
+
+        Each chunk is searched as a whole before being split or decoded, only the lines holding a match get
+        split out of it. As chunks are cut at line boundaries, a match cannot be split across two of them,
+        and a match running past the end of the line it begins in only counts if the line holds one of its own.
+        It shares its position with `next()`, so matching lines are looked for from the current line up,
+        and the lines it went through are consumed, up to the last line it yielded: the lines before it,
+        which have not been searched yet, are left for `next()` or `checkpoint()` to carry on from.
+        The search then stops, as its position got taken over.
+
+        Args:
+            pattern: A literal to look for (str, or bytes), or a compiled bytes regular expression
+            max_matches (int): If given, stop after yielding this many lines
+        """
+        find = self.__make_find(pattern)
+        matches = 0
+        if max_matches is not None and max_matches <= 0:
+            return
+        self.__take_unsearched()
+        # lines that have been split already get searched one by one
+        while not self.closed and self.__lines_index < len(self.__lines):
+            r = self.__lines[self.__lines_index]
+            self.__lines_index += 1
+            if find(r, 0) >= 0:
+                yield self.__decode(r)
+                matches += 1
+                if matches == max_matches:
+                    return
+        while not self.closed:
+            if self.__buf.has_returned_every_line():
+                self.__exhausted = True
+                self.close()
+                return
+            self.__buf.read_until_yieldable()
+            block = self.__buf.return_block()
+            separator = self.separator
+            line_count = (_count_new_lines(block) if separator is None else block.count(separator)) + 1
+            self.__adapt_chunk_size(len(block), line_count)
+            block_start = self.__buf.pending_end()
+            for line_start, r in _matching_lines(block, find, self.separator):
+                unsearched = self.__unsearched = (block, line_start, block_start)
+                yield self.__decode(r)
+                matches += 1
+                if matches == max_matches or self.__unsearched is not unsearched:
+                    return
+            self.__unsearched = None
+
+    def __take_unsearched(self):
+        """Make the lines of the block `search()` got to before its last match the lines to be returned."""
+        if self.__unsearched is None:
+            return
+        block, line_start, block_start = self.__unsearched
+        self.__unsearched = None
+        # what comes before the line yielded ends with a separator or a new line, unless there is nothing
+        if self.separator is None:
+            block = _remove_trailing_new_line(block[:line_start])
+            self.__lines = _split_lines(block)[::-1] if line_start else []
+        else:
+            block = block[:max(line_start - len(self.separator), 0)]
+            self.__lines = _split_records(block, self.separator, self.__overlapping)[::-1] if line_start else []
+        self.__lines_index = 0
+        self.__block = block
+        self.__block_start = block_start
+        self.__block_end = block_start + line_start
+
+    def checkpoint(self):
+        """Return a checkpoint of where reading got to, which `FileReadBackwards(checkpoint=...)` resumes from.
+
+        It is a dict of plain values, that can be pickled or saved as JSON, to be given back as is: the position
+        where the next line to be returned ends, the device, inode, size and modification time of the file,
+        and a fingerprint of the bytes before the position.
+        Resuming reads nothing after that position, and fails if the file got replaced or truncated since.
+        Lines `search()` went through without yielding them count as returned, see `search()`.
+
+        Raises:
+            NotImplementedError: for files in one of `wide_encodings` and BGZF files, whose work spaces do not
+                hold the bytes of the file as they are
+            ValueError: if the iterator got closed before it was exhausted
+        """
+        if isinstance(self.__buf, (WideBufferWorkSpace, BgzfBufferWorkSpace)):
+            raise NotImplementedError("Reading {0} files cannot be resumed.".format(
+                self.encoding if isinstance(self.__buf, WideBufferWorkSpace) else "BGZF"))
+        if self.__exhausted:
+            return {"position": self.__buf.start, "file": None, "fingerprint": None}
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self.__take_unsearched()
+        position = self.__pending_end()
+        fingerprint = None
+        # the worker thread reading ahead owns the position of a file that cannot be read at a position
+        if getattr(self.__buf, "read_ahead", None) is None or _supports_pread(self.__fp):
+            fingerprint = _fingerprint(self.__fp, position)
+        return {"position": position, "file": _file_key(self.__fp), "fingerprint": fingerprint}
+
+    def __pending_end(self):
+        """Return where the next line to be returned ends in the file, its new line included."""
+        pending = len(self.__lines) - self.__lines_index
+        if not pending:
+            return self.__buf.pending_end()
+        if self.__lines_index == 0:
+            return self.__block_end
+        # the pending lines come first in the block, each of them followed by a separator or a new line
+        block = self.__block
+        separator = self.separator
+        position = 0
+        for r in self.__lines[:self.__lines_index - 1:-1]:
+            position += len(r)
+            if separator is not None:
+                position += len(separator)
+            else:
+                position += 2 if block[position:position + 2] == b"\r\n" else 1
+        return self.__block_start + position
+
+    def __make_find(self, pattern):
+        """Return a function(data, position) returning where pattern is first found from position, -1 if nowhere."""
+        if isinstance(pattern, str):
+            pattern = pattern.encode(self.__decoding or "ascii")
+        if isinstance(pattern, (bytes, bytearray)):
+            return lambda data, position: data.find(pattern, position)
+        if not isinstance(pattern.pattern, bytes):
+            raise TypeError("search() needs a bytes regular expression, as lines get searched before being decoded")
+
+        def find(data, position):
+            m = pattern.search(data, position)
+            return m.start() if m is not None else -1
+        return find
+
+    def __decode(self, r):
+        """Return line r as it gets yielded, counting it when there are stats."""
+        if self.stats is not None:
+            self.stats.lines += 1
+            if self.encoding is not None:
+                began = time.perf_counter()
+                r = r.decode(self.__decoding)
+                self.stats.decode_time += time.perf_counter() - began
+                return r
+        if self.encoding is None:
+            return r
+        return r.decode(self.__decoding)
+
+    def __fill_lines(self):
+        """Make sure there are lines to be returned, return False when exhausted."""
+        if self.closed:
+            return False
+        self.__take_unsearched()
+        if self.__lines_index < len(self.__lines):
+            return True
         if self.__buf.has_returned_every_line():
+            self.__exhausted = True
             self.close()
-            raise StopIteration
+            return False
         self.__buf.read_until_yieldable()
-        r = self.__buf.return_line()
-        return r.decode(self.encoding)
-
-    __next__ = next
+        self.__block_end = self.__buf.pending_end()
+        block = self.__buf.return_block()
+        self.__block_start = self.__buf.pending_end()
+        self.__block = block
+        if self.separator is None:
+            self.__lines = _split_lines(block)[::-1]
+        else:
+            self.__lines = _split_records(block, self.separator, self.__overlapping)[::-1]
+        self.__lines_index = 0
+        self.__adapt_chunk_size(len(block), len(self.__lines))
+        return True
+
+    def __adapt_chunk_size(self, read_size, line_count):
+        """Choose the size of the next chunk, once one holding line_count lines in read_size bytes was read."""
+        if self.__chunk_sizer is not None:
+            self.chunk_size = self.__chunk_sizer.next_size(self.chunk_size, read_size, line_count)
+            self.__buf.chunk_size = self.chunk_size
 
     @property
     def closed(self):
@@ -119,8 +682,9 @@ class FileReadBackwardsIterator:
 
         :return: True if the file handler is still opened. False otherwise.
         """
-        return self.__fp.closed
+        return self.__closed or self.__fp.closed
 
     def close(self):
-        """Closes the file handler."""
-        self.__fp.close()
+        """Closes the file handler, unless it belongs to someone else."""
+        self.__closed = True
+        self.__release()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Follow module, the equivalent of `tail -n N -F`."""
+
+import ctypes
+import ctypes.util
+import io
+import os
+import select
+import sys
+import time
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _pread
+from .buffer_work_space import _remove_trailing_new_line
+from .buffer_work_space import _rfind_new_line
+from .buffer_work_space import _single_byte_new_lines_bytes
+from .buffer_work_space import _split_lines
+from .file_read_backwards import _check_encoding
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+
+truncation_check_size = 64  # how many bytes before what has been read get compared, to tell a file got rewritten
+
+
+def tail_follow(path, n=10, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE, poll_interval=0.05,
+                max_poll_interval=1.0, use_inotify=True):
+    """Yield the last n lines of a file in file order, then every line appended to it as it shows up.
+
+    The last lines are found with the usual backward reading, then the same file handler is used to read
+    what gets appended. A last line without a trailing new line is only yielded once it is complete.
+
+    The file getting truncated makes it being read again from its beginning, even when it got written to past
+    where it was read up to in the meantime (as with copytruncate rotation), which is told by the bytes before
+    that position having changed. The file getting rotated
+    (renamed or deleted, and created again) makes the rest of the old file being read, then the new file.
+
+    On Linux, inotify wakes the reader up as soon as the file changes, the file is also checked every
+    `max_poll_interval` seconds. Elsewhere (or with `use_inotify=False`), the file is polled, every
+    `poll_interval` seconds while it grows, backing off up to every `max_poll_interval` seconds while it does not.
+
+    The generator never gets exhausted, call its `close()` to stop following the file.
+
+    Args:
+        path: Path to the file to be followed
+        n (int): How many of the last lines to start with
+        encoding (str): Encoding, None to get lines as bytes without decoding them
+        chunk_size (int): How many bytes to read at a time
+        poll_interval (float): Shortest time between two checks of the file, in seconds
+        max_poll_interval (float): Longest time between two checks of the file, in seconds
+        use_inotify (bool): Whether to use inotify where it is available
+    """
+    _check_encoding(encoding)
+    decode = (lambda r: r) if encoding is None else (lambda r: r.decode(encoding))
+
+    fp = io.open(path, mode="rb")
+    watcher = None
+    try:
+        lines, follower = _read_last_lines(fp, n, chunk_size)
+        for r in lines:
+            yield decode(r)
+
+        watcher = _make_watcher(path, poll_interval, max_poll_interval, use_inotify)
+        while True:
+            if follower.truncated():
+                follower.rewind()
+            lines = follower.read_appended_lines()
+            if not lines and follower.rotated(path):
+                lines = follower.flush()
+                fp.close()
+                fp = io.open(path, mode="rb")
+                follower = _Follower(fp, 0, chunk_size)
+                watcher.rewatch(path)
+                for r in lines:
+                    yield decode(r)
+                continue
+            for r in lines:
+                yield decode(r)
+            watcher.wait(bool(lines))
+    finally:
+        fp.close()
+        if watcher is not None:
+            watcher.close()
+
+
+def _read_last_lines(fp, n, chunk_size):
+    """Return the last n complete lines of fp in file order, and a _Follower to read what gets appended."""
+    buf = BufferWorkSpace(fp, chunk_size)
+    file_size = buf.read_position
+    lines = []
+    # one more line than asked for, in case the last one is not complete yet
+    while len(lines) < n + 1 and not buf.has_returned_every_line():
+        buf.read_until_yieldable()
+        lines.extend(buf.return_lines())
+
+    follower = _Follower(fp, file_size, chunk_size)
+    if file_size:
+        fp.seek(file_size - 1)
+        last_byte = fp.read(1)
+        if last_byte not in _single_byte_new_lines_bytes:
+            follower.pending = lines.pop(0)
+        follower.skip_line_feed = last_byte == b"\r"
+    return lines[:n][::-1], follower
+
+
+class _Follower:
+
+    """Reads lines appended to a file handler, from a given position onwards."""
+
+    def __init__(self, fp, position, chunk_size):
+        self.fp = fp
+        self.position = position
+        self.chunk_size = chunk_size
+        self.pending = b""  # the start of a line whose new line has not been read yet
+        self.skip_line_feed = False  # the last new line was a "\r" which may be the start of a "\r\n"
+        # the last bytes read, which are still there unless the file got truncated
+        self.tail = _pread(fp, max(position - truncation_check_size, 0), min(position, truncation_check_size))
+
+    def read_appended_lines(self):
+        """Return the complete lines that got appended since the last call, in file order."""
+        self.fp.seek(self.position)
+        chunks = []
+        while True:
+            chunk = self.fp.read(self.chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        if not chunks:
+            return []
+        content = b"".join(chunks)
+        self.position += len(content)
+        self.tail = (self.tail + content[-truncation_check_size:])[-truncation_check_size:]
+
+        if self.skip_line_feed and content.startswith(b"\n"):
+            content = content[1:]
+        data = self.pending + content
+        i = _rfind_new_line(data, 0, len(data))
+        if i < 0:
+            self.pending = data
+            self.skip_line_feed = False
+            return []
+        self.pending = data[i + 1:]
+        self.skip_line_feed = not self.pending and data.endswith(b"\r")
+        return _split_lines(_remove_trailing_new_line(data[:i + 1]))
+
+    def flush(self):
+        """Return what is left of a last line that has no trailing new line, as there will not be any."""
+        lines = [self.pending] if self.pending else []
+        self.pending = b""
+        return lines
+
+    def truncated(self):
+        """Return True if the file got shorter than what has been read, or if what has been read changed."""
+        if os.fstat(self.fp.fileno()).st_size < self.position:
+            return True
+        return bool(self.tail) and _pread(self.fp, self.position - len(self.tail), len(self.tail)) != self.tail
+
+    def rewind(self):
+        """Start reading the file from its beginning again."""
+        self.position = 0
+        self.pending = b""
+        self.skip_line_feed = False
+        self.tail = b""
+
+    def rotated(self, path):
+        """Return True if path now refers to another file than the one being read."""
+        try:
+            st = os.stat(path)
+        except OSError:  # the file is gone and has not been created again yet
+            return False
+        current = os.fstat(self.fp.fileno())
+        return (st.st_dev, st.st_ino) != (current.st_dev, current.st_ino)
+
+
+def _make_watcher(path, poll_interval, max_poll_interval, use_inotify):
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return _InotifyWatcher(path, max_poll_interval)
+        except OSError:
+            pass
+    return _PollingWatcher(poll_interval, max_poll_interval)
+
+
+class _PollingWatcher:
+
+    """Waits between two checks of the file, for longer and longer while nothing happens."""
+
+    def __init__(self, poll_interval, max_poll_interval):
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.interval = poll_interval
+
+    def wait(self, activity):
+        """Wait before the next check of the file.
+
+        Args:
+            activity (bool): Whether the last check found anything
+        """
+        if activity:
+            self.interval = self.poll_interval
+        time.sleep(self.interval)
+        if not activity:
+            self.interval = min(self.interval * 2, self.max_poll_interval)
+
+    def rewatch(self, path):
+        pass
+
+    def close(self):
+        pass
+
+
+class _InotifyWatcher:
+
+    """Waits until inotify reports a change to the file, or to the directory holding it."""
+
+    file_mask = IN_MODIFY | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+    directory_mask = IN_CREATE | IN_MOVED_TO
+
+    def __init__(self, path, max_poll_interval):
+        self.max_poll_interval = max_poll_interval
+        self._file_watch = None  # watch descriptor of the file
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            self._add_watch(os.path.dirname(os.path.abspath(path)), self.directory_mask)
+            self.rewatch(path)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, activity):
+        """Wait until something happens to the file, or at most `max_poll_interval` seconds.
+
+        Args:
+            activity (bool): Whether the last check found anything, then there is no need to wait
+        """
+        if activity:
+            return
+        readable, _, _ = select.select([self._fd], [], [], self.max_poll_interval)
+        if readable:
+            try:
+                while os.read(self._fd, 4096):  # drain the events, all we need to know is that something happened
+                    pass
+            except BlockingIOError:
+                pass
+
+    def rewatch(self, path):
+        """Watch path, which may be a new file after a rotation, instead of the file watched until then."""
+        if self._file_watch is not None:
+            # fails when the watch is gone already, along with the file it was on
+            self._libc.inotify_rm_watch(self._fd, self._file_watch)
+        self._file_watch = self._add_watch(path, self.file_mask)
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_watch(self, path, mask):
+        watch = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if watch < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        return watch
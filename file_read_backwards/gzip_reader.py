@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""GzipReader module, random access to the content of gzip files through an index of checkpoints."""
+
+import bisect
+import ctypes
+import ctypes.util
+import functools
+import io
+import os
+import struct
+import zlib
+
+from .buffer_work_space import _write_replacing
+
+gzip_magic = b"\x1f\x8b"
+window_size = 32 * 1024  # how far back deflate can refer to, that is what a checkpoint needs to resume from
+
+# kinds of checkpoints
+MEMBER = 0  # the beginning of a gzip member, decompression starts afresh from there
+BLOCK = 1  # the beginning of a deflate block within a member, which needs the window before it
+
+# zlib.h
+Z_OK = 0
+Z_STREAM_END = 1
+Z_BUF_ERROR = -5
+Z_BLOCK = 5
+
+
+class GzipIndex:
+
+    """Class definition for `GzipIndex`, checkpoints from which the content of a gzip file can be decompressed.
+
+    Like zran (from the zlib examples), the file is decompressed once, a deflate block at a time, and a
+    checkpoint is taken every `span` bytes of content at the beginning of a block: where it is in the file
+    (down to the bit), along with the last 32KiB of content that the block may refer to. Every gzip member
+    also begins with a checkpoint, so that concatenated members are supported too.
+
+    The index is saved next to the file (in `path + ".frbgzidx"` by default), with the device, inode,
+    size and modification time of the file it was built for, and gets built again when the file changed.
+    When it cannot be saved (e.g. the directory is read only), it is only kept in memory.
+
+    Python's `zlib` module cannot stop at block boundaries, so the index is built with the zlib shared
+    library through `ctypes`. Where it cannot be loaded, only the beginnings of members are checkpoints.
+    Decompressing from a checkpoint only needs Python's `zlib` module.
+    """
+
+    magic = b"FRBGZI01"
+    header = struct.Struct("<8sQQQqQQ")  # magic, device, inode, size, modification time (ns), content size, count
+    checkpoint = struct.Struct("<QQBBI")  # content position, file position, kind, bits, compressed window length
+
+    def __init__(self, path, index_path=None, span=1024 * 1024):
+        """Constructor for GzipIndex, which loads the index, or builds it if it is out of date.
+
+        Args:
+            path: Path to the gzip file
+            index_path: Path to the index, `path + ".frbgzidx"` if None
+            span (int): How many bytes of content (roughly) there are between two checkpoints
+        """
+        self.path = path
+        self.index_path = index_path if index_path is not None else path + ".frbgzidx"
+        self.span = span
+        self.checkpoints = []  # (content position, file position, kind, bits, window) sorted by position
+        self.size = 0  # how many bytes of content the file holds
+        self.file_key = None  # device, inode, size, modification time of the indexed file
+        with io.open(self.path, mode="rb") as fp:
+            st = os.fstat(fp.fileno())
+            file_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            self._load()
+            if self.file_key != file_key:
+                self.checkpoints, self.size = _build_checkpoints(fp, self.span)
+                self.file_key = file_key
+                self._save()
+
+    def __len__(self):
+        """Return how many checkpoints there are."""
+        return len(self.checkpoints)
+
+    def _load(self):
+        try:
+            with io.open(self.index_path, mode="rb") as fp:
+                magic, device, inode, size, mtime, content_size, count = self.header.unpack(fp.read(self.header.size))
+                if magic != self.magic:
+                    return
+                checkpoints = []
+                for _ in range(count):
+                    out, position, kind, bits, length = self.checkpoint.unpack(fp.read(self.checkpoint.size))
+                    window = fp.read(length)
+                    if len(window) != length:
+                        return
+                    checkpoints.append((out, position, kind, bits, zlib.decompress(window) if length else b""))
+        except (OSError, struct.error, zlib.error):  # no index yet, or a broken one, it will be rebuilt
+            return
+        self.checkpoints = checkpoints
+        self.size = content_size
+        self.file_key = (device, inode, size, mtime)
+
+    def _save(self):
+        def write(fp):
+            fp.write(self.header.pack(self.magic, *(self.file_key + (self.size, len(self.checkpoints)))))
+            for out, position, kind, bits, window in self.checkpoints:
+                window = zlib.compress(window) if window else b""
+                fp.write(self.checkpoint.pack(out, position, kind, bits, len(window)))
+                fp.write(window)
+        try:
+            _write_replacing(self.index_path, write, self.path)
+        except OSError:  # kept in memory only
+            pass
+
+
+class GzipReader:
+
+    """Class definition for `GzipReader`, a read only binary file over the content of a gzip file.
+
+    Reading at any position decompresses the span between the two checkpoints of a `GzipIndex` around it.
+    The last spans decompressed are kept, so that reading a span backwards a chunk at a time only
+    decompresses it once.
+    """
+
+    def __init__(self, path, index_path=None, span=1024 * 1024, cached_spans=2):
+        """Constructor for GzipReader.
+
+        Args:
+            path: Path to the gzip file
+            index_path: Path to the index, see `GzipIndex`
+            span (int): How many bytes of content (roughly) there are between two checkpoints
+            cached_spans (int): How many decompressed spans to keep
+        """
+        self.name = path
+        self.index = GzipIndex(path, index_path, span)
+        self.cached_spans = cached_spans
+        self.__fp = io.open(path, mode="rb")
+        self.__position = 0
+        self.__spans = []  # (checkpoint index, content), the most recently used last
+        self.__outs = [c[0] for c in self.index.checkpoints]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Move to a position of the content, as `io.IOBase.seek` does, and return it."""
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += self.index.size
+        if offset < 0:
+            raise ValueError("negative seek position {0}".format(offset))
+        self.__position = offset
+        return offset
+
+    def tell(self):
+        """Return the current position in the content."""
+        return self.__position
+
+    def read(self, size=-1):
+        """Return up to size bytes of content from the current position, up to the end if size is negative."""
+        end = self.index.size if size is None or size < 0 else min(self.__position + size, self.index.size)
+        chunks = []
+        while self.__position < end:
+            i = bisect.bisect_right(self.__outs, self.__position) - 1
+            content = self.__get_span(i)
+            out = self.__outs[i]
+            chunk = content[self.__position - out:end - out]
+            if not chunk:  # the file is shorter than the index says, it got truncated
+                break
+            chunks.append(chunk)
+            self.__position += len(chunk)
+        return b"".join(chunks)
+
+    @property
+    def closed(self):
+        """True if the file handler has been closed."""
+        return self.__fp.closed
+
+    def close(self):
+        """Closes the file handler."""
+        self.__spans = []
+        self.__fp.close()
+
+    def __get_span(self, i):
+        """Return the content between checkpoint i and the next one."""
+        for n, (j, content) in enumerate(self.__spans):
+            if j == i:
+                self.__spans.append(self.__spans.pop(n))
+                return content
+        end = self.__outs[i + 1] if i + 1 < len(self.__outs) else self.index.size
+        content = _decompress(self.__fp, self.index.checkpoints[i], end)
+        self.__spans.append((i, content))
+        del self.__spans[:-self.cached_spans]
+        return content
+
+
+def _decompress(fp, checkpoint, end, chunk_size=64 * 1024):
+    """Return the content from a checkpoint up to position end of the content.
+
+    Args:
+        fp: file-like object of the gzip file
+        checkpoint (tuple): see `GzipIndex.checkpoints`
+        end (int): position of the content to stop at
+        chunk_size (int): how many bytes of the file to read at a time
+
+    Returns:
+        bytestring
+    """
+    out, position, kind, bits, window = checkpoint
+    if kind == MEMBER:
+        d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    else:
+        d = zlib.decompressobj(-zlib.MAX_WBITS, zdict=window) if window else zlib.decompressobj(-zlib.MAX_WBITS)
+    # a block beginning within a byte is read from that byte on, shifted so that it begins at a byte boundary
+    shift = 8 - bits if kind == BLOCK and bits else 0
+    fp.seek(position - 1 if shift else position)
+    size = end - out
+    chunks = []
+    carry = b""
+    while size > 0 and not d.eof:
+        data = fp.read(chunk_size)
+        if shift:
+            data, carry = _shift(carry + data, shift, not data)
+        if not data:
+            break
+        chunk = d.decompress(data, size)
+        # what did not fit gets decompressed before reading more
+        while d.unconsumed_tail and len(chunk) < size:
+            chunk += d.decompress(d.unconsumed_tail, size - len(chunk))
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _shift(data, shift, last):
+    """Return the bits of data shifted towards its beginning by shift bits, and the byte left to be shifted.
+
+    Deflate reads bits from the least significant one of each byte, so data is shifted as a little endian
+    number. The last byte is only shifted once the next one is known, unless it is the last one of the file.
+    """
+    if not data:
+        return data, data
+    shifted = (int.from_bytes(data, "little") >> shift).to_bytes(len(data), "little")
+    if last:
+        return shifted, b""
+    return shifted[:-1], data[-1:]
+
+
+class _ZStream(ctypes.Structure):
+    _fields_ = [
+        ("next_in", ctypes.c_void_p),
+        ("avail_in", ctypes.c_uint),
+        ("total_in", ctypes.c_ulong),
+        ("next_out", ctypes.c_void_p),
+        ("avail_out", ctypes.c_uint),
+        ("total_out", ctypes.c_ulong),
+        ("msg", ctypes.c_char_p),
+        ("state", ctypes.c_void_p),
+        ("zalloc", ctypes.c_void_p),
+        ("zfree", ctypes.c_void_p),
+        ("opaque", ctypes.c_void_p),
+        ("data_type", ctypes.c_int),
+        ("adler", ctypes.c_ulong),
+        ("reserved", ctypes.c_ulong),
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _load_zlib():
+    """Return the zlib shared library, raise OSError if it cannot be loaded."""
+    name = ctypes.util.find_library("z") or ctypes.util.find_library("zlib")
+    if name is None:
+        raise OSError("zlib shared library not found")
+    libz = ctypes.CDLL(name)
+    libz.zlibVersion.restype = ctypes.c_char_p
+    stream = ctypes.POINTER(_ZStream)
+    libz.inflateInit2_.argtypes = [stream, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+    libz.inflate.argtypes = [stream, ctypes.c_int]
+    libz.inflateReset.argtypes = [stream]
+    libz.inflateEnd.argtypes = [stream]
+    return libz
+
+
+def _build_checkpoints(fp, span, chunk_size=64 * 1024):
+    """Decompress fp from its beginning, and return its checkpoints along with the size of its content.
+
+    Args:
+        fp: file-like object of the gzip file
+        span (int): how many bytes of content (roughly) there are between two checkpoints
+        chunk_size (int): how many bytes of the file to read at a time
+
+    Returns:
+        (list, int)
+    """
+    try:
+        libz = _load_zlib()
+    except (OSError, AttributeError):
+        return _build_member_checkpoints(fp, chunk_size)
+
+    strm = _ZStream()
+    if libz.inflateInit2_(ctypes.byref(strm), zlib.MAX_WBITS | 16, libz.zlibVersion(), ctypes.sizeof(strm)) != Z_OK:
+        raise MemoryError("inflateInit2 failed")
+    window = ctypes.create_string_buffer(window_size)
+    input_buffer = ctypes.create_string_buffer(chunk_size)
+    checkpoints = [(0, 0, MEMBER, 0, b"")]
+    total_in = total_out = last = 0
+    try:
+        fp.seek(0)
+        while True:
+            data = fp.read(chunk_size)
+            if not data:
+                break
+            ctypes.memmove(input_buffer, data, len(data))
+            strm.next_in = ctypes.addressof(input_buffer)
+            strm.avail_in = len(data)
+            while strm.avail_in:
+                if strm.avail_out == 0:  # the window is used as a circular buffer
+                    strm.next_out = ctypes.addressof(window)
+                    strm.avail_out = window_size
+                total_in += strm.avail_in
+                total_out += strm.avail_out
+                ret = libz.inflate(ctypes.byref(strm), Z_BLOCK)
+                total_in -= strm.avail_in
+                total_out -= strm.avail_out
+                if ret == Z_STREAM_END:  # another member may follow
+                    libz.inflateReset(ctypes.byref(strm))
+                    checkpoints.append((total_out, total_in, MEMBER, 0, b""))
+                    last = total_out
+                    continue
+                if ret not in (Z_OK, Z_BUF_ERROR):
+                    if checkpoints[-1][2] == MEMBER and checkpoints[-1][0] == total_out:  # trailing garbage
+                        data = b""
+                        break
+                    raise zlib.error("invalid gzip data at byte {0} of {1}".format(total_in, fp.name))
+                # bit 7 of data_type is set at the end of a block header, bit 6 too when it is the last block
+                at_block = strm.data_type & 128 and not strm.data_type & 64
+                if at_block and total_out - last > span:
+                    used = window_size - strm.avail_out
+                    content = window.raw[used:] + window.raw[:used]
+                    checkpoints.append((total_out, total_in, BLOCK, strm.data_type & 7,
+                                        content[-min(total_out, window_size):]))
+                    last = total_out
+            if not data:
+                break
+    finally:
+        libz.inflateEnd(ctypes.byref(strm))
+    if len(checkpoints) > 1 and checkpoints[-1][2] == MEMBER and checkpoints[-1][0] == total_out:
+        checkpoints.pop()  # there is no member after the last one
+    return checkpoints, total_out
+
+
+def _build_member_checkpoints(fp, chunk_size=64 * 1024):
+    """Return checkpoints at the beginning of every member of fp along with the size of its content.
+
+    Args:
+        fp: file-like object of the gzip file
+        chunk_size (int): how many bytes of the file to read at a time
+
+    Returns:
+        (list, int)
+    """
+    checkpoints = [(0, 0, MEMBER, 0, b"")]
+    total_out = 0
+    position = 0  # where data begins in the file
+    d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    fp.seek(0)
+    data = fp.read(chunk_size)
+    while data:
+        try:
+            total_out += len(d.decompress(data))
+        except zlib.error:
+            if checkpoints[-1][0] == total_out:  # trailing garbage, which gzip ignores too
+                break
+            raise
+        if not d.eof:
+            position += len(data)
+            data = fp.read(chunk_size)
+            continue
+        # another member may follow
+        rest = d.unused_data
+        position += len(data) - len(rest)
+        checkpoints.append((total_out, position, MEMBER, 0, b""))
+        d = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        data = rest or fp.read(chunk_size)
+    if len(checkpoints) > 1 and checkpoints[-1][0] == total_out:
+        checkpoints.pop()  # there is no member after the last one
+    return checkpoints, total_out
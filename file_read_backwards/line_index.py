@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""LineIndex module."""
+
+import array
+import io
+import os
+import re
+import struct
+import sys
+
+from .buffer_work_space import _new_lines_bytes_longest_first
+from .buffer_work_space import _remove_trailing_new_line
+from .buffer_work_space import _split_lines
+from .buffer_work_space import _write_replacing
+from .file_read_backwards import _check_encoding
+from .file_read_backwards import _fingerprint
+
+new_lines_regex = re.compile(b"|".join(re.escape(n) for n in _new_lines_bytes_longest_first))
+
+
+class LineIndex:
+
+    """Class definition for `LineIndex`, an on-disk index of where each line of a file begins.
+
+    The index lives next to the file (in `path + ".frbidx"` by default) as a compact array of 64 bits
+    offsets, along with the device, inode, size and modification time of the file it was built for,
+    and a hash of the bytes before the end of what got indexed. When the file only grew since, and still
+    holds those bytes, only what got appended is scanned; otherwise (such as after a copytruncate rotation
+    followed by the file growing past its former size) it gets rebuilt.
+    When it cannot be saved (e.g. the directory is read only), it is only kept in memory.
+
+    Any line, or range of lines, then gets read with a single seek and read, counting from the last line
+    like `FileReadBackwards` does.
+    """
+
+    magic = b"FRBIDX02"
+    # magic, device, inode, size, modification time (ns), fingerprint of the bytes before size, number of lines
+    header = struct.Struct("<8sQQQq40sQ")
+
+    def __init__(self, path, index_path=None, encoding="utf-8", chunk_size=1024 * 1024):
+        """Constructor for LineIndex, which loads the index, then brings it up to date.
+
+        Args:
+            path: Path to the file to be indexed
+            index_path: Path to the index, `path + ".frbidx"` if None
+            encoding (str): Encoding, None to get lines as bytes without decoding them
+            chunk_size (int): How many bytes to read at a time while indexing
+        """
+        _check_encoding(encoding)
+
+        self.path = path
+        self.index_path = index_path if index_path is not None else path + ".frbidx"
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.line_starts = array.array("Q")
+        self.file_key = None  # device, inode, size, modification time of the indexed file
+        self.fingerprint = None  # `_fingerprint` of the indexed file at its size
+        self._load()
+        self.update()
+
+    def __len__(self):
+        """Return how many lines the file has."""
+        return len(self.line_starts)
+
+    def update(self):
+        """Bring the index up to date with the file, saving it when it changed.
+
+        Returns:
+            bool: True if the index changed
+        """
+        with io.open(self.path, mode="rb") as fp:
+            st = os.fstat(fp.fileno())
+            file_key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+            if file_key == self.file_key:
+                return False
+
+            same_file = self.file_key is not None and self.file_key[:2] == file_key[:2]
+            if same_file and self.file_key[2] < file_key[2] and self.line_starts \
+                    and _fingerprint(fp, self.file_key[2]) == self.fingerprint:
+                # the last line may have been incomplete, or ended with a "\r" that is now followed by a "\n"
+                scan_from = self.line_starts.pop()
+            else:
+                self.line_starts = array.array("Q")
+                scan_from = 0
+            file_size = st.st_size
+            if scan_from < file_size:
+                self.line_starts.append(scan_from)
+                line_starts = _scan_line_starts(fp, scan_from, file_size, self.chunk_size)
+                self.line_starts.extend(s for s in line_starts if s < file_size)
+            self.fingerprint = _fingerprint(fp, file_size)
+        self.file_key = file_key
+        self._save()
+        return True
+
+    def line_from_end(self, n):
+        """Return the nth line from the end of file, the last line being the 0th one.
+
+        Raises:
+            IndexError: if the file does not have that many lines
+        """
+        lines = self.lines_from_end(n, n + 1)
+        if not lines:
+            raise IndexError("line index out of range")
+        return lines[0]
+
+    def lines_from_end(self, start, stop):
+        """Return lines counting from the end of file, the last line first, like slicing a list of them.
+
+        Args:
+            start (int): How many lines from the end the first returned line is, the last line being 0
+            stop (int): How many lines from the end the line after the last returned one is
+
+        Returns:
+            list
+        """
+        count = len(self.line_starts)
+        start, stop = max(start, 0), min(stop, count)
+        if start >= stop:
+            return []
+        first = self.line_starts[count - stop]
+        end = self.line_starts[count - start] if start > 0 else self.file_key[2]
+        with io.open(self.path, mode="rb") as fp:
+            fp.seek(first)
+            content = fp.read(end - first)
+        lines = _split_lines(_remove_trailing_new_line(content))[::-1]
+        if self.encoding is not None:
+            lines = [r.decode(self.encoding) for r in lines]
+        return lines
+
+    def _load(self):
+        try:
+            with io.open(self.index_path, mode="rb") as fp:
+                magic, device, inode, size, mtime, fingerprint, count = self.header.unpack(fp.read(self.header.size))
+                if magic != self.magic:
+                    return
+                line_starts = array.array("Q")
+                line_starts.fromfile(fp, count)
+        except (OSError, EOFError, struct.error):  # no index yet, or a broken one, it will be rebuilt
+            return
+        if sys.byteorder == "big":
+            line_starts.byteswap()
+        self.line_starts = line_starts
+        self.file_key = (device, inode, size, mtime)
+        self.fingerprint = fingerprint.decode("ascii")
+
+    def _save(self):
+        line_starts = self.line_starts
+        if sys.byteorder == "big":
+            line_starts = array.array("Q", line_starts)
+            line_starts.byteswap()
+
+        def write(fp):
+            fingerprint = self.fingerprint.encode("ascii")
+            fp.write(self.header.pack(self.magic, *(self.file_key + (fingerprint, len(line_starts)))))
+            line_starts.tofile(fp)
+        try:
+            _write_replacing(self.index_path, write, self.path)
+        except OSError:  # kept in memory only
+            pass
+
+
+def _scan_line_starts(fp, position, end, chunk_size):
+    """Yield the positions right after every new line of fp, from position up to end.
+
+    Args:
+        fp: file-like object
+        position (int): where to start scanning from
+        end (int): where to stop scanning, bytes appended after it are ignored
+        chunk_size (int): how many bytes to read at a time
+    """
+    while True:
+        fp.seek(position)
+        # one byte more than scanned, so that a "\r\n" gets seen in full
+        content = fp.read(min(chunk_size + 1, end - position))
+        limit = min(len(content), chunk_size)
+        if not limit:
+            return
+        next_position = position + limit
+        for m in new_lines_regex.finditer(content, 0, limit + 1):
+            if m.start() >= limit:
+                break
+            next_position = position + m.end()
+            yield next_position
+        position = max(next_position, position + limit)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""MemoryFile module."""
+
+import io
+
+
+class MemoryFile:
+
+    """Read only binary file-like object over bytes, a bytearray or a memoryview.
+
+    Unlike `io.BytesIO`, the content is not copied up front: only what gets read is.
+    """
+
+    name = None
+
+    def __init__(self, content):
+        """Constructor for MemoryFile.
+
+        Args:
+            content: bytes-like object supporting the buffer protocol
+        """
+        self.content = memoryview(content).cast("B")
+        self.position = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.content)
+        if offset < 0:
+            raise ValueError("negative seek position {0}".format(offset))
+        self.position = offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def read(self, size=-1):
+        content = self.pread(self.position, size if size is not None and size >= 0 else len(self.content))
+        self.position += len(content)
+        return content
+
+    def pread(self, position, size):
+        """Return up to size bytes from position, without moving the position read() reads from."""
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        return self.content[position:position + size].tobytes()
+
+    def close(self):
+        """Release the content."""
+        if not self.closed:
+            self.content.release()
+            self.closed = True
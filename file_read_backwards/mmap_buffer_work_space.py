@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""MmapBufferWorkSpace module."""
+
+import mmap
+
+from .buffer_work_space import _find_new_line
+from .buffer_work_space import _get_file_size
+from .buffer_work_space import _new_lines_bytes_longest_first
+from .buffer_work_space import _rfind_new_line
+from .buffer_work_space import _split_lines
+
+
+class MmapBufferWorkSpace:
+
+    """A memory mapped counterpart of BufferWorkSpace for FileReadBackwards.
+
+    Instead of reading chunks into a buffer, the file is mapped once and scanned backwards in place.
+    Bytes only get copied out of the mapping when a line is returned.
+    """
+
+    def __init__(self, fp, chunk_size, start=0, end=None):
+        """Convention for the data.
+
+        read_position represents the lowest file position that has been scanned for new lines,
+            initialized to be just past the end of file (or `end`).
+        buffer_end represents the end of the contents (from read_position) that has not been returned,
+            it is None once every line has been returned.
+        chunk_size is how many bytes get scanned at a time.
+        start and end restrict the work space to a part of the file, which gets treated as the whole file.
+            They are expected to be at the beginning of lines.
+        """
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.stats = None  # a `ReadStats` counting scanned chunks, if any
+        self.start = start
+        file_size = _get_file_size(self.fp)
+        self.read_position = file_size if end is None else end
+        self.buffer_end = self.read_position if self.read_position > start else None
+        # a zero length file cannot be mapped, but then there is nothing to read either
+        self.mm = mmap.mmap(self.fp.fileno(), 0, access=mmap.ACCESS_READ) if file_size else None
+        self._new_line = -1
+        self._scan_end = self.buffer_end
+
+    def yieldable(self):
+        """Return True if there is a line that the work space can return, False otherwise."""
+        if self.buffer_end is None:
+            return False
+        if self._new_line >= 0:
+            return True
+
+        # only scan what has not been scanned yet, so that long lines are only scanned once
+        scan_end = min(self._scan_end, self._line_end())
+        self._new_line = _rfind_new_line(self.mm, self.read_position, scan_end)
+        self._scan_end = self.read_position
+        if self._new_line >= 0:
+            return True
+
+        # we have scanned the entire file and have some unprocessed lines
+        if self.read_position == self.start:
+            return True
+        return False
+
+    def return_line(self):
+        """Return a new line if it is available.
+
+        Precondition: self.yieldable() must be True
+        """
+        assert(self.yieldable())  # noqa: E275
+
+        line_end = self._line_end()
+        i = self._new_line
+        if i >= 0:
+            r = self.mm[i + 1:line_end]
+            self.buffer_end = i + 1
+        else:  # the case where we have scanned the entire file and at the "last" line
+            r = self.mm[self.start:line_end]
+            self.buffer_end = None
+        self._new_line = -1
+        self._scan_end = self.buffer_end
+        return r
+
+    def return_block(self):
+        """Return the content of every complete line scanned so far, without the trailing new line.
+
+        Precondition: self.yieldable() must be True
+
+        Returns:
+            bytestring
+        """
+        assert(self.yieldable())  # noqa: E275
+
+        line_end = self._line_end()
+        if self.read_position == self.start:  # we have scanned the entire file, so even the first line is complete
+            block = self.mm[self.start:line_end]
+            self.buffer_end = None
+        else:
+            delimiter = _find_new_line(self.mm, self.read_position, line_end) + 1
+            block = self.mm[delimiter:line_end]
+            self.buffer_end = delimiter
+        self._new_line = -1
+        self._scan_end = self.buffer_end
+        return block
+
+    def return_lines(self):
+        """Return every complete line scanned so far at once, starting from the last one.
+
+        Precondition: self.yieldable() must be True
+
+        Returns:
+            list(bytestring)
+        """
+        return _split_lines(self.return_block())[::-1]
+
+    def read_until_yieldable(self):
+        """Scan additional chunks until it is yieldable."""
+        while not self.yieldable():
+            previously_read_position = self.read_position
+            self.read_position = max(self.read_position - self.chunk_size, self.start)
+            if self.stats is not None:
+                self.stats.add_chunk(self.read_position, previously_read_position - self.read_position)
+
+    def pending_end(self):
+        """Return where the contents that have not been returned end in the file, `start` once they all were."""
+        return self.buffer_end if self.buffer_end is not None else self.start
+
+    def has_returned_every_line(self):
+        """Return True if every single line in the file has been returned, False otherwise."""
+        if self.read_position == self.start and self.buffer_end is None:
+            return True
+        return False
+
+    def close(self):
+        """Release the memory mapping."""
+        if self.mm is not None:
+            self.mm.close()
+
+    def _line_end(self):
+        """Return the end of the pending contents, excluding a single trailing new line if it exists."""
+        end = self.buffer_end
+        for n in _new_lines_bytes_longest_first:
+            start = end - len(n)
+            if start >= self.start and self.mm[start:end] == n:
+                return start
+        return end
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Parallel module, reading a file backwards with several processes."""
+
+import collections
+import io
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _find_line_start
+from .file_read_backwards import _check_encoding
+
+
+def parallel_read_backwards(path, func=None, processes=None, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE,
+                            range_size=64 * 1024 * 1024):
+    """Yield the lines of a file from the last one until the first one, reading and splitting them in parallel.
+
+    The file is cut into byte ranges of about `range_size` bytes, moved forward to the beginning of a line.
+    Each range is read backwards by a process of a pool, where `func` also gets applied to its lines.
+    Results are then yielded in the same order as `FileReadBackwards` would yield the lines.
+
+    Only a few more ranges than there are processes get scheduled ahead of the one being yielded from,
+    so that memory use stays bounded when the results are consumed slowly.
+
+    Args:
+        path: Path to the file to be read
+        func: Callable applied to each line within the worker processes, its result is yielded instead of
+            the line unless it is None, in which case nothing gets yielded for that line.
+            It has to be picklable, e.g. a function defined at the top level of a module.
+        processes (int): How many worker processes to use, `os.cpu_count()` if None
+        encoding (str): Encoding, None to get lines as bytes without decoding them
+        chunk_size (int): How many bytes each worker reads at a time
+        range_size (int): How many bytes (roughly) each worker reads backwards at once
+    """
+    _check_encoding(encoding)
+    file_size = os.path.getsize(path)
+    boundaries = list(range(0, file_size, max(range_size, 1))) + [file_size]
+    ranges = list(zip(boundaries[:-1], boundaries[1:]))[::-1]
+
+    processes = processes or os.cpu_count() or 1
+    ahead = 2 * processes
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = collections.deque()
+        for r in ranges:
+            futures.append(executor.submit(_read_range_backwards, path, r[0], r[1], func, encoding, chunk_size))
+            if len(futures) > ahead:
+                for result in futures.popleft().result():
+                    yield result
+        while futures:
+            for result in futures.popleft().result():
+                yield result
+
+
+def _read_range_backwards(path, start, end, func, encoding, chunk_size):
+    """Return the results for the lines that begin within [start, end) of a file, from the last one.
+
+    Args:
+        path: Path to the file to be read
+        start (int): Where the range begins, moved forward to the beginning of a line
+        end (int): Where the range ends, moved forward to the beginning of a line
+        func: Callable applied to each line, see `parallel_read_backwards`
+        encoding (str): Encoding, None to keep lines as bytes
+        chunk_size (int): How many bytes to read at a time
+
+    Returns:
+        list
+    """
+    results = []
+    with io.open(path, mode="rb") as fp:
+        start = _find_line_start(fp, start, chunk_size)
+        end = _find_line_start(fp, end, chunk_size)
+        if start >= end:  # a single line runs over the whole range, it belongs to the range it begins in
+            return results
+        buf = BufferWorkSpace(fp, chunk_size, start=start, end=end)
+        while not buf.has_returned_every_line():
+            buf.read_until_yieldable()
+            for r in buf.return_lines():
+                if encoding is not None:
+                    r = r.decode(encoding)
+                if func is not None:
+                    r = func(r)
+                    if r is None:
+                        continue
+                results.append(r)
+    return results
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""RotatedLogReadBackwards module."""
+
+import io
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .file_read_backwards import FileReadBackwards
+from .file_read_backwards import _check_encoding
+
+
+class RotatedLogReadBackwards:
+
+    """Class definition for `RotatedLogReadBackwards`, reading a log and its rotated files as a single file.
+
+    `app.log` is read backwards, then `app.log.1`, `app.log.2.gz` and so on (with or without ".gz"), until
+    two numbers in a row are missing (one may be missing for a moment, while the files are being renamed):
+    lines come from the last line of `app.log` up to the first line of the oldest file.
+
+    Each file only gets opened once the one before has been read to its beginning, or rather while it is
+    being read: with `prefetch=True`, a worker thread opens the next file and reads its last chunk ahead.
+
+    The next file is looked for when it is needed, as the one following the last file read in the rotated
+    set at that time, recognised by device and inode, or by modification time for a file that has been
+    compressed since (gzip keeps it). So a rotation happening while the files are being read leads neither
+    to a file being skipped, nor to one being read twice.
+
+    It can be used as a Context Manager. If done so, when exited, it will close its file handlers.
+    """
+
+    def __init__(self, path, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE, prefetch=True):
+        """Constructor for RotatedLogReadBackwards.
+
+        Args:
+            path: Path to the current log, the rotated files being named after it
+            encoding (str): Encoding, None to get lines as bytes without decoding them
+            chunk_size (int): How many bytes to read at a time
+            prefetch (bool): Whether to open the next file and read its last chunk in a worker thread
+        """
+        _check_encoding(encoding, wide=True)
+
+        self.path = path
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.paths = []  # paths of the files opened so far, the newest first
+        self.__last_opened = None  # (device, inode, modification time) of the last file opened
+        self.__current = None  # (FileReadBackwards, batches, last chunk read ahead) of the file being read
+        self.__lines = []
+        self.__lines_index = 0
+        self.__executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self.__next = None  # future of the next file, when prefetching
+        self.__exhausted = False
+        self.__closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Returns unicode string (bytes without an encoding) from the last line of the newest file on."""
+        if not self.__fill_lines():
+            raise StopIteration
+        r = self.__lines[self.__lines_index]
+        self.__lines_index += 1
+        return r
+
+    next = __next__
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Closes its file handlers and propagates all exceptions on exit."""
+        self.close()
+        return False
+
+    def readline(self):
+        """Return a line content (with a trailing newline) if there are content. Return '' otherwise."""
+        linesep = os.linesep if self.encoding is not None else os.linesep.encode("ascii")
+        try:
+            return next(self) + linesep
+        except StopIteration:
+            return linesep[:0]
+
+    @property
+    def closed(self):
+        """True once closed."""
+        return self.__closed
+
+    def close(self):
+        """Closes its file handlers, the next file being opened included."""
+        self.__closed = True
+        try:
+            if self.__current is not None:
+                self.__current[0].close()
+                self.__current = None
+            if self.__next is not None:
+                next_file, self.__next = self.__next, None
+                # failing to open a file that will not be read is no error, nor is it one to hide another with
+                if next_file.exception() is None and next_file.result() is not None:
+                    next_file.result()[0].close()
+        finally:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+
+    def __fill_lines(self):
+        """Make sure there are lines to be returned, return False when exhausted."""
+        if self.__closed:
+            return False
+        while self.__lines_index >= len(self.__lines):
+            if self.__exhausted:
+                return False
+            if self.__current is None:
+                self.__current = self.__open_next()
+                if self.__current is None:
+                    self.__exhausted = True
+                    return False
+                if self.__executor is not None:
+                    self.__next = self.__executor.submit(self.__open_next)
+                continue
+            frb, batches, first_batch = self.__current
+            if first_batch is not None:
+                lines = first_batch
+                self.__current = (frb, batches, None)
+            else:
+                lines = next(batches, None)
+            if lines is None:
+                frb.close()
+                self.__current = None
+                if self.__next is not None:
+                    self.__current = self.__next.result()
+                    self.__next = None
+                    if self.__current is None:
+                        self.__exhausted = True
+                        return False
+                    self.__next = self.__executor.submit(self.__open_next)
+                continue
+            self.__lines = lines
+            self.__lines_index = 0
+        return True
+
+    def __open_next(self):
+        """Open the file following the last one opened, return (FileReadBackwards, batches, first batch)."""
+        while True:
+            rotated = _list_rotated_files(self.path)
+            for path, st in rotated[self.__find_last_opened(rotated) + 1:]:
+                try:
+                    frb = FileReadBackwards(path, self.encoding, self.chunk_size)
+                except OSError:  # it got rotated away since, the next one is what follows it
+                    continue
+                try:
+                    opened = os.stat(path)
+                except OSError:
+                    opened = None
+                if opened is None or (opened.st_dev, opened.st_ino) != (st.st_dev, st.st_ino):
+                    # path got renamed after it was listed, which file was opened is unknown, so list them again
+                    frb.close()
+                    break
+                self.__last_opened = (st.st_dev, st.st_ino, st.st_mtime_ns)
+                self.paths.append(path)
+                batches = frb.iter_batches()
+                # when prefetching, the last chunk gets read by the worker thread as well
+                return frb, batches, next(batches, []) if self.__executor is not None else None
+            else:
+                return None
+
+    def __find_last_opened(self, rotated):
+        """Return the index of the last file opened in rotated, -1 if none was, len(rotated) if it is gone."""
+        if self.__last_opened is None:
+            return -1
+        device, inode, mtime = self.__last_opened
+        for i, (path, st) in enumerate(rotated):
+            if (st.st_dev, st.st_ino) == (device, inode):
+                return i
+        # it got compressed since, files written at about the same time may share its modification time,
+        # but those older than it come after it
+        for i, (path, st) in enumerate(rotated):
+            if path.endswith(".gz") and st.st_mtime_ns == mtime:
+                return i
+        # it got deleted as the oldest file, there is nothing older left
+        return len(rotated)
+
+
+def _list_rotated_files(path):
+    """Return the paths and stats of path and of its rotated files, the newest first."""
+    rotated = []
+    n = missing = 0
+    while missing < 2:
+        found = False
+        for candidate in ([path] if n == 0 else ["{0}.{1}".format(path, n), "{0}.{1}.gz".format(path, n)]):
+            try:
+                rotated.append((candidate, os.stat(candidate)))
+                found = True
+            except OSError:
+                pass
+        # logrotate renames the files from the oldest one, so one number may be missing in the meantime
+        missing = 0 if found or n == 0 else missing + 1
+        n += 1
+    return rotated
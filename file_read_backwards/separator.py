@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""SeparatorBufferWorkSpace module, for records split on a separator other than new lines."""
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _pread
+
+
+class SeparatorBufferWorkSpace(BufferWorkSpace):
+
+    """Work space splitting records on a separator of one or more bytes, such as b"\\x00", rather than on new lines.
+
+    Like a new line, a separator at the very end of the file ends the last record rather than beginning an empty one.
+
+    As there is a single separator, a chunk does not need to be moved back when it begins in the middle of one,
+    which saves the one byte reads `_get_what_to_read_next` makes: what comes before the first separator of the
+    buffer is kept, and gets joined with the chunk read before it.
+    A separator overlapping with itself, such as b"\\x00\\x00", gets matched from the end of the file,
+    the way `bytes.rsplit` does, whatever the chunk size: b"x\\x00\\x00\\x00y" holds b"y" then b"x\\x00".
+    """
+
+    def __init__(self, fp, chunk_size, separator, start=0, end=None):
+        """Constructor for SeparatorBufferWorkSpace.
+
+        Args:
+            fp: file-like object
+            chunk_size (int): how many bytes to read at a time
+            separator (bytes): what records are split on
+            start (int): position not to read before
+            end (int): position not to read after, the end of file if None
+        """
+        if not separator:
+            raise ValueError("separator cannot be empty")
+        self.separator = separator
+        self.overlapping = _overlaps_itself(separator)
+        super().__init__(fp, chunk_size, start, end)
+
+    def add_to_buffer(self, content, read_position):
+        """Add additional bytes content as read from the read_position.
+
+        Args:
+            content (bytes): data to be added to buffer working BufferWorkSpac.
+            read_position (int): where in the file pointer the data was read from.
+        """
+        self.read_position = read_position
+        if self._segments is None:
+            self._segments = [content]
+            return
+        separator = self.separator
+        if len(self._segments) == 1 and separator in self._remove_trailing_separator(self._segments[0]):
+            self._segments[0] = content + self._segments[0]
+            if self.stats is not None:
+                self.stats.concatenations += 1
+            return
+        # a separator may begin in content and end in the segments read right after it
+        head = b""
+        for segment in reversed(self._segments):
+            if len(head) >= len(separator) - 1:
+                break
+            head += segment[:len(separator) - 1 - len(head)]
+        self._segments.append(content)
+        if separator in content or (head and separator in content[-len(head):] + head):
+            self._join_segments()
+
+    def yieldable(self):
+        """Return True if there is a record that the buffer can return, False otherwise."""
+        if self._segments is None:
+            return False
+        # several segments means that no separator has been read in yet, apart from the trailing one
+        if len(self._segments) == 1 and self.separator in self._remove_trailing_separator(self._segments[0]):
+            return True
+        return self.read_position == self.start
+
+    def return_line(self):
+        """Return a record if it is available.
+
+        Precondition: self.yieldable() must be True
+        """
+        assert(self.yieldable())  # noqa: E275
+
+        t = self._remove_trailing_separator(self.read_buffer)
+        i = t.rfind(self.separator)
+        if i >= 0:
+            delimiter = i + len(self.separator)
+            r = t[delimiter:]
+            self.read_buffer = t[:delimiter]
+        else:  # the case where we have read in entire file and at the "last" record
+            r = t
+            self.read_buffer = None
+        return r
+
+    def return_block(self):
+        """Return the content of every complete record in the buffer, without the trailing separator.
+
+        Precondition: self.yieldable() must be True
+
+        Returns:
+            bytestring
+        """
+        assert(self.yieldable())  # noqa: E275
+
+        t = self._remove_trailing_separator(self.read_buffer)
+        if self.read_position == self.start:  # we have read in entire file, so even the first record is complete
+            block = t
+            self.read_buffer = None
+        else:
+            delimiter = _find_first_separator(t, self.separator, self.overlapping) + len(self.separator)
+            block = t[delimiter:]
+            self.read_buffer = t[:delimiter]
+        return block
+
+    def return_lines(self):
+        """Return every complete record in the buffer at once, starting from the last one.
+
+        Precondition: self.yieldable() must be True
+
+        Returns:
+            list(bytestring)
+        """
+        return _split_records(self.return_block(), self.separator, self.overlapping)[::-1]
+
+    def get_next_chunk(self, previously_read_position):
+        """Return the chunk right before previously_read_position, and the position it was read from.
+
+        Returns:
+            (bytestring, int)
+        """
+        position = max(previously_read_position - self.chunk_size, self.start)
+        return _pread(self.fp, position, previously_read_position - position), position
+
+    def _remove_trailing_separator(self, data):
+        if data.endswith(self.separator):
+            return data[:-len(self.separator)]
+        return data
+
+
+def _overlaps_itself(separator):
+    """Return True if two matches of separator can overlap, such as b"aa" twice in b"aaa"."""
+    return any(separator[i:] == separator[:len(separator) - i] for i in range(1, len(separator)))
+
+
+def _find_first_separator(data, separator, overlapping):
+    """Return where the first separator of data begins, matching them from the end of data, -1 if there is none.
+
+    Matches made from the end are the same whatever comes before data, so they can be made a chunk at a time.
+    """
+    if not overlapping:
+        return data.find(separator)
+    records = data.rsplit(separator)
+    return len(records[0]) if len(records) > 1 else -1
+
+
+def _split_records(block, separator, overlapping):
+    """Split block into records, in the order they appear in it, matching separators from the end of block."""
+    return block.rsplit(separator) if overlapping else block.split(separator)
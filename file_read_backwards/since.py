@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Since module, jumping to the lines of a time-ordered file that are newer than a given time."""
+
+import io
+import os
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _find_line_start
+from .file_read_backwards import _check_encoding
+
+
+def lines_since(path, timestamp, key, encoding="utf-8", chunk_size=io.DEFAULT_BUFFER_SIZE):
+    """Yield the lines of a time-ordered file that are newer than timestamp, from the last one.
+
+    Rather than parsing every line from the end of file, the first line newer than timestamp is looked for
+    by bisecting the byte offsets of the file: each probe gets snapped to the beginning of its line the same
+    way lines are found when reading backwards, then the line is parsed with `key`. Only O(log n) lines get
+    read and parsed before the lines from the end of file down to that one are yielded.
+
+    Lines for which `key` returns None (such as the continuation lines of a multi-line record) are taken
+    to be as old as the last line before them that has a timestamp, or as old as can be if there is none.
+
+    Args:
+        path: Path to the file to be read, whose lines are sorted by time
+        timestamp: Lines whose time is greater than it are yielded
+        key: Callable returning the time of a line (str, or bytes without an encoding), comparable with
+            timestamp, or None if the line does not have one
+        encoding (str): Encoding, None to get lines as bytes without decoding them
+        chunk_size (int): How many bytes to read at a time
+    """
+    _check_encoding(encoding)
+    decode = (lambda r: r) if encoding is None else (lambda r: r.decode(encoding))
+
+    with io.open(path, mode="rb") as fp:
+        first = _find_first_line_since(fp, timestamp, key, decode, chunk_size)
+        buf = BufferWorkSpace(fp, chunk_size, start=first)
+        while not buf.has_returned_every_line():
+            buf.read_until_yieldable()
+            for r in buf.return_lines():
+                yield decode(r)
+
+
+def _find_first_line_since(fp, timestamp, key, decode, chunk_size):
+    """Return where the first line newer than timestamp begins, the file size if there is none.
+
+    Lines beginning before `low` are known not to be newer than timestamp, lines beginning at or after
+    `high` are known to be newer.
+    """
+    low, high = 0, os.fstat(fp.fileno()).st_size
+    while low < high:
+        position = _snap_to_line_start(fp, (low + high) // 2, low, chunk_size)
+        end = _find_line_start(fp, position + 1, chunk_size)
+        line_start, line_time = _find_last_time(fp, low, end, key, decode, chunk_size)
+        if line_time is not None and line_time > timestamp:
+            high = line_start
+        else:
+            low = end
+    return low
+
+
+def _find_last_time(fp, start, end, key, decode, chunk_size):
+    """Return where the last line of fp[start:end] with a time begins and its time, (start, None) if none has.
+
+    Lines are read backwards from end, so that lines without a time get the time of the line before them.
+    """
+    buf = BufferWorkSpace(fp, chunk_size, start=start, end=end)
+    while not buf.has_returned_every_line():
+        buf.read_until_yieldable()
+        line_time = key(decode(buf.return_line()))
+        if line_time is not None:
+            return (start if buf.read_buffer is None else buf.read_position + len(buf.read_buffer)), line_time
+    return start, None
+
+
+def _snap_to_line_start(fp, position, start, chunk_size):
+    """Return where the line holding the byte at position begins, reading backwards from it.
+
+    Args:
+        fp: file-like object
+        position (int): position of a byte of the file
+        start (int): position of the beginning of a line, not to read before
+        chunk_size (int): how many bytes to read at a time
+
+    Returns:
+        int
+    """
+    # the work space ends right after position, so that a "\r\n" it is in the middle of gets seen in full
+    buf = BufferWorkSpace(fp, chunk_size, start=start, end=position + 1)
+    buf.read_until_yieldable()
+    buf.return_line()
+    if buf.read_buffer is None:  # the line begins at start
+        return start
+    return buf.read_position + len(buf.read_buffer)
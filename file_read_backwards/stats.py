@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""ReadStats module."""
+
+from .buffer_work_space import _pread
+from .buffer_work_space import _supports_pread
+
+
+class ReadStats:
+
+    """Counters of the work done while reading a file backwards, to tell I/O from CPU bound reads apart.
+
+    `reads` and `seeks` count the calls made to the file object, the one byte probes looking for a "\\r\\n"
+    split across two chunks included: each is a system call for an unbuffered file, at most one otherwise.
+    A positioned read (with os.pread) counts as a read, without a seek.
+    With the "mmap" engine, the file is scanned in place, so only chunks (of scanned bytes) get counted.
+    """
+
+    fields = ("bytes_read", "reads", "seeks", "chunks", "concatenations", "lines", "decode_time")
+
+    def __init__(self, on_chunk=None):
+        """Constructor for ReadStats, with every counter at 0.
+
+        Args:
+            on_chunk: function(position, size) called after each chunk got read (or scanned), with the position
+                it was read from and how many bytes it holds
+        """
+        self.on_chunk = on_chunk
+        self.reset()
+
+    def reset(self):
+        """Set every counter back to 0."""
+        self.bytes_read = 0  # bytes returned by read calls
+        self.reads = 0  # read calls
+        self.seeks = 0  # seek calls
+        self.chunks = 0  # chunks added to the buffer
+        self.concatenations = 0  # copies of the buffer made to join chunks together
+        self.lines = 0  # lines yielded
+        self.decode_time = 0.0  # seconds spent decoding lines
+
+    def as_dict(self):
+        """Return the counters as a dict, e.g. to export them."""
+        return {name: getattr(self, name) for name in self.fields}
+
+    def add_chunk(self, position, size):
+        """Count a chunk of size bytes read from position, and call the callback if there is one."""
+        self.chunks += 1
+        if self.on_chunk is not None:
+            self.on_chunk(position, size)
+
+    def __repr__(self):
+        return "ReadStats({0})".format(", ".join("{0}={1!r}".format(k, v) for k, v in self.as_dict().items()))
+
+
+class CountingFile:
+
+    """Wraps a binary file object, counting its read and seek calls into a `ReadStats`.
+
+    Any other attribute is the one of the wrapped file object.
+    """
+
+    def __init__(self, fp, stats):
+        self.fp = fp
+        self.__wrapped__ = fp
+        self.stats = stats
+
+    def read(self, size=-1):
+        content = self.fp.read(size)
+        self.stats.reads += 1
+        self.stats.bytes_read += len(content)
+        return content
+
+    def pread(self, position, size):
+        if not _supports_pread(self.fp):
+            self.seek(position)
+            return self.read(size)
+        content = _pread(self.fp, position, size)
+        self.stats.reads += 1
+        self.stats.bytes_read += len(content)
+        return content
+
+    def seek(self, offset, whence=0):
+        self.stats.seeks += 1
+        return self.fp.seek(offset, whence)
+
+    def __getattr__(self, name):
+        return getattr(self.fp, name)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tail module."""
+
+import io
+import os
+
+from .buffer_work_space import _count_new_lines
+from .buffer_work_space import _find_new_line
+from .buffer_work_space import _pread
+from .buffer_work_space import _remove_trailing_new_line
+from .buffer_work_space import _split_lines
+from .file_read_backwards import _check_encoding
+
+
+def tail(path, n=10, encoding="utf-8", average_line_length=128):
+    """Return the last n lines of a file, in file order (like `tail -n`).
+
+    Rather than reading backwards a chunk at a time, it reads what n lines of `average_line_length` bytes
+    would take at once, then grows that window geometrically (guided by the lengths of the lines read so
+    far) until it holds n lines. Lines are counted with `bytes.count`, and only split once there are enough.
+
+    Args:
+        path: Path to the file to be read
+        n (int): How many lines to return
+        encoding (str): Encoding, None to get lines as bytes without decoding them
+        average_line_length (int): How long lines are expected to be, in bytes
+
+    Returns:
+        list
+    """
+    _check_encoding(encoding)
+    if n <= 0:
+        return []
+
+    with io.open(path, mode="rb", buffering=0) as fp:
+        read_position = os.fstat(fp.fileno()).st_size
+        if not read_position:
+            return []
+        window = n * max(average_line_length, 1)
+        data = b""
+        while True:
+            position = max(read_position - window, 0)
+            # growing geometrically, the total amount of bytes copied stays within twice what is read
+            data = _pread(fp, position, read_position - position) + data
+            read_position = position
+            t = _remove_trailing_new_line(data)
+            count = _count_new_lines(t)
+            if count >= n or read_position == 0:
+                break
+            # read at least as much again, or as much as the lines read so far suggest n lines would take
+            window = max(len(data), len(t) * (n + 1) // (count + 1) - len(data))
+
+    if read_position > 0:  # the first line is only complete when read from the beginning of file
+        t = t[_find_new_line(t, 0, len(t)) + 1:]
+    lines = _split_lines(t)[-n:]
+    if encoding is not None:
+        lines = [r.decode(encoding) for r in lines]
+    return lines
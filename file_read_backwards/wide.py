@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""WideBufferWorkSpace module, for files in UTF-16 or UTF-32."""
+
+import codecs
+
+from .buffer_work_space import BufferWorkSpace
+from .buffer_work_space import _pread
+
+code_unit_sizes = {"utf-16": 2, "utf-16-le": 2, "utf-16-be": 2, "utf-32": 4, "utf-32-le": 4, "utf-32-be": 4}
+byte_order_marks = {
+    "utf-16-le": codecs.BOM_UTF16_LE,
+    "utf-16-be": codecs.BOM_UTF16_BE,
+    "utf-32-le": codecs.BOM_UTF32_LE,
+    "utf-32-be": codecs.BOM_UTF32_BE,
+}
+# longest first, as the UTF-16 little endian byte order mark begins the UTF-32 one
+_byte_order_marks_longest_first = sorted(byte_order_marks.items(), key=lambda x: len(x[1]), reverse=True)
+
+
+class WideBufferWorkSpace(BufferWorkSpace):
+
+    """Work space for a file in UTF-16 or UTF-32, whose code units are wider than a byte.
+
+    Chunks are read at code unit boundaries, and transcoded to UTF-8 right away, so that new lines get found
+    and lines get split the same way as in any other file. Positions remain the ones within the file.
+    A chunk never begins with the "\\n" of a "\\r\\n", nor with the second half of a UTF-16 surrogate pair.
+
+    A byte order mark at the beginning of the file is skipped. For "utf-16" and "utf-32", it tells the byte
+    order of the file, little endian being assumed without one.
+    """
+
+    def __init__(self, fp, chunk_size, encoding, start=0, end=None):
+        """Constructor for WideBufferWorkSpace, which reads the byte order mark.
+
+        Args:
+            fp: file-like object
+            chunk_size (int): how many bytes to read at a time, rounded down to a whole number of code units
+            encoding (str): one of `code_unit_sizes`
+            start (int): position not to read before, a byte order mark found there gets skipped
+            end (int): position not to read after, the end of file if None
+        """
+        self.unit_size = code_unit_sizes[encoding]
+        self.codec, byte_order_mark_size = _find_byte_order(fp, encoding, start)
+        self.byte_order = "big" if self.codec.endswith("-be") else "little"
+        self.new_line_unit = "\n".encode(self.codec)
+        super().__init__(fp, chunk_size, start + byte_order_mark_size, end)
+
+    def get_next_chunk(self, previously_read_position):
+        """Return the chunk right before previously_read_position transcoded to UTF-8, and where it was read from.
+
+        Returns:
+            (bytestring, int)
+        """
+        unit_size = self.unit_size
+        chunk_size = max(self.chunk_size - self.chunk_size % unit_size, unit_size)
+        position = max(previously_read_position - chunk_size, self.start)
+        position -= (position - self.start) % unit_size
+        while position > self.start:
+            if not self._is_partially_read(_pread(self.fp, position, unit_size)):
+                break
+            position -= unit_size
+        content = _pread(self.fp, position, previously_read_position - position)
+        return content.decode(self.codec).encode("utf-8"), position
+
+    def _is_partially_read(self, unit):
+        """Return True if a chunk beginning with code unit would split a new line or a surrogate pair."""
+        if unit == self.new_line_unit:
+            return True
+        return self.unit_size == 2 and len(unit) == 2 and 0xDC00 <= int.from_bytes(unit, self.byte_order) <= 0xDFFF
+
+
+def _find_byte_order(fp, encoding, start=0):
+    """Return the codec to decode chunks of the file with, and the size of its byte order mark (0 if it has none).
+
+    Args:
+        fp: file-like object
+        encoding (str): one of `code_unit_sizes`
+        start (int): where the byte order mark would be
+
+    Returns:
+        (str, int)
+    """
+    head = _pread(fp, start, 4)
+    if encoding in byte_order_marks:
+        bom = byte_order_marks[encoding]
+        return encoding, len(bom) if head.startswith(bom) else 0
+    for codec, bom in _byte_order_marks_longest_first:
+        if codec.startswith(encoding + "-") and head.startswith(bom):
+            return codec, len(bom)
+    return encoding + "-le", 0
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `async_file_read_backwards` module."""
+
+import asyncio
+import os
+import tempfile
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from file_read_backwards.async_file_read_backwards import AsyncFileReadBackwards
+
+
+@pytest.fixture(scope="module")
+def temp_path():
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write("".join("line {}\n".format(i) for i in range(42)).encode("utf-8"))
+    yield t.name
+    os.unlink(t.name)
+
+
+expected_lines = ["line {}".format(i) for i in reversed(range(42))]
+
+
+class TestAsyncFileReadBackwards:
+    def test_async_for(self, temp_path):
+        async def read():
+            async with AsyncFileReadBackwards(temp_path, chunk_size=16) as f:
+                return [line async for line in f]
+        assert asyncio.run(read()) == expected_lines
+
+    def test_async_for_without_context_manager(self, temp_path):
+        async def read():
+            f = AsyncFileReadBackwards(temp_path)
+            lines = [line async for line in f]
+            return lines, f.closed
+        lines, closed = asyncio.run(read())
+        assert lines == expected_lines
+        assert closed
+
+    def test_reads_a_chunk_per_executor_call(self, temp_path):
+        executor = ThreadPoolExecutor(max_workers=1)
+        calls = []
+
+        class CountingExecutor:
+            def submit(self, func, *args):
+                calls.append(func)
+                return executor.submit(func, *args)
+
+        async def read():
+            async with AsyncFileReadBackwards(temp_path, executor=CountingExecutor()) as f:
+                return [line async for line in f]
+        assert asyncio.run(read()) == expected_lines
+        # opening, a single chunk holding every line, finding out it is exhausted and closing
+        assert len(calls) == 4
+        executor.shutdown()
+
+    def test_iter_batches(self, temp_path):
+        async def read():
+            async with AsyncFileReadBackwards(temp_path) as f:
+                return [batch async for batch in f.iter_batches(max_lines=10)]
+        batches = asyncio.run(read())
+        assert [len(batch) for batch in batches] == [10, 10, 10, 10, 2]
+        assert sum(batches, []) == expected_lines
+
+    def test_readline(self, temp_path):
+        async def read():
+            async with AsyncFileReadBackwards(temp_path, encoding=None) as f:
+                return [await f.readline() for _ in range(43)]
+        lines = asyncio.run(read())
+        assert lines[0] == b"line 41" + os.linesep.encode("ascii")
+        assert lines[-1] == b""
+
+    def test_close(self, temp_path):
+        async def read():
+            f = AsyncFileReadBackwards(temp_path)
+            first = await f.__anext__()
+            await f.close()
+            return first, f.closed, [line async for line in f]
+        assert asyncio.run(read()) == ("line 41", True, [])
+
+    def test_unsupported_encoding(self, temp_path):
+        with pytest.raises(NotImplementedError):
+            _ = AsyncFileReadBackwards(temp_path, encoding="not-supported-encoding")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `bgzf` module."""
+
+import gzip
+import io
+import os
+import struct
+import tempfile
+import zlib
+import pytest
+
+from file_read_backwards.bgzf import BgzfBufferWorkSpace
+from file_read_backwards.bgzf import is_bgzf
+from file_read_backwards.bgzf import _find_previous_block
+from file_read_backwards.buffer_work_space import new_lines
+from file_read_backwards.file_read_backwards import FileReadBackwards
+
+
+def helper_block(content):
+    """Return a BGZF member holding content, as bgzip writes them."""
+    c = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    data = c.compress(content) + c.flush()
+    header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff" + struct.pack("<H2sHH", 6, b"BC", 2, len(data) + 25)
+    return header + data + struct.pack("<II", zlib.crc32(content), len(content))
+
+
+def helper_write(pieces):
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        for piece in pieces:
+            t.write(helper_block(piece))
+        t.write(helper_block(b""))  # the end of file marker
+    return t.name
+
+
+class TestFindPreviousBlock:
+    def test_blocks_are_found_from_the_end(self):
+        pieces = [b"abc\n", b"\x1f\x8b" * 1000, b"", b"def\n"]
+        path = helper_write(pieces)
+        blocks = [helper_block(p) for p in pieces + [b""]]
+        with io.open(path, mode="rb") as fp:
+            position = os.path.getsize(path)
+            for block in blocks[::-1]:
+                position, found = _find_previous_block(fp, position)
+                assert found == block
+            assert position == 0
+        os.unlink(path)
+
+    def test_no_block_ends_there(self):
+        path = helper_write([b"abc\n"])
+        with io.open(path, mode="rb") as fp:
+            with pytest.raises(ValueError):
+                _find_previous_block(fp, 10)
+        os.unlink(path)
+
+
+class TestIsBgzf:
+    def test_is_bgzf(self):
+        assert is_bgzf(helper_block(b"abc"))
+        assert not is_bgzf(gzip.compress(b"abc"))
+        assert not is_bgzf(b"abc")
+
+
+class TestBgzfBufferWorkSpace:
+    def test_only_trailing_blocks_get_decompressed(self, mocker):
+        path = helper_write(["line {}\n".format(i).encode("ascii") * 100 for i in range(100)])
+        spy = mocker.spy(zlib, "decompress")
+        with io.open(path, mode="rb") as fp:
+            b = BgzfBufferWorkSpace(fp, chunk_size=1)
+            b.read_until_yieldable()
+            assert b.return_line() == b"line 99"
+        assert spy.call_count == 1
+        os.unlink(path)
+
+    def test_empty_content(self):
+        path = helper_write([])
+        with io.open(path, mode="rb") as fp:
+            assert BgzfBufferWorkSpace(fp, chunk_size=1).has_returned_every_line()
+        os.unlink(path)
+
+
+class TestFileReadBackwardsBgzf:
+    def test_lines_across_blocks(self):
+        for new_line in new_lines:
+            lines = ["", "abc", "Café", "x" * 70000] + ["line {}".format(i) for i in range(1000)]
+            content = new_line.join(lines).encode("utf-8")
+            # cut within lines, within new lines, and within multi-byte characters
+            cuts = [0, len(content), content.find(b"\xa9"), content.rfind(b"\r\n") + 1]
+            cuts = sorted(set(cuts + list(range(0, len(content), 997))))
+            path = helper_write(content[a:b] for a, b in zip(cuts[:-1], cuts[1:]))
+            for chunk_size in (1, 5000, 1 << 20):
+                for read_ahead in (0, 2):
+                    with FileReadBackwards(path, chunk_size=chunk_size, read_ahead=read_ahead) as f:
+                        assert list(f) == lines[::-1]
+            assert not os.path.exists(path + ".frbgzidx")
+            os.unlink(path)
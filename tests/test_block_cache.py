@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `block_cache` module."""
+
+import os
+import tempfile
+import threading
+
+import pytest
+
+from file_read_backwards.block_cache import BlockCache
+
+
+@pytest.fixture
+def content_file():
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write(bytes(range(256)) * 40)
+    yield t.name
+    os.unlink(t.name)
+
+
+class TestBlockCache:
+    def test_reads_across_blocks(self, content_file):
+        content = bytes(range(256)) * 40
+        cache = BlockCache(max_bytes=4096, block_size=1024)
+        with cache.open(content_file) as fp:
+            for position, size in ((0, 10), (1000, 100), (1024, 1024), (10000, 1000), (10240, 5), (3, 0)):
+                assert fp.pread(position, size) == content[position:position + size]
+            assert fp.seek(-6, os.SEEK_END) == len(content) - 6
+            assert fp.read() == content[-6:]
+
+    def test_readers_share_blocks_and_descriptor(self, content_file):
+        cache = BlockCache(max_bytes=4096, block_size=1024)
+        fp1 = cache.open(content_file)
+        fp2 = cache.open(content_file)
+        assert fp1.fileno() == fp2.fileno()
+        fp1.pread(2000, 10)
+        fp2.pread(2010, 10)
+        assert (cache.hits, cache.misses) == (1, 1)
+        fp1.close()
+        os.fstat(fp2.fileno())  # still open for the other reader
+        fp2.close()
+        assert cache._descriptors == {}
+
+    def test_least_recently_used_blocks_get_dropped(self, content_file):
+        cache = BlockCache(max_bytes=2048, block_size=1024)
+        with cache.open(content_file) as fp:
+            fp.pread(0, 1)
+            fp.pread(1024, 1)
+            fp.pread(0, 1)
+            fp.pread(2048, 1)
+            assert cache.size == 2048
+            assert [key[-1] for key in cache._blocks] == [0, 2048]
+
+    def test_modified_file_gets_read_again(self, content_file):
+        cache = BlockCache(max_bytes=4096, block_size=1024)
+        with cache.open(content_file) as fp:
+            assert fp.pread(0, 3) == b"\x00\x01\x02"
+        with open(content_file, "r+b") as t:
+            t.write(b"abc")
+        os.utime(content_file, ns=(0, 0))
+        with cache.open(content_file) as fp:
+            assert fp.pread(0, 3) == b"abc"
+
+    def test_concurrent_readers(self, content_file):
+        content = bytes(range(256)) * 40
+        cache = BlockCache(max_bytes=3072, block_size=1024)
+        errors = []
+
+        def read():
+            with cache.open(content_file) as fp:
+                for position in range(0, len(content), 700):
+                    if fp.pread(position, 900) != content[position:position + 900]:
+                        errors.append(position)
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert cache.size <= 3072
@@ -8,6 +8,8 @@ import tempfile
 import pytest
 from pytest_mock import MockerFixture
 from file_read_backwards.buffer_work_space import BufferWorkSpace
+from file_read_backwards.buffer_work_space import ReadAhead
+from file_read_backwards.buffer_work_space import new_lines
 from file_read_backwards.buffer_work_space import new_lines_bytes
 from file_read_backwards.buffer_work_space import _find_furthest_new_line
 from file_read_backwards.buffer_work_space import _remove_trailing_new_line
@@ -15,6 +17,12 @@ from file_read_backwards.buffer_work_space import _get_file_size
 from file_read_backwards.buffer_work_space import _is_partially_read_new_line
 from file_read_backwards.buffer_work_space import _get_what_to_read_next
 from file_read_backwards.buffer_work_space import _get_next_chunk
+from file_read_backwards.buffer_work_space import _pread
+from file_read_backwards.buffer_work_space import _write_replacing
+from file_read_backwards.buffer_work_space import _rfind_new_line
+from file_read_backwards.buffer_work_space import _find_line_start
+from file_read_backwards.buffer_work_space import _find_new_line
+from file_read_backwards.buffer_work_space import _split_lines
 
 
 class TestFindFurthestNewLine:
@@ -53,6 +61,51 @@ class TestFindFurthestNewLine:
             assert r == expected_value
 
 
+class TestRFindNewLine:
+    def test_with_no_new_line(self):
+        assert _rfind_new_line(b"SomeRandomCharacters", 0, 20) == -1
+
+    def test_with_variety_of_new_lines(self):
+        base_string = b"SomeRandomCharacters"
+        for n in new_lines_bytes:
+            test_string = base_string + n + base_string
+            expected_value = len(base_string) + len(n) - 1
+            assert _rfind_new_line(test_string, 0, len(test_string)) == expected_value
+
+    def test_only_searches_within_bounds(self):
+        test_string = b"a\nb\rc"
+        assert _rfind_new_line(test_string, 0, 3) == 1
+        assert _rfind_new_line(test_string, 2, 3) == -1
+        assert _rfind_new_line(test_string, 2, 5) == 3
+
+
+class TestFindNewLine:
+    def test_with_no_new_line(self):
+        assert _find_new_line(b"SomeRandomCharacters", 0, 20) == -1
+
+    def test_with_variety_of_new_lines(self):
+        base_string = b"SomeRandomCharacters"
+        for n in new_lines_bytes:
+            test_string = base_string + n + base_string + n
+            expected_value = len(base_string) + len(n) - 1
+            assert _find_new_line(test_string, 0, len(test_string)) == expected_value
+
+    def test_only_searches_within_bounds(self):
+        test_string = b"a\nb\rc"
+        assert _find_new_line(test_string, 2, 5) == 3
+        assert _find_new_line(test_string, 2, 3) == -1
+
+
+class TestSplitLines:
+    def test_empty_block_is_a_single_empty_line(self):
+        assert _split_lines(b"") == [b""]
+
+    def test_with_variety_of_new_lines(self):
+        for n in new_lines_bytes:
+            assert _split_lines(b"a" + n + n + b"b") == [b"a", b"", b"b"]
+            assert _split_lines(b"a" + n) == [b"a", b""]
+
+
 class TestRemoveTrailingNewLine:
     def test_remove_trailing_new_line_with_empty_byte_string(self):
         test_string = b""
@@ -151,6 +204,70 @@ class TestGetWhatToReadNext:
         os.unlink(t.name)
 
 
+class TestPread:
+    def test_reads_at_position(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"abcdefg")
+        with io.open(t.name, mode="rb", buffering=0) as fp:
+            assert _pread(fp, 2, 3) == b"cde"
+            assert _pread(fp, 5, 10) == b"fg"
+            assert _pread(fp, 7, 3) == b""
+        os.unlink(t.name)
+
+    def test_short_positioned_reads_are_retried(self, mocker):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"abcdefg")
+        real_pread = os.pread
+        mocker.patch("os.pread", side_effect=lambda fd, size, position: real_pread(fd, min(size, 2), position))
+        with io.open(t.name, mode="rb", buffering=0) as fp:
+            assert _pread(fp, 1, 5) == b"bcdef"
+        os.unlink(t.name)
+
+
+class TestReadAhead:
+    def test_same_chunks_as_reading_them(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"ab\r\ncd\r\n\r\nefg\r\n")
+        with io.open(t.name, mode="rb") as fp:
+            expected = []
+            read_position = 15
+            while read_position > 2:
+                r = _get_next_chunk(fp, read_position, 3, 2)
+                read_position = r[1]
+                expected.append(r)
+            r = ReadAhead(lambda position: _get_next_chunk(fp, position, 3, 2), 15, 2, depth=2)
+            assert [r.get() for _ in expected] == expected
+            r.close()
+        os.unlink(t.name)
+
+    def test_errors_are_raised_by_get(self):
+        def get_next_chunk(position):
+            raise OSError("cannot read")
+        r = ReadAhead(get_next_chunk, 10, 0, depth=1)
+        with pytest.raises(OSError):
+            r.get()
+        r.close()
+
+    def test_close_stops_a_waiting_worker(self):
+        r = ReadAhead(lambda position: (b"x", position - 1), 10 ** 9, 0, depth=1)
+        assert r.get() == (b"x", 10 ** 9 - 1)
+        r.close()
+        assert not r._thread.is_alive()
+
+    def test_worker_stops_once_its_work_space_got_collected(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"line\n" * 1000)
+        with io.open(t.name, mode="rb") as fp:
+            b = BufferWorkSpace(fp, chunk_size=4)
+            b.start_read_ahead(1)
+            thread = b.read_ahead._thread
+            b.read_until_yieldable()
+            del b
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+        os.unlink(t.name)
+
+
 class TestGetNextChunk:
     def test_with_empty_file(self):
         with tempfile.NamedTemporaryFile(delete=False) as t:
@@ -200,6 +317,33 @@ class TestBufferWorkSpace:
         assert b.read_buffer == b"bbbaaa"
         assert b.read_position == 1018
 
+    def test_add_to_buffer_keeps_segments_until_a_new_line_is_read(self, mocker: MockerFixture):
+        _get_file_size_mock = mocker.patch("file_read_backwards.buffer_work_space._get_file_size")
+        fp_mock = mocker.Mock()
+        _get_file_size_mock.return_value = 1024
+        b = BufferWorkSpace(fp_mock, chunk_size=io.DEFAULT_BUFFER_SIZE)
+        b.add_to_buffer(content=b"aaa\n", read_position=1020)
+        b.add_to_buffer(content=b"bbb", read_position=1017)
+        b.add_to_buffer(content=b"ccc", read_position=1014)
+        assert len(b._segments) == 3
+        assert not b.yieldable()
+        b.add_to_buffer(content=b"d\nd", read_position=1011)
+        assert len(b._segments) == 1
+        assert b.yieldable()
+        assert b.return_line() == b"dcccbbbaaa"
+        assert b.read_buffer == b"d\n"
+
+    def test_add_to_buffer_with_several_segments_fully_read_in(self, mocker: MockerFixture):
+        _get_file_size_mock = mocker.patch("file_read_backwards.buffer_work_space._get_file_size")
+        fp_mock = mocker.Mock()
+        _get_file_size_mock.return_value = 6
+        b = BufferWorkSpace(fp_mock, chunk_size=io.DEFAULT_BUFFER_SIZE)
+        b.add_to_buffer(content=b"bbb", read_position=3)
+        b.add_to_buffer(content=b"aaa", read_position=0)
+        assert b.yieldable()
+        assert b.return_line() == b"aaabbb"
+        assert b.has_returned_every_line()
+
     def test_yieldable_for_new_initialized_buffer_work_space(self):
         with tempfile.NamedTemporaryFile(delete=False) as t:
             with io.open(t.name, mode="rb") as fp:
@@ -347,3 +491,96 @@ class TestBufferWorkSpace:
         b.read_buffer = None
         r = b.has_returned_every_line()
         assert r
+
+    def test_return_lines_with_not_fully_read_in_buffer_space(self, mocker: MockerFixture):
+        _get_file_size_mock = mocker.patch("file_read_backwards.buffer_work_space._get_file_size")
+        fp_mock = mocker.Mock()
+        _get_file_size_mock.return_value = 1024
+
+        for n in new_lines_bytes:
+            b = BufferWorkSpace(fp_mock, chunk_size=io.DEFAULT_BUFFER_SIZE)
+            b.read_position = 1000
+            b.read_buffer = b"partial" + n + b"one" + n + n + b"two" + n
+            r = b.return_lines()
+            assert r == [b"two", b"", b"one"]
+            assert b.read_buffer == b"partial" + n
+
+    def test_return_lines_with_fully_read_in_buffer_space(self, mocker: MockerFixture):
+        _get_file_size_mock = mocker.patch("file_read_backwards.buffer_work_space._get_file_size")
+        fp_mock = mocker.Mock()
+        _get_file_size_mock.return_value = 1024
+
+        for n in new_lines_bytes:
+            b = BufferWorkSpace(fp_mock, chunk_size=io.DEFAULT_BUFFER_SIZE)
+            b.read_position = 0
+            b.read_buffer = b"first" + n + b"second"
+            r = b.return_lines()
+            assert r == [b"second", b"first"]
+            assert b.has_returned_every_line()
+
+    def test_work_space_restricted_to_part_of_a_file(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"zero\none\ntwo\nthree\n")
+        with io.open(t.name, mode="rb") as fp:
+            b = BufferWorkSpace(fp, chunk_size=3, start=5, end=13)
+            lines = []
+            while not b.has_returned_every_line():
+                b.read_until_yieldable()
+                lines.append(b.return_line())
+            assert lines == [b"two", b"one"]
+            assert b.read_position == 5
+        os.unlink(t.name)
+
+    def test_pending_end(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"zero\none\ntwo\nthree\n")
+        with io.open(t.name, mode="rb") as fp:
+            b = BufferWorkSpace(fp, chunk_size=3, start=5, end=13)
+            ends = [b.pending_end()]
+            while not b.has_returned_every_line():
+                b.read_until_yieldable()
+                b.return_line()
+                ends.append(b.pending_end())
+            assert ends == [13, 9, 5]
+        os.unlink(t.name)
+
+
+class TestFindLineStart:
+    def test_variety_of_new_lines(self):
+        for new_line in new_lines:
+            content = new_line.join(["abc", "", "de"]).encode("ascii")
+            n = len(new_line)
+            expected = [0] + [3 + n] * (3 + n) + [3 + 2 * n] * n + [len(content)] * (len(content) - 4 - 2 * n)
+            fp = io.BytesIO(content)
+            for chunk_size in (1, 2, 3, 100):
+                assert [_find_line_start(fp, p, chunk_size) for p in range(len(content))] == expected
+
+    def test_ends_with_a_new_line(self):
+        fp = io.BytesIO(b"abc\r\n")
+        assert _find_line_start(fp, 4, 1) == 5
+        assert _find_line_start(fp, 5, 1) == 5
+
+
+class TestWriteReplacing:
+    def test_replaces_the_file_with_the_permissions_of_another(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"old")
+        os.chmod(t.name, 0o640)
+        _write_replacing(t.name + ".new", lambda fp: fp.write(b"new"), t.name)
+        with open(t.name + ".new", "rb") as fp:
+            assert fp.read() == b"new"
+        if os.name == "posix":
+            assert os.stat(t.name + ".new").st_mode & 0o777 == 0o640
+        os.unlink(t.name + ".new")
+        os.unlink(t.name)
+
+    def test_temporary_file_is_removed_on_errors(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "index")
+
+        def write(fp):
+            raise OSError("disk full")
+        with pytest.raises(OSError):
+            _write_replacing(path, write, directory)
+        assert os.listdir(directory) == []
+        os.rmdir(directory)
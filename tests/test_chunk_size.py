@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `chunk_size` module."""
+
+import os
+import tempfile
+import pytest
+
+from file_read_backwards.chunk_size import AdaptiveChunkSize
+
+
+@pytest.fixture
+def temp_file():
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write(b"x" * 10000)
+    with open(t.name, "rb") as fp:
+        yield fp
+    os.unlink(t.name)
+
+
+class TestAdaptiveChunkSize:
+    def test_initial_size_makes_the_next_reads_aligned(self, temp_file):
+        c = AdaptiveChunkSize(min_size=1000)
+        block_size = os.fstat(temp_file.fileno()).st_blksize
+        chunk_size = c.initial_size(temp_file)
+        assert c.alignment == block_size
+        assert chunk_size >= 1000
+        assert (10000 - chunk_size) % block_size == 0
+
+    def test_initial_size_within_bounds(self, temp_file):
+        c = AdaptiveChunkSize(min_size=16, max_size=32)
+        assert c.initial_size(temp_file) == 32
+
+    def test_grows_as_chunks_are_consumed(self, temp_file):
+        c = AdaptiveChunkSize(max_size=64 * 1024)
+        c.initial_size(temp_file)
+        sizes = [4 * c.alignment]
+        while sizes[-1] < 64 * 1024:
+            sizes.append(c.next_size(sizes[-1], sizes[-1], sizes[-1] // 64))
+        assert sizes == [4 * c.alignment * 2 ** i for i in range(len(sizes))]
+        assert c.next_size(sizes[-1], sizes[-1], sizes[-1] // 64) == 64 * 1024
+
+    def test_holds_at_least_min_lines(self, temp_file):
+        c = AdaptiveChunkSize(min_lines=16)
+        c.initial_size(temp_file)
+        assert c.next_size(4096, 50000, 1) >= 16 * 50000
+
+    def test_holds_at_most_max_lines(self, temp_file):
+        c = AdaptiveChunkSize(max_lines=100)
+        c.initial_size(temp_file)
+        assert c.next_size(65536, 65536, 65536 // 8) == c._align(800)
+
+    def test_reports_chosen_sizes(self, temp_file, mocker):
+        report = mocker.Mock()
+        c = AdaptiveChunkSize(report=report)
+        r = c.initial_size(temp_file)
+        report.assert_called_once_with(r)
+        r2 = c.next_size(r, r, r // 64)
+        report.assert_called_with(r2)
+        c.next_size(c.max_size, c.max_size, c.max_size // 64)
+        assert report.call_count == 2 if r2 == c.max_size else 3
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError):
+            AdaptiveChunkSize(min_size=10, max_size=5)
+
+    def test_shrinks_back_once_lines_get_short_again(self, temp_file):
+        c = AdaptiveChunkSize(max_size=1024 * 1024, min_lines=16, max_lines=100000)
+        c.initial_size(temp_file)
+        r = c.next_size(4 * c.alignment, 4 * c.alignment, 64)
+        assert r == 8 * c.alignment
+        for _ in range(3):  # wide lines
+            r = c.next_size(r, 100000, 1)
+            assert r == 1024 * 1024
+        assert c.next_size(r, r, r // 64) == 128 * c.alignment
+
+    def test_initial_size_from_where_reading_starts(self, temp_file):
+        c = AdaptiveChunkSize(min_size=1000)
+        chunk_size = c.initial_size(temp_file, 9000)
+        assert (9000 - chunk_size) % c.alignment == 0
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `cursor` module."""
+
+import gzip
+import itertools
+
+import pytest
+
+from file_read_backwards.cursor import LineCursor
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards.memory_file import MemoryFile
+from file_read_backwards.stats import CountingFile
+from file_read_backwards.stats import ReadStats
+
+new_line_cycle = itertools.cycle([b"\n", b"\r\n", b"\r"])
+content = memoryview(b"".join(n.join([b"line %d" % i, b""]) for i, n in zip(range(42), new_line_cycle)))
+lines = ["line {0}".format(i) for i in range(42)]
+
+
+class TestLineCursor:
+    def test_moves_both_ways(self):
+        for chunk_size in (1, 5, 16, 1024):
+            with LineCursor(content, chunk_size=chunk_size) as c:
+                assert c.position == len(content)
+                assert [c.prev() for _ in range(42)] == lines[::-1]
+                assert c.prev() is None
+                assert c.position == 0
+                assert [c.next() for _ in range(42)] == lines
+                assert c.next() is None
+                assert c.position == len(content)
+
+    def test_prev_then_next_return_the_same_line(self):
+        with LineCursor(content, chunk_size=8) as c:
+            c.prev()
+            c.prev()
+            assert c.prev() == "line 39"
+            position = c.position
+            assert c.next() == "line 39"
+            assert c.prev() == "line 39"
+            assert c.position == position
+
+    def test_begins_at_a_position(self):
+        with FileReadBackwards(content, chunk_size=16) as f:
+            assert list(itertools.islice(f, 10)) == lines[:-11:-1]
+            checkpoint = f.checkpoint()
+        with LineCursor(content, chunk_size=4, position=checkpoint["position"]) as c:
+            assert c.prev() == "line 31"
+            assert c.next() == "line 31"
+            assert c.next() == "line 32"
+        with LineCursor(bytearray(b"abc\n\ndef"), encoding=None, position=0) as c:
+            assert [c.next(), c.next(), c.next(), c.next()] == [b"abc", b"", b"def", None]
+        with pytest.raises(ValueError):
+            LineCursor(bytearray(b"abc\n"), position=5)
+
+    def test_changing_direction_reads_nothing(self):
+        stats = ReadStats()
+        with LineCursor(CountingFile(MemoryFile(content), stats), chunk_size=32) as c:
+            for _ in range(20):
+                c.prev()
+            reads = stats.reads
+            assert [c.next() for _ in range(20)] == lines[22:]
+            assert [c.prev() for _ in range(20)] == lines[:21:-1]
+            assert stats.reads == reads
+
+    def test_window_is_bounded(self):
+        stats = ReadStats()
+        with LineCursor(CountingFile(MemoryFile(content), stats), chunk_size=16, max_bytes=32) as c:
+            assert [c.prev() for _ in range(42)] == lines[::-1]
+            assert [c.next() for _ in range(42)] == lines
+            reads = stats.reads
+            assert [c.prev() for _ in range(42)] == lines[::-1]
+            assert stats.reads > reads
+
+    def test_gzip_file(self, tmp_path):
+        path = str(tmp_path / "lines.gz")
+        with gzip.open(path, "wb") as fp:
+            fp.write(content)
+        with LineCursor(path, chunk_size=16) as c:
+            assert c.prev() == "line 41"
+            assert c.next() == "line 41"
+
+    def test_close(self):
+        c = LineCursor(content)
+        assert c.prev() == "line 41"
+        c.close()
+        assert c.closed
+        assert c.prev() is None
+        assert c.next() is None
@@ -2,15 +2,29 @@
 # -*- coding: utf-8 -*-
 """Tests for `file_read_backwards` module."""
 
+import gc
+import gzip
+import io
 import itertools
+import json
+import pickle
+import re
 import os
 import tempfile
+import threading
 import pytest
 
 from collections import deque
 
+from file_read_backwards.block_cache import BlockCache
+from file_read_backwards.chunk_size import AdaptiveChunkSize
 from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards.file_read_backwards import _detect_newline
+from file_read_backwards.file_read_backwards import auto_newline_size
 from file_read_backwards.file_read_backwards import supported_encodings
+from file_read_backwards.file_read_backwards import supported_engines
+from file_read_backwards.file_read_backwards import wide_encodings
+from file_read_backwards.stats import ReadStats
 from file_read_backwards.buffer_work_space import new_lines
 
 
@@ -250,3 +264,548 @@ class TestFileReadBackwardsCloseFunctionality:
             it.close()
             for _ in it:
                 pytest.fail("An iterator should be exhausted when closed.")
+
+
+class TestFileReadBackwardsEngines:
+    def test_unsupported_engine(self, empty_file):
+        with pytest.raises(NotImplementedError):
+            _ = FileReadBackwards(empty_file.name, engine="not-supported-engine")
+
+    def test_engines_read_the_same_lines(self):
+        for new_line in new_lines:
+            lines = ["", "line one", "", "Café", "a much longer line than the chunk size", ""]
+            temp_file = helper_create_temp_file((line for line in [new_line.join(lines)]))
+            for chunk_size in (1, 2, 3, 7, 1024):
+                results = []
+                for engine in supported_engines:
+                    with FileReadBackwards(temp_file.name, chunk_size=chunk_size, engine=engine) as f:
+                        results.append(list(f))
+                assert results[0] == list(reversed(lines[:-1]))
+                for r in results[1:]:
+                    assert r == results[0]
+
+    def test_mmap_engine_with_completely_empty_file(self, empty_file):
+        with FileReadBackwards(empty_file.name, engine="mmap") as f:
+            assert list(f) == []
+
+    def test_mmap_engine_readline(self, long_file):
+        with FileReadBackwards(long_file.name, engine="mmap") as f:
+            assert f.readline() == "line 41!" + os.linesep
+            assert f.readline() == "line 40!" + os.linesep
+
+    def test_mmap_engine_close(self, long_file):
+        f = FileReadBackwards(long_file.name, engine="mmap")
+        it = iter(f)
+        next(it)
+        f.close()
+        assert it.closed
+        for _ in it:
+            pytest.fail("An iterator should be exhausted when closed.")
+
+
+class TestFileReadBackwardsAdaptiveChunkSize:
+    def test_same_lines_as_fixed_chunk_size(self):
+        for new_line in new_lines:
+            lines = ["{{\"id\": {0}, \"data\": \"{1}\"}}".format(i, "x" * (i % 7 * 3000)) for i in range(200)]
+            temp_file = helper_create_temp_file((line for line in [new_line.join(lines)]))
+            for engine in supported_engines:
+                for min_size in (1, 4096):
+                    chunk_size = AdaptiveChunkSize(min_size=min_size, max_size=64 * 1024)
+                    with FileReadBackwards(temp_file.name, chunk_size=chunk_size, engine=engine) as f:
+                        assert list(f) == lines[::-1]
+
+    def test_chunk_size_adapts_to_line_lengths(self, mocker):
+        report = mocker.Mock()
+        temp_file = helper_create_temp_file(("x" * 100000 + "\n" for _ in range(20)))
+        chunk_size = AdaptiveChunkSize(max_size=4 * 1024 * 1024, report=report)
+        with FileReadBackwards(temp_file.name, chunk_size=chunk_size) as f:
+            it = iter(f)
+            next(it)
+            first = it.chunk_size
+            list(it)
+        assert first >= 16 * 100000
+        assert [c[0][0] for c in report.call_args_list][1] == first
+
+    def test_search_adapts_chunk_size(self):
+        temp_file = helper_create_temp_file(("line {}\n".format(i) for i in range(100000)))
+        with FileReadBackwards(temp_file.name, chunk_size=AdaptiveChunkSize()) as f:
+            it = iter(f)
+            first = it.chunk_size
+            assert next(f.search("line 1000")) == "line 10009"
+            assert it.chunk_size > first
+
+
+class TestFileReadBackwardsReadAhead:
+    def test_same_lines_as_without_reading_ahead(self):
+        for new_line in new_lines:
+            lines = ["", "line one", "", "Café", "a much longer line than the chunk size", ""] * 50
+            temp_file = helper_create_temp_file((line for line in [new_line.join(lines)]))
+            for chunk_size in (1, 2, 7, 1024, AdaptiveChunkSize(min_size=1)):
+                for read_ahead in (1, 4):
+                    with FileReadBackwards(temp_file.name, chunk_size=chunk_size, read_ahead=read_ahead) as f:
+                        assert list(f) == list(reversed(lines[:-1]))
+
+    def test_close_while_reading_ahead(self, long_file):
+        f = FileReadBackwards(long_file.name, chunk_size=4, read_ahead=2)
+        it = iter(f)
+        assert next(it) == "line 41!"
+        f.close()
+        assert it.closed
+        assert list(it) == []
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/fd"), reason="open file descriptors are listed in /proc")
+    def test_dropped_without_being_closed(self, long_file):
+        def last_line():
+            for line in FileReadBackwards(long_file.name, chunk_size=4, read_ahead=2):
+                return line
+
+        threads, fds = threading.active_count(), len(os.listdir("/proc/self/fd"))
+        for _ in range(20):
+            assert last_line() == "line 41!"
+        gc.collect()
+        assert threading.active_count() == threads
+        assert len(os.listdir("/proc/self/fd")) == fds
+
+    def test_only_the_buffered_engine_reads_ahead(self, long_file):
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards(long_file.name, engine="mmap", read_ahead=2)
+
+
+class TestFileReadBackwardsStats:
+    def test_no_stats_by_default(self, long_file):
+        with FileReadBackwards(long_file.name) as f:
+            assert f.stats is None
+            assert f.iterator.stats is None
+
+    def test_counts(self, long_file):
+        chunks = []
+        with FileReadBackwards(long_file.name, chunk_size=16, on_chunk=lambda *chunk: chunks.append(chunk)) as f:
+            assert list(f) == ["line {}!".format(i) for i in reversed(xrange(42))]
+        stats = f.stats
+        assert stats is f.iterator.stats
+        assert stats.lines == 42
+        assert stats.bytes_read == os.path.getsize(long_file.name) + stats.reads - stats.chunks
+        assert stats.chunks == len(chunks) > 1
+        assert sum(size for position, size in chunks) == os.path.getsize(long_file.name)
+        assert [position for position, size in chunks] == sorted((position for position, size in chunks), reverse=True)
+        assert stats.reads > stats.chunks  # the one byte probes for a "\r\n" across chunks count as well
+        assert stats.seeks == 0  # chunks get read with os.pread
+        assert stats.decode_time > 0
+
+    def test_concatenations_of_a_line_spanning_chunks(self):
+        temp_file = helper_create_temp_file((line for line in ["x" * 100, "\n", "y\n"]))
+        with FileReadBackwards(temp_file.name, chunk_size=8, stats=True) as f:
+            assert list(f) == ["y", "x" * 100]
+            assert f.stats.concatenations == 1
+
+    def test_batches_and_search_count_lines(self, long_file):
+        with FileReadBackwards(long_file.name, encoding=None, stats=True) as f:
+            batch = next(f.iter_batches(max_lines=5))
+            assert batch == [b"line 41!", b"line 40!", b"line 39!", b"line 38!", b"line 37!"]
+            assert list(f.search(b"line 1")) == [b"line 19!", b"line 18!", b"line 17!", b"line 16!", b"line 15!",
+                                                 b"line 14!", b"line 13!", b"line 12!", b"line 11!", b"line 10!",
+                                                 b"line 1!"]
+            assert f.stats.lines == 16
+            assert f.stats.decode_time == 0
+
+    def test_shared_stats(self, long_file):
+        stats = ReadStats()
+        for engine in supported_engines:
+            with FileReadBackwards(long_file.name, engine=engine, stats=stats) as f:
+                assert f.stats is stats
+                list(f)
+        assert stats.lines == 84
+        assert stats.chunks >= 2
+
+
+class TestFileReadBackwardsWideEncodings:
+    def test_lines_with_variety_of_new_lines_and_chunk_sizes(self):
+        lines = ["", "line one", "Café \U0001f600", "", "a much longer line than the chunk size"]
+        for encoding, new_line in itertools.product(wide_encodings, new_lines):
+            temp_file = helper_create_temp_file((line for line in [new_line.join(lines) + new_line]), encoding)
+            for chunk_size in (1, 2, 3, 8, 1024, AdaptiveChunkSize(min_size=1)):
+                with FileReadBackwards(temp_file.name, encoding=encoding.upper(), chunk_size=chunk_size) as f:
+                    assert list(f) == list(reversed(lines))
+
+    def test_byte_order_mark_is_not_part_of_the_first_line(self):
+        temp_file = helper_create_temp_file((line for line in ["\ufeffabc\ndef\n"]), "utf-16-le")
+        with FileReadBackwards(temp_file.name, encoding="utf-16-le", read_ahead=2) as f:
+            assert list(f) == ["def", "abc"]
+        with FileReadBackwards(temp_file.name, encoding="utf-16") as f:
+            assert list(f) == ["def", "abc"]
+
+    def test_search_and_batches(self):
+        temp_file = helper_create_temp_file((line for line in ["Café\nabc\ncafé\n"]), "utf-32")
+        with FileReadBackwards(temp_file.name, encoding="utf-32") as f:
+            assert list(f.search("afé")) == ["café", "Café"]
+        with FileReadBackwards(temp_file.name, encoding="utf-32") as f:
+            assert next(f.iter_batches(max_lines=2)) == ["café", "abc"]
+
+    def test_only_the_buffered_engine_reads_wide_encodings(self, long_file):
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards(long_file.name, encoding="utf-16", engine="mmap")
+
+
+class TestFileReadBackwardsSeparator:
+    def test_nul_separated_records(self):
+        records = ["", "first\nrecord", "Café", "a much longer record than the chunk size"]
+        temp_file = helper_create_temp_file((line for line in ["\x00".join(records) + "\x00"]))
+        for chunk_size in (1, 2, 7, 1024, AdaptiveChunkSize(min_size=1)):
+            for read_ahead in (0, 2):
+                with FileReadBackwards(temp_file.name, chunk_size=chunk_size, read_ahead=read_ahead,
+                                       separator=b"\x00") as f:
+                    assert list(f) == list(reversed(records))
+
+    def test_multi_byte_separator(self):
+        temp_file = helper_create_temp_file((line for line in ["abc<EOR>de\nf<EOR>gh"]))
+        with FileReadBackwards(temp_file.name, encoding=None, chunk_size=3, separator=b"<EOR>") as f:
+            assert list(f) == [b"gh", b"de\nf", b"abc"]
+
+    def test_overlapping_separators_split_like_rsplit(self):
+        for separator, content in ((b"aa", b"xaaay"), (b"\x00\x00", b"x\x00\x00\x00y\x00\x00z"),
+                                   (b"::", b"a:::::b::::c::d:::")):
+            # like a new line, a separator at the very end of the file ends the last record
+            expected = (content[:-len(separator)] if content.endswith(separator) else content).rsplit(separator)[::-1]
+            content = memoryview(content)
+            for chunk_size in (1, 2, 3, 4, 8192, AdaptiveChunkSize(min_size=1)):
+                with FileReadBackwards(content, encoding=None, chunk_size=chunk_size, separator=separator) as f:
+                    assert list(f) == expected
+                with FileReadBackwards(content, encoding=None, chunk_size=chunk_size, separator=separator) as f:
+                    assert [r for batch in f.iter_batches() for r in batch] == expected
+                with FileReadBackwards(content, encoding=None, chunk_size=chunk_size, separator=separator) as f:
+                    assert list(f.search(b"a")) == [r for r in expected if b"a" in r]
+
+    def test_search_matches_within_records_only(self):
+        temp_file = helper_create_temp_file((line for line in ["xabyabazabbab"]))
+        for chunk_size in (1, 2, 3, 1024):
+            for pattern, expected in ((b"a", ["az"]), (b"ab", []), (b"b", ["b"]), (b"ba", []),
+                                      (re.compile(rb"y."), []), (re.compile(rb"z.*b", re.DOTALL), [])):
+                with FileReadBackwards(temp_file.name, chunk_size=chunk_size, separator=b"ab") as f:
+                    assert list(f.search(pattern)) == expected
+
+    def test_readline_ends_records_with_the_separator(self):
+        temp_file = helper_create_temp_file((line for line in ["abc\x1edef\x1e"]))
+        with FileReadBackwards(temp_file.name, separator="\x1e") as f:
+            assert f.readline() == "def\x1e"
+            assert f.readline() == "abc\x1e"
+            assert f.readline() == ""
+
+    def test_search_and_batches(self):
+        temp_file = helper_create_temp_file((line for line in ["one\x00two\nthree\x00four\x00"]))
+        with FileReadBackwards(temp_file.name, separator=b"\x00") as f:
+            assert list(f.search("t")) == ["two\nthree"]
+        with FileReadBackwards(temp_file.name, separator=b"\x00") as f:
+            assert next(f.iter_batches()) == ["four", "two\nthree", "one"]
+
+    def test_only_the_buffered_engine_splits_on_a_separator(self, long_file):
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards(long_file.name, engine="mmap", separator=b"\x00")
+
+
+class TestFileReadBackwardsNewline:
+    def test_new_line_policies(self):
+        temp_file = helper_create_temp_file((line for line in ["a\rb\r\nc\nd\r\n"]))
+        expected = {
+            None: ["d", "c", "b", "a"],
+            "": ["d", "c", "b", "a"],
+            "\n": ["d\r", "c", "a\rb\r"],
+            "\r\n": ["c\nd", "a\rb"],
+            "\r": ["\n", "\nc\nd", "b", "a"],
+        }
+        for newline, lines in expected.items():
+            for chunk_size in (1, 2, 3, 1024):
+                with FileReadBackwards(temp_file.name, chunk_size=chunk_size, newline=newline) as f:
+                    assert list(f) == lines
+
+    def test_auto_detects_a_single_kind_of_new_line(self):
+        for new_line in new_lines:
+            # the new lines of the beginning of the file are too far from its end to be looked at
+            content = "a\rb\nc\r\n" + "x" * auto_newline_size + new_line + "line{}".format(new_line) * 3
+            temp_file = helper_create_temp_file((line for line in [content]))
+            with FileReadBackwards(temp_file.name, chunk_size=4, newline="auto", stats=True) as f:
+                assert list(f)[:3] == ["line"] * 3
+                assert f.stats.reads == f.stats.chunks  # no one byte probes
+        temp_file = helper_create_temp_file((line for line in ["a\rb\nc\r\n"]))
+        with FileReadBackwards(temp_file.name, newline="auto") as f:
+            assert list(f) == ["c", "b", "a"]
+
+    def test_detect_newline(self):
+        assert _detect_newline(io.BytesIO(b"a\r\nb\r\n")) == b"\r\n"
+        assert _detect_newline(io.BytesIO(b"a\nb\n")) == b"\n"
+        assert _detect_newline(io.BytesIO(b"a\rb\r")) == b"\r"
+        assert _detect_newline(io.BytesIO(b"a\rb\n")) is None
+        assert _detect_newline(io.BytesIO(b"ab")) is None
+
+    def test_illegal_values(self, long_file):
+        with pytest.raises(ValueError):
+            FileReadBackwards(long_file.name, newline="\n\n")
+        with pytest.raises(ValueError):
+            FileReadBackwards(long_file.name, newline="\n", separator=b"\x00")
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards(long_file.name, newline="\n", engine="mmap")
+
+
+class TestFileReadBackwardsSources:
+    def test_content_in_memory(self):
+        content = "".join("line {}!\n".format(i) for i in xrange(42)).encode("utf-8")
+        for source in (content, bytearray(content), memoryview(content)):
+            with FileReadBackwards.from_buffer(source, chunk_size=16) as f:
+                assert list(f) == ["line {}!".format(i) for i in reversed(xrange(42))]
+        for source in (bytearray(content), memoryview(content)):
+            with FileReadBackwards(source, chunk_size=16) as f:
+                assert list(f) == ["line {}!".format(i) for i in reversed(xrange(42))]
+
+    def test_bytes_are_a_path(self, long_file):
+        with FileReadBackwards(os.fsencode(long_file.name)) as f:
+            assert next(iter(f)) == "line 41!"
+
+    def test_file_descriptor_is_left_open_at_its_position(self, long_file):
+        fd = os.open(long_file.name, os.O_RDONLY)
+        try:
+            os.lseek(fd, 3, os.SEEK_SET)
+            with FileReadBackwards(fd, chunk_size=16) as f:
+                assert list(f) == ["line {}!".format(i) for i in reversed(xrange(42))]
+            assert os.lseek(fd, 0, os.SEEK_CUR) == 3
+        finally:
+            os.close(fd)
+
+    def test_file_objects_are_left_open(self, long_file):
+        with io.open(long_file.name, mode="rb") as fp:
+            fp.seek(3)
+            f = FileReadBackwards(fp, chunk_size=16)
+            assert next(iter(f)) == "line 41!"
+            f.close()
+            assert f.iterator.closed
+            assert list(f) == []
+            assert not fp.closed
+            assert fp.read(4) == b"e 0!"
+        with FileReadBackwards(io.BytesIO(b"abc\ndef"), encoding=None) as f:
+            assert list(f) == [b"def", b"abc"]
+
+    def test_gzip_content_needs_a_path(self):
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards.from_buffer(gzip.compress(b"abc\n"))
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards.from_buffer(b"abc\n", engine="mmap")
+
+
+class TestFileReadBackwardsBlockCache:
+    def test_readers_share_blocks(self, long_file):
+        cache = BlockCache(max_bytes=1024, block_size=64)
+        expected = ["line {}!".format(i) for i in reversed(xrange(42))]
+        for chunk_size in (1, 16, 1024):
+            with FileReadBackwards(long_file.name, chunk_size=chunk_size, block_cache=cache) as f:
+                assert list(f) == expected
+        misses = cache.misses
+        with FileReadBackwards(long_file.name, chunk_size=16, block_cache=cache, stats=True) as f:
+            assert list(f) == expected
+        assert cache.misses == misses
+        assert f.stats.reads > 0
+
+    def test_shared_block_cache(self, long_file):
+        with FileReadBackwards(long_file.name, block_cache=True) as f:
+            assert next(iter(f)) == "line 41!"
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards(long_file.name, engine="mmap", block_cache=True)
+
+
+class TestFileReadBackwardsCheckpoint:
+    def test_resume_where_reading_got_to(self, long_file):
+        expected = ["line {}!".format(i) for i in reversed(xrange(42))]
+        for engine in supported_engines:
+            for taken_at in (0, 1, 5, 41, 42):
+                with FileReadBackwards(long_file.name, chunk_size=16, engine=engine) as f:
+                    lines = list(itertools.islice(f, taken_at))
+                    checkpoint = json.loads(json.dumps(f.checkpoint()))
+                with FileReadBackwards(long_file.name, chunk_size=7, engine=engine, checkpoint=checkpoint) as f:
+                    assert lines + list(f) == expected
+        with FileReadBackwards(long_file.name) as f:
+            list(f)
+            checkpoint = pickle.loads(pickle.dumps(f.checkpoint()))
+        with FileReadBackwards(long_file.name, checkpoint=checkpoint) as f:
+            assert list(f) == []
+
+    def test_resume_with_mixed_new_lines_and_separators(self):
+        content = b"a\r\nb\rc\n\r\nd\n"
+        with FileReadBackwards.from_buffer(content, encoding=None, chunk_size=4) as f:
+            assert next(iter(f)) == b"d"
+            assert next(iter(f)) == b""
+            checkpoint = f.checkpoint()
+        assert checkpoint["position"] == 7 and checkpoint["file"] is None
+        with FileReadBackwards.from_buffer(content, encoding=None, checkpoint=checkpoint) as f:
+            assert list(f) == [b"c", b"b", b"a"]
+        with FileReadBackwards.from_buffer(b"a,b,c", separator=",") as f:
+            assert next(iter(f)) == "c"
+            checkpoint = f.checkpoint()
+        with FileReadBackwards.from_buffer(b"a,b,c,d", separator=",", checkpoint=checkpoint) as f:
+            assert list(f) == ["b", "a"]
+
+    def test_appended_file_resumes(self):
+        t = helper_create_temp_file(("line {}!\n".format(i) for i in xrange(10)))
+        with FileReadBackwards(t.name, chunk_size=16) as f:
+            assert next(iter(f)) == "line 9!"
+            checkpoint = f.checkpoint()
+        with io.open(t.name, mode="ab") as fp:
+            fp.write(b"appended\n")
+        with FileReadBackwards(t.name, checkpoint=checkpoint) as f:
+            assert list(f) == ["line {}!".format(i) for i in reversed(xrange(9))]
+
+    def test_replaced_or_truncated_file_is_detected(self):
+        t = helper_create_temp_file(("line {}!\n".format(i) for i in xrange(10)))
+        with FileReadBackwards(t.name) as f:
+            checkpoint = f.checkpoint()
+        with io.open(t.name, mode="r+b") as fp:
+            fp.truncate(30)
+        with pytest.raises(ValueError):
+            FileReadBackwards(t.name, checkpoint=checkpoint)
+        other = helper_create_temp_file(("line {}!\n".format(i) for i in xrange(10)))
+        os.replace(other.name, t.name)
+        created_files.discard(other)
+        with pytest.raises(ValueError):
+            FileReadBackwards(t.name, checkpoint=checkpoint)
+        with pytest.raises(ValueError):
+            FileReadBackwards.from_buffer(b"abc\n", checkpoint={"position": 5, "file": None})
+
+    def test_truncated_then_regrown_file_is_detected(self):
+        t = helper_create_temp_file(("line {}!\n".format(i) for i in xrange(40)))
+        with FileReadBackwards(t.name, chunk_size=16) as f:
+            assert next(iter(f)) == "line 39!"
+            checkpoint = f.checkpoint()
+        with io.open(t.name, mode="r+b") as fp:  # as copytruncate does, then more than before gets written
+            fp.truncate(0)
+            fp.write(b"X" * 1000 + b"\n")
+        with pytest.raises(ValueError):
+            FileReadBackwards(t.name, checkpoint=checkpoint)
+        with FileReadBackwards.from_buffer(b"abc\ndef\n", chunk_size=4) as f:
+            assert next(iter(f)) == "def"
+            checkpoint = f.checkpoint()
+        with pytest.raises(ValueError):
+            FileReadBackwards.from_buffer(b"abX\ndef\n", checkpoint=checkpoint)
+
+    def test_unsupported_checkpoints(self, long_file):
+        f = FileReadBackwards(long_file.name)
+        f.close()
+        with pytest.raises(ValueError):
+            f.checkpoint()
+        with FileReadBackwards.from_buffer("abc\n".encode("utf-16"), encoding="utf-16") as f:
+            with pytest.raises(NotImplementedError):
+                f.checkpoint()
+
+
+class TestFileReadBackwardsBatches:
+    def test_batches_hold_every_line_in_reverse_order(self, long_file):
+        for engine in supported_engines:
+            with FileReadBackwards(long_file.name, chunk_size=16, engine=engine) as f:
+                batches = list(f.iter_batches())
+            assert len(batches) > 1
+            assert list(itertools.chain.from_iterable(batches)) == ["line {}!".format(i) for i in reversed(xrange(42))]
+
+    def test_batches_with_max_lines(self, long_file):
+        with FileReadBackwards(long_file.name) as f:
+            batches = list(f.iter_batches(max_lines=5))
+        assert [len(batch) for batch in batches] == [5] * 8 + [2]
+
+    def test_batches_share_position_with_iteration(self, long_file):
+        with FileReadBackwards(long_file.name) as f:
+            assert f.readline() == "line 41!" + os.linesep
+            assert next(f.iter_batches(max_lines=2)) == ["line 40!", "line 39!"]
+            assert next(iter(f)) == "line 38!"
+
+    def test_batches_with_completely_empty_file(self, empty_file):
+        with FileReadBackwards(empty_file.name) as f:
+            assert list(f.iter_batches()) == []
+
+
+class TestFileReadBackwardsWithoutEncoding:
+    def test_lines_are_bytes(self):
+        for new_line in new_lines:
+            temp_file = helper_create_temp_file((line for line in ["Caf\xe9", new_line, "line1", new_line]))
+            for engine in supported_engines:
+                with FileReadBackwards(temp_file.name, encoding=None, engine=engine) as f:
+                    assert list(f) == [b"line1", b"Caf\xc3\xa9"]
+
+    def test_batches_are_bytes(self, long_file):
+        with FileReadBackwards(long_file.name, encoding=None) as f:
+            batch = next(f.iter_batches(max_lines=2))
+        assert batch == [b"line 41!", b"line 40!"]
+
+    def test_readline(self):
+        temp_file = helper_create_temp_file((line for line in ["Line0\n"]))
+        with FileReadBackwards(temp_file.name, encoding=None) as f:
+            assert f.readline() == b"Line0" + os.linesep.encode("ascii")
+            assert f.readline() == b""
+
+
+class TestFileReadBackwardsSearch:
+    def test_literal(self, long_file):
+        for engine in supported_engines:
+            with FileReadBackwards(long_file.name, chunk_size=16, engine=engine) as f:
+                assert list(f.search("1!")) == ["line 41!", "line 31!", "line 21!", "line 11!", "line 1!"]
+
+    def test_bytes_literal_without_encoding(self, long_file):
+        with FileReadBackwards(long_file.name, encoding=None) as f:
+            assert list(f.search(b"line 4")) == [b"line 41!", b"line 40!", b"line 4!"]
+
+    def test_regular_expression(self, long_file):
+        with FileReadBackwards(long_file.name, chunk_size=7) as f:
+            assert list(f.search(re.compile(rb"^line [23]5"))) == ["line 35!", "line 25!"]
+
+    def test_str_regular_expression_is_not_supported(self, long_file):
+        with FileReadBackwards(long_file.name) as f:
+            with pytest.raises(TypeError):
+                next(f.search(re.compile("line")))
+
+    def test_max_matches(self, long_file):
+        with FileReadBackwards(long_file.name, chunk_size=16) as f:
+            assert list(f.search("line", max_matches=3)) == ["line 41!", "line 40!", "line 39!"]
+
+    def test_lines_before_the_last_match_are_left_to_read(self):
+        temp_file = helper_create_temp_file(("line {}\r\n".format(i) for i in xrange(50)))
+        expected = ["line {}".format(i) for i in reversed(xrange(48))]
+        for chunk_size in (1, 16, 1024):
+            with FileReadBackwards(temp_file.name, chunk_size=chunk_size) as f:
+                assert list(f.search("line 4", max_matches=2)) == ["line 49", "line 48"]
+                assert list(f) == expected
+            with FileReadBackwards(temp_file.name, chunk_size=chunk_size) as f:
+                assert list(f.search("line 4", max_matches=2)) == ["line 49", "line 48"]
+                checkpoint = f.checkpoint()
+            with FileReadBackwards(temp_file.name, checkpoint=checkpoint) as f:
+                assert list(f) == expected
+            with FileReadBackwards(temp_file.name, chunk_size=chunk_size) as f:
+                matches = f.search("line 4")
+                assert next(matches) == "line 49"
+                assert next(iter(f)) == "line 48"
+                assert list(matches) == []
+        with FileReadBackwards.from_buffer(b"a\x00b\x00ab\x00c", separator=b"\x00") as f:
+            assert list(f.search("b", max_matches=1)) == ["ab"]
+            assert list(f) == ["b", "a"]
+        with FileReadBackwards.from_buffer(b"a::b:::ab::c", separator=b"::") as f:
+            assert list(f.search("b", max_matches=1)) == ["ab"]
+            assert list(f) == ["b:", "a"]
+
+    def test_several_matches_in_a_line_and_variety_of_new_lines(self):
+        for new_line in new_lines:
+            lines = ["aa", "", "b", "Café a", "a"]
+            temp_file = helper_create_temp_file((line for line in [new_line.join(lines)]))
+            for chunk_size in (1, 2, 3, 1024):
+                with FileReadBackwards(temp_file.name, chunk_size=chunk_size) as f:
+                    assert list(f.search("a")) == ["a", "Café a", "aa"]
+
+    def test_matches_have_to_be_within_a_line(self):
+        for new_line in new_lines:
+            lines = ["xa", "b", "a", "", "a b", "c"]
+            temp_file = helper_create_temp_file((line for line in [new_line.join(lines) + new_line]))
+            for chunk_size in (1, 2, 3, 1024):
+                for pattern, expected in ((rb"a\s", ["a b"]), (rb"a\sb", ["a b"]), (rb"a[^x]", ["a b"]),
+                                          (rb"a.*b", ["a b"]), (rb"\s", ["a b"])):
+                    with FileReadBackwards(temp_file.name, chunk_size=chunk_size) as f:
+                        assert list(f.search(re.compile(pattern, re.DOTALL))) == expected
+
+    def test_continues_from_the_current_line(self, long_file):
+        with FileReadBackwards(long_file.name) as f:
+            assert next(iter(f)) == "line 41!"
+            assert list(f.search("1!")) == ["line 31!", "line 21!", "line 11!", "line 1!"]
+
+    def test_with_completely_empty_file(self, empty_file):
+        with FileReadBackwards(empty_file.name) as f:
+            assert list(f.search("a")) == []
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `follow` module."""
+
+import os
+import tempfile
+import pytest
+
+from file_read_backwards.follow import tail_follow
+from file_read_backwards.follow import _InotifyWatcher
+from file_read_backwards.follow import _PollingWatcher
+from file_read_backwards.buffer_work_space import new_lines
+
+
+def helper_append(path, s):
+    with open(path, "ab") as t:
+        t.write(s.encode("utf-8"))
+
+
+@pytest.fixture
+def temp_path():
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write("".join("line {}\n".format(i) for i in range(10)).encode("utf-8"))
+    yield t.name
+    for path in (t.name, t.name + ".1"):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request):
+    return request.param
+
+
+def helper_follow(path, n, use_inotify):
+    return tail_follow(path, n, poll_interval=0.01, max_poll_interval=0.05, use_inotify=use_inotify)
+
+
+class TestTailFollow:
+    def test_last_lines_in_file_order(self, temp_path, use_inotify):
+        g = helper_follow(temp_path, 3, use_inotify)
+        assert [next(g) for _ in range(3)] == ["line 7", "line 8", "line 9"]
+        g.close()
+
+    def test_appended_lines(self, temp_path, use_inotify):
+        g = helper_follow(temp_path, 1, use_inotify)
+        assert next(g) == "line 9"
+        helper_append(temp_path, "line 10\nline 11\n")
+        assert next(g) == "line 10"
+        assert next(g) == "line 11"
+        g.close()
+
+    def test_incomplete_last_line_is_yielded_once_complete(self, temp_path, use_inotify):
+        helper_append(temp_path, "line ")
+        g = helper_follow(temp_path, 2, use_inotify)
+        assert [next(g) for _ in range(2)] == ["line 8", "line 9"]
+        helper_append(temp_path, "10\n")
+        assert next(g) == "line 10"
+        g.close()
+
+    def test_variety_of_new_lines(self, temp_path, use_inotify):
+        for new_line in new_lines:
+            g = helper_follow(temp_path, 1, use_inotify)
+            next(g)
+            helper_append(temp_path, "a" + new_line + new_line + "b" + new_line)
+            assert [next(g) for _ in range(3)] == ["a", "", "b"]
+            g.close()
+
+    def test_carriage_return_line_feed_written_apart(self, temp_path, use_inotify):
+        g = helper_follow(temp_path, 1, use_inotify)
+        assert next(g) == "line 9"
+        helper_append(temp_path, "a\r")
+        assert next(g) == "a"
+        helper_append(temp_path, "\nb\n")
+        assert next(g) == "b"
+        g.close()
+
+    def test_truncated_file(self, temp_path, use_inotify):
+        g = helper_follow(temp_path, 1, use_inotify)
+        assert next(g) == "line 9"
+        with open(temp_path, "wb") as t:
+            t.write(b"new\n")
+        assert next(g) == "new"
+        g.close()
+
+    def test_truncated_then_regrown_file(self, temp_path, use_inotify):
+        g = helper_follow(temp_path, 1, use_inotify)
+        assert next(g) == "line 9"
+        with open(temp_path, "r+b") as t:  # as copytruncate does, then more than before gets written
+            t.truncate(0)
+            t.write("".join("new {}\n".format(i) for i in range(20)).encode("utf-8"))
+        assert next(g) == "new 0"
+        g.close()
+
+    def test_rotated_file(self, temp_path, use_inotify):
+        g = helper_follow(temp_path, 1, use_inotify)
+        assert next(g) == "line 9"
+        helper_append(temp_path, "line 10\nunfinished")
+        os.rename(temp_path, temp_path + ".1")
+        with open(temp_path, "wb") as t:
+            t.write(b"new\n")
+        assert [next(g) for _ in range(3)] == ["line 10", "unfinished", "new"]
+        g.close()
+
+    def test_without_encoding(self, temp_path, use_inotify):
+        g = tail_follow(temp_path, 1, encoding=None, use_inotify=use_inotify)
+        assert next(g) == b"line 9"
+        g.close()
+
+    def test_unsupported_encoding(self, temp_path):
+        with pytest.raises(NotImplementedError):
+            next(tail_follow(temp_path, encoding="not-supported-encoding"))
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/fdinfo"), reason="inotify watches are listed in /proc")
+class TestInotifyWatcher:
+    def test_rewatch_removes_the_previous_watch(self, temp_path):
+        watcher = _InotifyWatcher(temp_path, 0.01)
+        try:
+            for _ in range(5):
+                os.rename(temp_path, temp_path + ".1")
+                with open(temp_path, "wb") as t:
+                    t.write(b"new\n")
+                watcher.rewatch(temp_path)
+            with open("/proc/self/fdinfo/{0}".format(watcher._fd)) as fdinfo:
+                watches = [line for line in fdinfo if line.startswith("inotify")]
+            assert len(watches) == 2  # the directory and the file
+        finally:
+            watcher.close()
+
+
+class TestPollingWatcher:
+    def test_backs_off_while_nothing_happens(self, mocker):
+        sleep_mock = mocker.patch("file_read_backwards.follow.time.sleep")
+        w = _PollingWatcher(0.1, 0.5)
+        for _ in range(4):
+            w.wait(False)
+        w.wait(True)
+        assert [c.args[0] for c in sleep_mock.call_args_list] == [0.1, 0.2, 0.4, 0.5, 0.1]
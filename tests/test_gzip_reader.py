@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `gzip_reader` module."""
+
+import functools
+import gzip
+import os
+import random
+import tempfile
+import pytest
+
+from file_read_backwards.buffer_work_space import new_lines
+from file_read_backwards.chunk_size import AdaptiveChunkSize
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards import gzip_reader
+from file_read_backwards.gzip_reader import BLOCK
+from file_read_backwards.gzip_reader import MEMBER
+from file_read_backwards.gzip_reader import GzipIndex
+from file_read_backwards.gzip_reader import GzipReader
+from file_read_backwards.gzip_reader import _shift
+
+
+@functools.lru_cache()
+def helper_content(count=20000, seed=0):
+    r = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "{}"]
+    return "".join("{} {}\n".format(i, " ".join(r.choice(words).format(r.random()) for _ in range(r.randint(0, 30))))
+                   for i in range(count)).encode("ascii")
+
+
+@pytest.fixture
+def temp_path():
+    with tempfile.NamedTemporaryFile(suffix=".gz", delete=False) as t:
+        pass
+    yield t.name
+    for path in (t.name, t.name + ".frbgzidx"):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def helper_assert_random_access(path, content, span):
+    with GzipReader(path, span=span) as r:
+        assert r.index.size == len(content)
+        for position in list(range(0, len(content), len(content) // 37)) + [len(content) - 1, len(content)]:
+            r.seek(position)
+            assert r.read(5000) == content[position:position + 5000]
+        r.seek(-10, os.SEEK_END)
+        assert r.read() == content[-10:]
+        return r.index
+
+
+class TestShift:
+    def test_shift_carries_bits_across_bytes(self):
+        data = bytes([0b10110000, 0b00000001, 0b11111111])
+        shifted, carry = _shift(data, 4, False)
+        assert shifted == bytes([0b00011011, 0b11110000])
+        assert carry == data[-1:]
+        assert _shift(carry, 4, True) == (bytes([0b00001111]), b"")
+
+
+class TestGzipReader:
+    def test_random_access_from_block_checkpoints(self, temp_path):
+        content = helper_content()
+        with gzip.open(temp_path, "wb") as t:
+            t.write(content)
+        index = helper_assert_random_access(temp_path, content, span=32 * 1024)
+        kinds = [c[2] for c in index.checkpoints]
+        assert kinds[0] == MEMBER and kinds.count(BLOCK) > 5
+        assert any(c[3] for c in index.checkpoints if c[2] == BLOCK)  # blocks beginning within a byte
+
+    def test_concatenated_members_and_trailing_garbage(self, temp_path):
+        content = helper_content()
+        with open(temp_path, "wb") as t:
+            t.write(gzip.compress(content[:100000]))
+            t.write(gzip.compress(content[100000:]))
+            t.write(b"\0" * 16)
+        index = helper_assert_random_access(temp_path, content, span=32 * 1024)
+        members = [c[:2] for c in index.checkpoints if c[2] == MEMBER]
+        assert members == [(0, 0), (100000, len(gzip.compress(content[:100000])))]
+
+    def test_without_zlib_shared_library(self, temp_path, mocker):
+        mocker.patch.object(gzip_reader, "_load_zlib", side_effect=OSError)
+        content = helper_content()
+        with open(temp_path, "wb") as t:
+            t.write(gzip.compress(content[:100000]))
+            t.write(gzip.compress(content[100000:]))
+        index = helper_assert_random_access(temp_path, content, span=32 * 1024)
+        assert [c[0] for c in index.checkpoints] == [0, 100000]
+
+    def test_empty_content(self, temp_path):
+        with gzip.open(temp_path, "wb"):
+            pass
+        with GzipReader(temp_path) as r:
+            assert r.index.size == 0
+            assert r.read() == b""
+
+
+class TestGzipIndex:
+    def test_index_is_saved_and_reused(self, temp_path, mocker):
+        content = helper_content()
+        with gzip.open(temp_path, "wb") as t:
+            t.write(content)
+        index = GzipIndex(temp_path, span=32 * 1024)
+        assert os.path.exists(temp_path + ".frbgzidx")
+        spy = mocker.spy(gzip_reader, "_build_checkpoints")
+        assert GzipIndex(temp_path, span=32 * 1024).checkpoints == index.checkpoints
+        assert spy.call_count == 0
+
+    def test_index_is_rebuilt_when_the_file_changes(self, temp_path):
+        with gzip.open(temp_path, "wb") as t:
+            t.write(b"abc\n")
+        assert GzipIndex(temp_path).size == 4
+        with gzip.open(temp_path, "wb") as t:
+            t.write(b"abcdef\n")
+        os.utime(temp_path, ns=(0, 0))
+        assert GzipIndex(temp_path).size == 7
+
+    def test_index_that_cannot_be_saved(self, temp_path):
+        with gzip.open(temp_path, "wb") as t:
+            t.write(b"abc\n")
+        index = GzipIndex(temp_path, index_path=os.path.join(temp_path + ".missing", "index"))
+        assert index.size == 4
+
+    @pytest.mark.skipif(os.name != "posix", reason="permission bits are POSIX ones")
+    def test_index_gets_the_permissions_of_the_file(self, temp_path):
+        with gzip.open(temp_path, "wb") as t:
+            t.write(b"abc\n")
+        os.chmod(temp_path, 0o644)
+        GzipIndex(temp_path)
+        assert os.stat(temp_path + ".frbgzidx").st_mode & 0o777 == 0o644
+
+
+class TestFileReadBackwardsGzip:
+    def test_same_lines_as_uncompressed_file(self, temp_path):
+        for new_line in new_lines:
+            lines = ["", "abc", "Café", "x" * 100000] + ["line {}".format(i) for i in range(10000)]
+            content = new_line.join(lines).encode("utf-8")
+            with gzip.open(temp_path, "wb") as t:
+                t.write(content)
+            with FileReadBackwards(temp_path, chunk_size=1000) as f:
+                assert list(f) == lines[::-1]
+
+    def test_adaptive_chunk_size_and_read_ahead(self, temp_path):
+        content = helper_content()
+        with gzip.open(temp_path, "wb") as t:
+            t.write(content)
+        with FileReadBackwards(temp_path, chunk_size=AdaptiveChunkSize(), read_ahead=2) as f:
+            assert list(f) == content.decode("ascii").splitlines()[::-1]
+
+    def test_mmap_engine_is_not_supported(self, temp_path):
+        with gzip.open(temp_path, "wb") as t:
+            t.write(b"abc\n")
+        with pytest.raises(NotImplementedError):
+            FileReadBackwards(temp_path, engine="mmap")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `line_index` module."""
+
+import io
+import os
+import tempfile
+import threading
+import pytest
+
+from file_read_backwards.buffer_work_space import new_lines
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards import line_index
+from file_read_backwards.line_index import LineIndex
+from file_read_backwards.line_index import _scan_line_starts
+
+
+@pytest.fixture
+def temp_path():
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write("".join("line {}\n".format(i) for i in range(100)).encode("utf-8"))
+    yield t.name
+    for path in (t.name, t.name + ".frbidx"):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def helper_append(path, s):
+    with open(path, "ab") as t:
+        t.write(s.encode("utf-8"))
+
+
+class TestScanLineStarts:
+    def test_variety_of_new_lines_and_chunk_sizes(self):
+        for new_line in new_lines:
+            content = new_line.join(["abc", "", "de", ""]).encode("ascii")
+            n = len(new_line)
+            with tempfile.NamedTemporaryFile(delete=False) as t:
+                t.write(content)
+            with io.open(t.name, mode="rb") as fp:
+                for chunk_size in (1, 2, 3, 100):
+                    r = list(_scan_line_starts(fp, 0, len(content), chunk_size))
+                    assert r == [3 + n, 3 + 2 * n, 5 + 3 * n]
+            os.unlink(t.name)
+
+
+class TestLineIndex:
+    def test_lines_from_end(self, temp_path):
+        index = LineIndex(temp_path)
+        assert len(index) == 100
+        assert index.line_from_end(0) == "line 99"
+        assert index.line_from_end(99) == "line 0"
+        assert index.lines_from_end(10, 13) == ["line 89", "line 88", "line 87"]
+        assert index.lines_from_end(98, 200) == ["line 1", "line 0"]
+        with pytest.raises(IndexError):
+            index.line_from_end(100)
+
+    def test_same_lines_as_file_read_backwards(self):
+        for new_line in new_lines:
+            for ending in ("", new_line):
+                with tempfile.NamedTemporaryFile(delete=False) as t:
+                    t.write((new_line.join(["", "a", "", "Café", "b"]) + ending).encode("utf-8"))
+                with FileReadBackwards(t.name) as f:
+                    expected = list(f)
+                index = LineIndex(t.name, chunk_size=2)
+                assert index.lines_from_end(0, len(index)) == expected
+                os.unlink(t.name)
+                os.unlink(t.name + ".frbidx")
+
+    def test_completely_empty_file(self, temp_path):
+        with open(temp_path, "wb"):
+            pass
+        index = LineIndex(temp_path)
+        assert len(index) == 0
+        assert index.lines_from_end(0, 10) == []
+
+    def test_index_is_saved_and_reused(self, temp_path, mocker):
+        LineIndex(temp_path)
+        assert os.path.exists(temp_path + ".frbidx")
+        scan = mocker.patch("file_read_backwards.line_index._scan_line_starts")
+        index = LineIndex(temp_path, encoding=None)
+        assert not scan.called
+        assert index.line_from_end(5) == b"line 94"
+
+    def test_grown_file_is_indexed_incrementally(self, temp_path, mocker):
+        helper_append(temp_path, "line 100\r")
+        LineIndex(temp_path)
+        helper_append(temp_path, "\nline 101")
+        scan = mocker.spy(line_index, "_scan_line_starts")
+        index = LineIndex(temp_path)
+        assert scan.call_args.args[1] == len("".join("line {}\n".format(i) for i in range(100)))
+        assert len(index) == 102
+        assert index.lines_from_end(0, 3) == ["line 101", "line 100", "line 99"]
+
+    def test_update(self, temp_path):
+        index = LineIndex(temp_path)
+        assert not index.update()
+        helper_append(temp_path, "line 100\n")
+        assert index.update()
+        assert index.line_from_end(0) == "line 100"
+
+    def test_truncated_then_regrown_file_is_indexed_again(self, temp_path):
+        index = LineIndex(temp_path)
+        with open(temp_path, "r+b") as t:  # copytruncate, then more lines than before
+            t.truncate(0)
+            t.write("".join("l{}\n".format(i) for i in range(200)).encode("utf-8"))
+        assert index.update()
+        assert len(index) == 200
+        assert index.lines_from_end(0, 2) == ["l199", "l198"]
+        assert LineIndex(temp_path).lines_from_end(198, 201) == ["l1", "l0"]
+
+    def test_replaced_file_is_indexed_again(self, temp_path):
+        LineIndex(temp_path)
+        os.unlink(temp_path)
+        with open(temp_path, "wb") as t:
+            t.write(b"other\nfile\n")
+        index = LineIndex(temp_path)
+        assert index.lines_from_end(0, 10) == ["file", "other"]
+
+    def test_broken_index_is_rebuilt(self, temp_path):
+        with open(temp_path + ".frbidx", "wb") as t:
+            t.write(b"garbage")
+        index = LineIndex(temp_path)
+        assert len(index) == 100
+
+    def test_index_that_cannot_be_saved_is_kept_in_memory(self, temp_path):
+        index_path = os.path.join(temp_path + ".missing", "index")
+        index = LineIndex(temp_path, index_path=index_path)
+        assert index.line_from_end(0) == "line 99"
+        assert not os.path.exists(os.path.dirname(index_path))
+
+    @pytest.mark.skipif(os.name != "posix", reason="permission bits are POSIX ones")
+    def test_index_gets_the_permissions_of_the_file(self, temp_path):
+        for mode in (0o644, 0o640):
+            os.chmod(temp_path, mode)
+            helper_append(temp_path, "one more line\n")
+            LineIndex(temp_path)
+            assert os.stat(temp_path + ".frbidx").st_mode & 0o777 == mode
+
+    def test_concurrent_saves(self, temp_path):
+        errors = []
+
+        def build():
+            try:
+                assert len(LineIndex(temp_path)) == 100
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=build) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        directory, name = os.path.split(temp_path)
+        assert [p for p in os.listdir(directory) if p.startswith(name) and p.endswith(".tmp")] == []
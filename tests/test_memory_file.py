@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `memory_file` module."""
+
+import io
+
+import pytest
+
+from file_read_backwards.memory_file import MemoryFile
+
+
+class TestMemoryFile:
+    def test_seek_and_read(self):
+        with MemoryFile(bytearray(b"abcdefg")) as fp:
+            assert fp.seek(0, io.SEEK_END) == 7
+            assert fp.seek(-3, io.SEEK_CUR) == 4
+            assert fp.read(2) == b"ef"
+            assert fp.tell() == 6
+            assert fp.read() == b"g"
+            assert fp.read(2) == b""
+            with pytest.raises(ValueError):
+                fp.seek(-1)
+
+    def test_pread_leaves_the_position_alone(self):
+        fp = MemoryFile(memoryview(b"abcdefg"))
+        fp.seek(1)
+        assert fp.pread(3, 10) == b"defg"
+        assert fp.read(1) == b"b"
+
+    def test_close(self):
+        fp = MemoryFile(b"abc")
+        fp.close()
+        assert fp.closed
+        with pytest.raises(ValueError):
+            fp.read()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `mmap_buffer_work_space` module."""
+
+import io
+import os
+import tempfile
+import pytest
+from file_read_backwards.buffer_work_space import new_lines_bytes
+from file_read_backwards.mmap_buffer_work_space import MmapBufferWorkSpace
+
+
+def helper_lines(content, chunk_size):
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write(content)
+    lines = []
+    with io.open(t.name, mode="rb") as fp:
+        b = MmapBufferWorkSpace(fp, chunk_size=chunk_size)
+        while not b.has_returned_every_line():
+            b.read_until_yieldable()
+            lines.append(b.return_line())
+        b.close()
+    os.unlink(t.name)
+    return lines
+
+
+class TestMmapBufferWorkSpace:
+    def test_empty_file(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            pass
+        with io.open(t.name, mode="rb") as fp:
+            b = MmapBufferWorkSpace(fp, chunk_size=io.DEFAULT_BUFFER_SIZE)
+            assert b.mm is None
+            assert not b.yieldable()
+            assert b.has_returned_every_line()
+            b.close()
+        os.unlink(t.name)
+
+    def test_return_line_contract_violation(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"abc")
+        with io.open(t.name, mode="rb") as fp:
+            b = MmapBufferWorkSpace(fp, chunk_size=io.DEFAULT_BUFFER_SIZE)
+            with pytest.raises(AssertionError):
+                b.return_line()
+            b.close()
+        os.unlink(t.name)
+
+    def test_lines_with_variety_of_new_lines_and_chunk_sizes(self):
+        for n in new_lines_bytes:
+            content = n.join([b"", b"abc", b"", b"defgh", b"i"]) + n
+            for chunk_size in range(1, len(content) + 2):
+                assert helper_lines(content, chunk_size) == [b"i", b"defgh", b"", b"abc", b""]
+
+    def test_last_line_without_trailing_new_line(self):
+        assert helper_lines(b"abc\ndef", 2) == [b"def", b"abc"]
+
+    def test_single_new_line(self):
+        for n in new_lines_bytes:
+            assert helper_lines(n, 1) == [b""]
+
+    def test_long_line_is_scanned_once(self):
+        chunk_size = 4
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"x" * 64 + b"\n")
+        with io.open(t.name, mode="rb") as fp:
+            b = MmapBufferWorkSpace(fp, chunk_size=chunk_size)
+            b.read_until_yieldable()
+            assert b.read_position == 0
+            assert b._scan_end == 0
+            assert b.return_line() == b"x" * 64
+            assert b.has_returned_every_line()
+            b.close()
+        os.unlink(t.name)
+
+    def test_return_lines(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"abc\n\nde\nf\n")
+        with io.open(t.name, mode="rb") as fp:
+            b = MmapBufferWorkSpace(fp, chunk_size=6)
+            b.read_until_yieldable()
+            assert b.return_lines() == [b"f", b"de"]
+            b.read_until_yieldable()
+            assert b.return_lines() == [b"", b"abc"]
+            assert b.has_returned_every_line()
+            b.close()
+        os.unlink(t.name)
+
+    def test_return_lines_with_variety_of_new_lines_and_chunk_sizes(self):
+        for n in new_lines_bytes:
+            content = n.join([b"", b"abc", b"", b"defgh", b"i"]) + n
+            for chunk_size in range(1, len(content) + 2):
+                with tempfile.NamedTemporaryFile(delete=False) as t:
+                    t.write(content)
+                lines = []
+                with io.open(t.name, mode="rb") as fp:
+                    b = MmapBufferWorkSpace(fp, chunk_size=chunk_size)
+                    while not b.has_returned_every_line():
+                        b.read_until_yieldable()
+                        lines.extend(b.return_lines())
+                    b.close()
+                os.unlink(t.name)
+                assert lines == [b"i", b"defgh", b"", b"abc", b""]
+
+    def test_work_space_restricted_to_part_of_a_file(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"zero\none\ntwo\nthree\n")
+        with io.open(t.name, mode="rb") as fp:
+            b = MmapBufferWorkSpace(fp, chunk_size=3, start=5, end=13)
+            lines = []
+            while not b.has_returned_every_line():
+                b.read_until_yieldable()
+                lines.extend(b.return_lines())
+            assert lines == [b"two", b"one"]
+            b.close()
+        os.unlink(t.name)
+
+    def test_pending_end(self):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(b"zero\none\ntwo\nthree\n")
+        with io.open(t.name, mode="rb") as fp:
+            b = MmapBufferWorkSpace(fp, chunk_size=3, start=5, end=13)
+            ends = [b.pending_end()]
+            while not b.has_returned_every_line():
+                b.read_until_yieldable()
+                b.return_line()
+                ends.append(b.pending_end())
+            assert ends == [13, 9, 5]
+            b.close()
+        os.unlink(t.name)
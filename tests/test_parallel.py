@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `parallel` module."""
+
+import os
+import tempfile
+import pytest
+
+from file_read_backwards.buffer_work_space import new_lines
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards.parallel import parallel_read_backwards
+from file_read_backwards.parallel import _read_range_backwards
+
+
+def only_even_lines_upper_cased(line):
+    if int(line.split()[-1]) % 2:
+        return None
+    return line.upper()
+
+
+@pytest.fixture
+def temp_path():
+    paths = []
+
+    def create(content):
+        with tempfile.NamedTemporaryFile(delete=False) as t:
+            t.write(content)
+        paths.append(t.name)
+        return t.name
+    yield create
+    for path in paths:
+        os.unlink(path)
+
+
+class TestReadRangeBackwards:
+    def test_range_within_a_single_line(self, temp_path):
+        path = temp_path(b"a" * 100 + b"\n" + b"b\n")
+        assert _read_range_backwards(path, 10, 20, None, "utf-8", 8) == []
+        assert _read_range_backwards(path, 0, 20, None, "utf-8", 8) == ["a" * 100]
+        assert _read_range_backwards(path, 20, 102, None, None, 8) == [b"b"]
+
+
+class TestParallelReadBackwards:
+    def test_same_lines_as_file_read_backwards(self, temp_path):
+        for new_line in new_lines:
+            lines = ["line {}".format(i) if i % 7 else "" for i in range(200)]
+            path = temp_path(new_line.join(lines).encode("utf-8"))
+            with FileReadBackwards(path) as f:
+                expected = list(f)
+            for range_size in (5, 64, 1000000):
+                r = parallel_read_backwards(path, processes=2, range_size=range_size, chunk_size=16)
+                assert list(r) == expected
+
+    def test_func(self, temp_path):
+        path = temp_path("".join("line {}\n".format(i) for i in range(100)).encode("utf-8"))
+        r = list(parallel_read_backwards(path, func=only_even_lines_upper_cased, processes=2, range_size=50))
+        assert r == ["LINE {}".format(i) for i in reversed(range(0, 100, 2))]
+
+    def test_completely_empty_file(self, temp_path):
+        path = temp_path(b"")
+        assert list(parallel_read_backwards(path, processes=1)) == []
+
+    def test_unsupported_encoding(self, temp_path):
+        path = temp_path(b"")
+        with pytest.raises(NotImplementedError):
+            next(parallel_read_backwards(path, encoding="not-supported-encoding"))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `rotated` module."""
+
+import gzip
+import os
+import shutil
+import tempfile
+import pytest
+
+from file_read_backwards import rotated
+from file_read_backwards.rotated import RotatedLogReadBackwards
+from file_read_backwards.rotated import _list_rotated_files
+
+
+@pytest.fixture
+def log_dir():
+    d = tempfile.mkdtemp()
+    yield d
+    shutil.rmtree(d)
+
+
+def helper_write(path, lines):
+    content = "".join(r + "\n" for r in lines).encode("utf-8")
+    if path.endswith(".gz"):
+        with gzip.open(path, "wb") as t:
+            t.write(content)
+    else:
+        with open(path, "wb") as t:
+            t.write(content)
+
+
+def helper_rotated_set(log_dir):
+    """Write app.log, app.log.1, app.log.2.gz and app.log.3.gz, return their lines from the oldest one."""
+    path = os.path.join(log_dir, "app.log")
+    lines = []
+    for i, name in enumerate(["app.log.3.gz", "app.log.2.gz", "app.log.1", "app.log"]):
+        file_lines = ["file {} line {}".format(i, j) for j in range(500)]
+        helper_write(os.path.join(log_dir, name), file_lines)
+        lines.extend(file_lines)
+    return path, lines
+
+
+def helper_rotate(path):
+    """Rotate like logrotate with delaycompress does."""
+    for n in range(4, 1, -1):
+        if os.path.exists("{}.{}.gz".format(path, n - 1)):
+            os.rename("{}.{}.gz".format(path, n - 1), "{}.{}.gz".format(path, n))
+    with open(path + ".1", "rb") as source, gzip.open(path + ".2.gz", "wb") as t:
+        t.write(source.read())
+    st = os.stat(path + ".1")
+    os.utime(path + ".2.gz", ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.unlink(path + ".1")
+    os.rename(path, path + ".1")
+    helper_write(path, ["new line"])
+
+
+class TestListRotatedFiles:
+    def test_list_rotated_files(self, log_dir):
+        path, _ = helper_rotated_set(log_dir)
+        helper_write(path + ".5", ["after a missing number"])
+        helper_write(path + ".8", ["after two missing numbers"])
+        expected = [path, path + ".1", path + ".2.gz", path + ".3.gz", path + ".5"]
+        assert [p for p, _ in _list_rotated_files(path)] == expected
+
+
+class TestRotatedLogReadBackwards:
+    def test_reads_every_file_as_one(self, log_dir):
+        path, lines = helper_rotated_set(log_dir)
+        for prefetch in (True, False):
+            with RotatedLogReadBackwards(path, chunk_size=100, prefetch=prefetch) as f:
+                assert list(f) == lines[::-1]
+                assert f.paths == [path, path + ".1", path + ".2.gz", path + ".3.gz"]
+
+    def test_files_are_opened_lazily(self, log_dir, mocker):
+        path, lines = helper_rotated_set(log_dir)
+        spy = mocker.spy(rotated, "FileReadBackwards")
+        with RotatedLogReadBackwards(path, prefetch=False) as f:
+            assert spy.call_count == 0
+            assert next(f) == lines[-1]
+            assert spy.call_count == 1
+        with RotatedLogReadBackwards(path, prefetch=True) as f:
+            assert next(f) == lines[-1]
+            f.close()
+            assert spy.call_count == 3  # the next file has been opened ahead
+
+    def test_rotation_while_reading(self, log_dir):
+        for prefetch in (True, False):
+            for lines_before_rotation in (10, 600, 1200):
+                path, lines = helper_rotated_set(log_dir)
+                with RotatedLogReadBackwards(path, chunk_size=100, prefetch=prefetch) as f:
+                    r = [next(f) for _ in range(lines_before_rotation)]
+                    helper_rotate(path)
+                    r.extend(f)
+                assert r == lines[::-1]
+
+    def test_rotation_of_files_sharing_a_modification_time(self, log_dir):
+        path, lines = helper_rotated_set(log_dir)
+        for name in os.listdir(log_dir):
+            os.utime(os.path.join(log_dir, name), ns=(0, 0))
+        with RotatedLogReadBackwards(path, chunk_size=100, prefetch=False) as f:
+            r = [next(f) for _ in range(10)]
+            helper_rotate(path)
+            r.extend(f)
+        assert r == lines[::-1]
+
+    def test_missing_log(self, log_dir):
+        with RotatedLogReadBackwards(os.path.join(log_dir, "app.log")) as f:
+            assert list(f) == []
+            assert f.readline() == ""
+
+    def test_without_encoding(self, log_dir):
+        path = os.path.join(log_dir, "app.log")
+        helper_write(path, ["abc"])
+        helper_write(path + ".1", ["def"])
+        with RotatedLogReadBackwards(path, encoding=None) as f:
+            assert list(f) == [b"abc", b"def"]
+
+    def test_close(self, log_dir):
+        path, lines = helper_rotated_set(log_dir)
+        f = RotatedLogReadBackwards(path)
+        next(f)
+        f.close()
+        assert f.closed
+        assert list(f) == []
+
+    def test_close_after_the_next_file_failed_to_open(self, log_dir, mocker):
+        path, lines = helper_rotated_set(log_dir)
+        open_file = rotated.FileReadBackwards
+
+        def fail_on_rotated_files(p, *args):
+            if p != path:
+                raise ValueError("cannot read {0}".format(p))
+            return open_file(p, *args)
+        mocker.patch.object(rotated, "FileReadBackwards", side_effect=fail_on_rotated_files)
+        f = RotatedLogReadBackwards(path)
+        executor = f._RotatedLogReadBackwards__executor
+        assert next(f) == lines[-1]
+        f.close()
+        assert f.closed
+        assert executor._shutdown
+        with pytest.raises(ValueError):
+            with RotatedLogReadBackwards(path) as f:
+                list(f)  # the error is raised by the iteration, and not hidden by closing
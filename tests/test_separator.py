@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `separator` module."""
+
+import io
+
+import pytest
+
+from file_read_backwards.separator import SeparatorBufferWorkSpace
+
+
+def helper_records(content, separator, chunk_size):
+    b = SeparatorBufferWorkSpace(io.BytesIO(content), chunk_size, separator)
+    records = []
+    while not b.has_returned_every_line():
+        b.read_until_yieldable()
+        records.append(b.return_line())
+    return records
+
+
+class TestSeparatorBufferWorkSpace:
+    def test_records_with_variety_of_separators_and_chunk_sizes(self):
+        for separator in (b"\x00", b"\x1e", b"\r\n", b"<EOR>"):
+            records = [b"", b"abc", b"", b"de\nfgh", b"i"]
+            for trailing in (b"", separator):
+                content = separator.join(records) + trailing
+                for chunk_size in range(1, len(content) + 2):
+                    assert helper_records(content, separator, chunk_size) == records[::-1]
+
+    def test_separators_overlapping_with_themselves_are_matched_from_the_end(self):
+        for separator, content in ((b"aa", b"xaaay"), (b"\x00\x00", b"x\x00\x00\x00y\x00\x00z"),
+                                   (b"::", b"a:::::b::::c:::"), (b"aba", b"xabababay")):
+            expected = (content[:-len(separator)] if content.endswith(separator) else content).rsplit(separator)
+            for chunk_size in range(1, len(content) + 2):
+                assert helper_records(content, separator, chunk_size) == expected[::-1]
+                b = SeparatorBufferWorkSpace(io.BytesIO(content), chunk_size, separator)
+                records = []
+                while not b.has_returned_every_line():
+                    b.read_until_yieldable()
+                    records.extend(b.return_lines())
+                assert records == expected[::-1]
+
+    def test_return_lines(self):
+        b = SeparatorBufferWorkSpace(io.BytesIO(b"abc<>\n<>de<>f<>"), 7, b"<>")
+        b.read_until_yieldable()
+        assert b.return_lines() == [b"f"]  # the chunk may begin in the middle of "de"
+        b.read_until_yieldable()
+        assert b.return_lines() == [b"de", b"\n"]
+        b.read_until_yieldable()
+        assert b.return_lines() == [b"abc"]
+        assert b.has_returned_every_line()
+
+    def test_no_one_byte_probes(self):
+        fp = io.BytesIO(b"a\x00b\x00" * 8)
+        reads = []
+        read = fp.read
+        fp.read = lambda size=-1: reads.append(size) or read(size)
+        b = SeparatorBufferWorkSpace(fp, 4, b"\x00")
+        while not b.has_returned_every_line():
+            b.read_until_yieldable()
+            b.return_lines()
+        assert reads == [4] * 8
+
+    def test_empty_separator(self):
+        with pytest.raises(ValueError):
+            SeparatorBufferWorkSpace(io.BytesIO(b"abc"), 4, b"")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `since` module."""
+
+import io
+import os
+import tempfile
+import pytest
+
+from file_read_backwards.buffer_work_space import new_lines
+from file_read_backwards.since import lines_since
+from file_read_backwards.since import _snap_to_line_start
+
+
+def helper_write(content):
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write(content)
+    return t.name
+
+
+def helper_key(line):
+    head = line.split(" ", 1)[0]
+    return int(head) if head.isdigit() else None
+
+
+def helper_expected(lines, timestamp):
+    expected, pending = [], []
+    for r in lines[::-1]:
+        t = helper_key(r)
+        pending.append(r)
+        if t is not None:
+            if t <= timestamp:
+                break
+            expected.extend(pending)
+            pending = []
+    return expected
+
+
+class TestSnapToLineStart:
+    def test_every_position(self):
+        for new_line in new_lines:
+            content = new_line.join(["abc", "", "de", "f"]).encode("ascii")
+            ends = [i for i in range(len(content)) if content[i:i + 1] in (b"\n", b"\r")]
+            line_starts = [0] + [i + 1 for i in ends if content[i:i + 2] != b"\r\n"]
+            path = helper_write(content)
+            with io.open(path, mode="rb") as fp:
+                for chunk_size in (1, 2, 100):
+                    for position in range(len(content)):
+                        expected = max(s for s in line_starts if s <= position)
+                        assert _snap_to_line_start(fp, position, 0, chunk_size) == expected
+            os.unlink(path)
+
+
+class TestLinesSince:
+    def test_same_lines_as_reading_every_line(self):
+        lines = []
+        for i in range(200):
+            lines.append("{} event {}".format(i // 3 * 10, i))
+            if i % 7 == 0:
+                lines.append("  continuation of {}".format(i))
+        for new_line in new_lines:
+            path = helper_write(new_line.join(lines).encode("utf-8"))
+            for chunk_size in (1, 7, 4096):
+                for timestamp in (-1, 0, 5, 10, 300, 655, 660, 1000):
+                    r = list(lines_since(path, timestamp, helper_key, chunk_size=chunk_size))
+                    assert r == helper_expected(lines, timestamp)
+            os.unlink(path)
+
+    def test_parses_few_lines(self, mocker):
+        path = helper_write("".join("{} event\n".format(i) for i in range(100000)).encode("utf-8"))
+        key = mocker.Mock(side_effect=helper_key)
+        r = list(lines_since(path, 99989, key))
+        assert r == ["{} event".format(i) for i in range(99999, 99989, -1)]
+        assert key.call_count <= 25
+        os.unlink(path)
+
+    def test_without_encoding(self):
+        path = helper_write(b"1 a\n2 b\n3 c\n")
+        r = list(lines_since(path, 1, lambda r: int(r.split(b" ")[0]), encoding=None))
+        assert r == [b"3 c", b"2 b"]
+        os.unlink(path)
+
+    def test_empty_file(self):
+        path = helper_write(b"")
+        assert list(lines_since(path, 0, helper_key)) == []
+        os.unlink(path)
+
+    def test_unsupported_encoding(self):
+        with pytest.raises(NotImplementedError):
+            list(lines_since("whatever", 0, helper_key, encoding="not-supported"))
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `stats` module."""
+
+import io
+
+from file_read_backwards.stats import CountingFile
+from file_read_backwards.stats import ReadStats
+
+
+class TestReadStats:
+    def test_starts_at_zero(self):
+        assert ReadStats().as_dict() == {"bytes_read": 0, "reads": 0, "seeks": 0, "chunks": 0, "concatenations": 0,
+                                         "lines": 0, "decode_time": 0.0}
+
+    def test_add_chunk_calls_the_callback(self):
+        chunks = []
+        stats = ReadStats(on_chunk=lambda position, size: chunks.append((position, size)))
+        stats.add_chunk(10, 5)
+        stats.add_chunk(0, 10)
+        assert stats.chunks == 2
+        assert chunks == [(10, 5), (0, 10)]
+
+    def test_reset(self):
+        stats = ReadStats()
+        stats.add_chunk(0, 1)
+        stats.lines = 3
+        stats.reset()
+        assert stats.chunks == stats.lines == 0
+
+
+class TestCountingFile:
+    def test_counts_reads_and_seeks(self):
+        stats = ReadStats()
+        fp = CountingFile(io.BytesIO(b"abcdef"), stats)
+        assert fp.seek(0, io.SEEK_END) == 6
+        fp.seek(2)
+        assert fp.read(3) == b"cde"
+        assert fp.read(3) == b"f"
+        assert (stats.seeks, stats.reads, stats.bytes_read) == (2, 2, 4)
+        assert fp.tell() == 6
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `tail` module."""
+
+import os
+import tempfile
+import pytest
+
+from file_read_backwards.buffer_work_space import new_lines
+from file_read_backwards.file_read_backwards import FileReadBackwards
+from file_read_backwards.tail import tail
+
+
+def helper_write(content):
+    with tempfile.NamedTemporaryFile(delete=False) as t:
+        t.write(content)
+    return t.name
+
+
+class TestTail:
+    def test_same_lines_as_file_read_backwards(self):
+        for new_line in new_lines:
+            for ending in ("", new_line):
+                content = new_line.join(["", "abc", "", "defgh", "i" * 300, "j"]) + ending
+                path = helper_write(content.encode("utf-8"))
+                with FileReadBackwards(path) as frb:
+                    expected = list(frb)[::-1]
+                for n in range(1, len(expected) + 3):
+                    for average_line_length in (1, 2, 5, 1000):
+                        assert tail(path, n, average_line_length=average_line_length) == expected[-n:]
+                os.unlink(path)
+
+    def test_window_grows_geometrically(self, mocker):
+        path = helper_write(b"".join(b"line %d\n" % i for i in range(10000)))
+        spy = mocker.spy(os, "pread")
+        assert tail(path, 1000, average_line_length=1) == ["line {}".format(i) for i in range(9000, 10000)]
+        assert spy.call_count <= 6
+        os.unlink(path)
+
+    def test_empty_file(self):
+        path = helper_write(b"")
+        assert tail(path) == []
+        os.unlink(path)
+
+    def test_no_lines_asked_for(self):
+        path = helper_write(b"abc\n")
+        assert tail(path, 0) == []
+        os.unlink(path)
+
+    def test_without_encoding(self):
+        path = helper_write(b"abc\r\nd\xe9f\r\n")
+        assert tail(path, 1, encoding=None) == [b"d\xe9f"]
+        os.unlink(path)
+
+    def test_unsupported_encoding(self):
+        with pytest.raises(NotImplementedError):
+            tail("whatever", encoding="not-supported")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Tests for `wide` module."""
+
+import codecs
+import io
+
+import pytest
+
+from file_read_backwards.wide import WideBufferWorkSpace
+from file_read_backwards.wide import _find_byte_order
+
+
+def helper_lines(content, encoding, chunk_size):
+    b = WideBufferWorkSpace(io.BytesIO(content), chunk_size, encoding)
+    lines = []
+    while not b.has_returned_every_line():
+        b.read_until_yieldable()
+        lines.extend(b.return_lines())
+    return lines
+
+
+class TestFindByteOrder:
+    def test_byte_order_mark_tells_the_byte_order(self):
+        assert _find_byte_order(io.BytesIO(codecs.BOM_UTF16_BE + b"\x00a"), "utf-16") == ("utf-16-be", 2)
+        assert _find_byte_order(io.BytesIO(codecs.BOM_UTF16_LE + b"a\x00"), "utf-16") == ("utf-16-le", 2)
+        assert _find_byte_order(io.BytesIO(codecs.BOM_UTF32_LE + b"a\x00\x00\x00"), "utf-32") == ("utf-32-le", 4)
+        assert _find_byte_order(io.BytesIO(codecs.BOM_UTF32_BE + b"\x00\x00\x00a"), "utf-32") == ("utf-32-be", 4)
+
+    def test_little_endian_without_byte_order_mark(self):
+        assert _find_byte_order(io.BytesIO(b"a\x00"), "utf-16") == ("utf-16-le", 0)
+        assert _find_byte_order(io.BytesIO(b""), "utf-32") == ("utf-32-le", 0)
+
+    def test_byte_order_mark_matching_an_explicit_byte_order_gets_skipped(self):
+        assert _find_byte_order(io.BytesIO(codecs.BOM_UTF16_BE + b"\x00a"), "utf-16-be") == ("utf-16-be", 2)
+        assert _find_byte_order(io.BytesIO(b"\x00a"), "utf-16-be") == ("utf-16-be", 0)
+
+
+class TestWideBufferWorkSpace:
+    def test_lines_are_transcoded_to_utf8(self):
+        content = "abc\r\nCafé\n\U0001d11e\rd".encode("utf-16")
+        for chunk_size in range(1, len(content) + 2):
+            assert helper_lines(content, "utf-16", chunk_size) == [b"d", "\U0001d11e".encode("utf-8"),
+                                                                   "Café".encode("utf-8"), b"abc"]
+
+    def test_chunks_do_not_split_surrogate_pairs_or_new_lines(self):
+        content = "\U0001d11e\r\n\U0001d11e".encode("utf-16-be")
+        b = WideBufferWorkSpace(io.BytesIO(content), 2, "utf-16-be")
+        assert b.get_next_chunk(len(content)) == ("\U0001d11e".encode("utf-8"), 8)
+        assert b.get_next_chunk(8) == (b"\r\n", 4)
+        assert b.get_next_chunk(4) == ("\U0001d11e".encode("utf-8"), 0)
+
+    def test_chunk_size_is_rounded_to_code_units(self):
+        content = "abcdef".encode("utf-32-le")
+        b = WideBufferWorkSpace(io.BytesIO(content), 10, "utf-32-le")
+        assert b.get_next_chunk(len(content)) == (b"ef", 16)
+
+    def test_truncated_file(self):
+        with pytest.raises(UnicodeDecodeError):
+            helper_lines("abc".encode("utf-16-le")[:-1], "utf-16-le", 4)